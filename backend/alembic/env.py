@@ -10,7 +10,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.config import get_settings
-from app.models import Task, Conversation, Message
+from app.models import Task, Conversation, Message, ChatBatch
 from sqlmodel import SQLModel
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,45 @@
+"""Add composite (conversation_id, created_at) index on messages
+
+Serves the context window query (newest N messages of a conversation)
+as an index range scan instead of a sort. Replaces the single-column
+conversation_id index, which the composite index's prefix covers.
+
+Revision ID: a3c1e5d7f901
+Revises: 
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1e5d7f901'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # if_not_exists: tables may already have been created by init_db()
+    op.create_index(
+        'ix_messages_conversation_id_created_at',
+        'messages',
+        ['conversation_id', 'created_at'],
+        unique=False,
+        if_not_exists=True
+    )
+    op.drop_index('ix_messages_conversation_id', table_name='messages', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_messages_conversation_id',
+        'messages',
+        ['conversation_id'],
+        unique=False,
+        if_not_exists=True
+    )
+    op.drop_index('ix_messages_conversation_id_created_at', table_name='messages', if_exists=True)
@@ -0,0 +1,35 @@
+"""Pending chat batches table
+
+Stores the ID of every OpenAI batch whose replies have not been written
+yet, so polling can be resumed after a restart instead of losing them.
+
+Revision ID: a9d3f5b7c1e2
+Revises: f1b4d6e8a2c3
+Create Date: 2026-10-15 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3f5b7c1e2'
+down_revision: Union[str, None] = 'f1b4d6e8a2c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'chat_batches',
+        sa.Column('batch_id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('batch_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('chat_batches')
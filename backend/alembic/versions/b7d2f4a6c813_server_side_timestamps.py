@@ -0,0 +1,34 @@
+"""Set conversation and message timestamps on the database side
+
+conversations.created_at/updated_at and messages.created_at default to
+now() in the database instead of being sent by the application, so
+every replica stamps rows with the same clock.
+
+Revision ID: b7d2f4a6c813
+Revises: a3c1e5d7f901
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2f4a6c813'
+down_revision: Union[str, None] = 'a3c1e5d7f901'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('conversations', 'created_at', server_default=sa.func.now())
+    op.alter_column('conversations', 'updated_at', server_default=sa.func.now())
+    op.alter_column('messages', 'created_at', server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    op.alter_column('messages', 'created_at', server_default=None)
+    op.alter_column('conversations', 'updated_at', server_default=None)
+    op.alter_column('conversations', 'created_at', server_default=None)
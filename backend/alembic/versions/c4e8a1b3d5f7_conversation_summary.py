@@ -0,0 +1,37 @@
+"""Add rolling summary columns to conversations
+
+Long conversations keep their newest messages verbatim and fold older
+ones into conversations.summary; summary_up_to_msg_id records the last
+message the summary covers.
+
+Revision ID: c4e8a1b3d5f7
+Revises: b7d2f4a6c813
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1b3d5f7'
+down_revision: Union[str, None] = 'b7d2f4a6c813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Skip existing columns: tables may already have been created by init_db()
+    # (checked by inspection - add_column only has if_not_exists on newer Alembic)
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('conversations')}
+    if 'summary' not in existing:
+        op.add_column('conversations', sa.Column('summary', sa.String(), nullable=True))
+    if 'summary_up_to_msg_id' not in existing:
+        op.add_column('conversations', sa.Column('summary_up_to_msg_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('conversations', 'summary_up_to_msg_id')
+    op.drop_column('conversations', 'summary')
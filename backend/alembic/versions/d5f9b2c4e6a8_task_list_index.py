@@ -0,0 +1,43 @@
+"""Add composite (user_id, completed, created_at DESC) index on tasks
+
+Serves the list_tasks query (a user's tasks, optionally filtered by
+completed, ordered by completed then newest first) as an index range
+scan instead of a sort. Replaces the single-column user_id and
+completed indexes: the composite index's prefix covers user_id lookups,
+and completed alone is never queried.
+
+Revision ID: d5f9b2c4e6a8
+Revises: c4e8a1b3d5f7
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f9b2c4e6a8'
+down_revision: Union[str, None] = 'c4e8a1b3d5f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # if_not_exists: tables may already have been created by init_db()
+    op.create_index(
+        'ix_tasks_user_id_completed_created_at',
+        'tasks',
+        ['user_id', 'completed', sa.text('created_at DESC')],
+        unique=False,
+        if_not_exists=True
+    )
+    op.drop_index('ix_tasks_completed', table_name='tasks', if_exists=True)
+    op.drop_index('ix_tasks_user_id', table_name='tasks', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_tasks_user_id', 'tasks', ['user_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_tasks_completed', 'tasks', ['completed'], unique=False, if_not_exists=True)
+    op.drop_index('ix_tasks_user_id_completed_created_at', table_name='tasks', if_exists=True)
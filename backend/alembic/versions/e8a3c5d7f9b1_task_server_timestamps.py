@@ -0,0 +1,32 @@
+"""Set task timestamps on the database side
+
+tasks.created_at/updated_at default to now() in the database instead of
+being sent by the application (updated_at is bumped by the model's
+onupdate), matching conversations and messages.
+
+Revision ID: e8a3c5d7f9b1
+Revises: d5f9b2c4e6a8
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a3c5d7f9b1'
+down_revision: Union[str, None] = 'd5f9b2c4e6a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('tasks', 'created_at', server_default=sa.func.now())
+    op.alter_column('tasks', 'updated_at', server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    op.alter_column('tasks', 'updated_at', server_default=None)
+    op.alter_column('tasks', 'created_at', server_default=None)
@@ -0,0 +1,39 @@
+"""Delete messages with their conversation (ON DELETE CASCADE)
+
+Recreates messages.conversation_id's foreign key with ON DELETE CASCADE,
+so deleting a conversation removes its messages in the same statement.
+
+Revision ID: f1b4d6e8a2c3
+Revises: e8a3c5d7f9b1
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b4d6e8a2c3'
+down_revision: Union[str, None] = 'e8a3c5d7f9b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# PostgreSQL's default name for the constraint created by create_all()
+CONSTRAINT_NAME = 'messages_conversation_id_fkey'
+
+
+def upgrade() -> None:
+    op.drop_constraint(CONSTRAINT_NAME, 'messages', type_='foreignkey')
+    op.create_foreign_key(
+        CONSTRAINT_NAME, 'messages', 'conversations',
+        ['conversation_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(CONSTRAINT_NAME, 'messages', type_='foreignkey')
+    op.create_foreign_key(
+        CONSTRAINT_NAME, 'messages', 'conversations',
+        ['conversation_id'], ['id']
+    )
@@ -1,4 +1,5 @@
 """Agent package initialization."""
-from app.agent.service import process_chat_message
+from app.agent.service import process_chat_message, stream_chat_message
+from app.agent.batch import process_chat_message_batch, BATCH_ACK_RESPONSE
 
-__all__ = ["process_chat_message"]
+__all__ = ["process_chat_message", "stream_chat_message", "process_chat_message_batch", "BATCH_ACK_RESPONSE"]
@@ -0,0 +1,415 @@
+"""
+OpenAI Batch Service - Deferred processing for non-urgent chat messages.
+Submits messages through the OpenAI Batch API (50% cheaper, separate rate limits)
+and writes the assistant replies back to the database once the batch completes.
+
+ARCHITECTURE NOTES:
+- Submission is synchronous: user messages are stored before the batch is created
+  (on a worker thread, so the event loop is not blocked by the database) and
+  deleted again if the upload or the batch creation fails
+- Completion is asynchronous: a background task polls the batch until it finishes
+- Pending batch IDs are stored (chat_batches), so polling resumes after a restart;
+  serverless deployments have no process to poll and reject deferred messages
+- Each batch line is matched back to its conversation via custom_id
+- Tool calls in batch results are executed the same way as in realtime chat
+"""
+import asyncio
+import logging
+import orjson
+from typing import Dict, Any, List, Optional, Set, Tuple
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select
+
+from app.config import get_settings
+from app.database import engine
+from app.models.chat_batch import ChatBatch
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.schemas.chat import ChatRequest
+from app.agent.config import get_agent_config, build_agent_messages, get_context_window_size
+from app.agent.service import load_message_history, get_openai_client, touch_conversation
+from app.mcp.client import get_mcp_tools, execute_mcp_tool
+from app.mcp.errors import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Batch API settings
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"  # Only window supported by the Batch API
+BATCH_POLL_INTERVAL_SECONDS = 60
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Acknowledgement returned immediately for deferred messages
+BATCH_ACK_RESPONSE = "Got it! I'll take care of this shortly - check back in a little while."
+
+# Strong references to running poll tasks (asyncio only keeps weak ones)
+_poll_tasks: Set[asyncio.Task] = set()
+
+
+def _custom_id(conversation_id: int, message_id: int) -> str:
+    """Build a batch custom_id that maps a result back to its conversation."""
+    return f"{conversation_id}-{message_id}"
+
+
+def _conversation_id_from_custom_id(custom_id: str) -> int:
+    """Extract the conversation ID from a batch custom_id."""
+    return int(custom_id.split("-", 1)[0])
+
+
+def _build_batch_line(
+    custom_id: str,
+    user_id: str,
+    openai_messages: List[Dict[str, Any]],
+    agent_config: Dict[str, Any]
+) -> bytes:
+    """
+    Build one JSONL line for the Batch API input file.
+    
+    The tool definitions are the shared list built once at import.
+    
+    Returns:
+        JSON-encoded request line (without trailing newline)
+    """
+    return orjson.dumps({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": agent_config["model"],
+            "messages": openai_messages,
+            "temperature": agent_config["temperature"],
+            "max_tokens": agent_config["max_tokens"],
+            "user": user_id,
+            "tools": get_mcp_tools()
+        }
+    })
+
+
+def _store_batch_messages(
+    session: Session,
+    user_id: str,
+    messages: List[ChatRequest],
+    agent_config: Dict[str, Any]
+) -> Tuple[List[bytes], List[int], List[int]]:
+    """
+    Store the user messages and build the batch input lines (blocking).
+    
+    Returns:
+        (batch input lines, conversation_ids, user message IDs), all in
+        input order
+    
+    Raises:
+        ValueError: If a conversation doesn't exist or belongs to another user
+        DatabaseError: If a database operation fails
+    """
+    lines = []
+    conversation_ids = []
+    message_ids = []
+    
+    try:
+        for request in messages:
+            # Get or create conversation
+            if request.conversation_id:
+                conversation = session.get(Conversation, request.conversation_id)
+                if not conversation or conversation.user_id != user_id:
+                    raise ValueError(f"Conversation {request.conversation_id} not found or doesn't belong to user")
+            else:
+                conversation = Conversation(user_id=user_id)
+                session.add(conversation)
+                session.flush()
+            
+            # Store user message
+            user_message = Message(
+                conversation_id=conversation.id,
+                user_id=user_id,
+                role="user",
+                content=request.message
+            )
+            session.add(user_message)
+            session.flush()
+            
+            # Build request body from the context window
+            history = load_message_history(
+                session=session,
+                conversation_id=conversation.id,
+                user_id=user_id,
+                limit=get_context_window_size(),
+                after_id=conversation.summary_up_to_msg_id
+            )
+            openai_messages = build_agent_messages(history, conversation.summary)
+            
+            lines.append(_build_batch_line(
+                _custom_id(conversation.id, user_message.id),
+                user_id,
+                openai_messages,
+                agent_config
+            ))
+            conversation_ids.append(conversation.id)
+            message_ids.append(user_message.id)
+        
+        session.commit()
+    except ValueError:
+        raise
+    except Exception as e:
+        raise DatabaseError() from e
+    
+    return lines, conversation_ids, message_ids
+
+
+def _discard_batch_messages(
+    session: Session,
+    message_ids: List[int],
+    new_conversation_ids: List[int]
+) -> None:
+    """
+    Delete the stored user messages of a batch that could not be submitted,
+    along with the conversations created for them (blocking).
+    """
+    try:
+        session.execute(
+            delete(Message)
+            .where(Message.id.in_(message_ids))
+            .execution_options(synchronize_session=False)
+        )
+        if new_conversation_ids:
+            session.execute(
+                delete(Conversation)
+                .where(Conversation.id.in_(new_conversation_ids))
+                .execution_options(synchronize_session=False)
+            )
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Could not delete messages of unsubmitted batch: {str(e)}")
+
+
+def _record_batch(session: Session, batch_id: str, user_id: str) -> None:
+    """Store a pending batch so its polling can be resumed (blocking)."""
+    try:
+        session.add(ChatBatch(batch_id=batch_id, user_id=user_id))
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Could not record batch {batch_id}; it won't be resumed after a restart: {str(e)}")
+
+
+def _forget_batch(batch_id: str) -> None:
+    """Delete a finished batch from the pending batches (blocking)."""
+    with Session(engine) as session:
+        session.execute(delete(ChatBatch).where(ChatBatch.batch_id == batch_id))
+        session.commit()
+
+
+def _pending_batches() -> List[Tuple[str, str]]:
+    """Load the (batch_id, user_id) of every pending batch (blocking)."""
+    with Session(engine) as session:
+        return session.exec(select(ChatBatch.batch_id, ChatBatch.user_id)).all()
+
+
+def _start_polling(batch_id: str, user_id: str) -> None:
+    """Poll a batch in the background - the caller does not wait for it."""
+    task = asyncio.create_task(poll_batch(batch_id, user_id))
+    _poll_tasks.add(task)
+    task.add_done_callback(_poll_tasks.discard)
+
+
+async def resume_batch_polling() -> None:
+    """
+    Resume polling the batches submitted before this process started.
+    
+    Called once at startup; does nothing in serverless deployments, which
+    don't accept deferred messages.
+    """
+    if get_settings().is_serverless:
+        return
+    
+    pending = await asyncio.to_thread(_pending_batches)
+    for batch_id, user_id in pending:
+        _start_polling(batch_id, user_id)
+    if pending:
+        logger.info(f"Resumed polling {len(pending)} pending chat batches")
+
+
+async def process_chat_message_batch(
+    session: Session,
+    user_id: str,
+    messages: List[ChatRequest]
+) -> Dict[str, Any]:
+    """
+    Queue chat messages for processing through the OpenAI Batch API.
+    
+    Stores each user message, submits one batch containing all of them,
+    and starts a background task that writes the replies when ready.
+    
+    Args:
+        session: Database session (injected dependency)
+        user_id: The ID of the user
+        messages: Chat requests to process (non-urgent)
+    
+    Returns:
+        Dictionary with batch_id and the conversation_ids used, in input order
+    
+    Raises:
+        ValueError: In serverless deployments (no process outlives the
+            request to poll the batch), or for an unknown conversation
+    """
+    if get_settings().is_serverless:
+        raise ValueError("Deferred messages are not supported in serverless deployments; send them with is_urgent=true")
+    
+    agent_config = get_agent_config()
+    client = get_openai_client()
+    
+    # Database work runs on a worker thread so the event loop keeps
+    # serving other requests while this one waits on Postgres. The
+    # messages are committed before the upload (no transaction is held
+    # during it) and deleted again if the batch can't be created
+    lines, conversation_ids, message_ids = await asyncio.to_thread(
+        _store_batch_messages, session, user_id, messages, agent_config
+    )
+    
+    try:
+        # Upload input file and create the batch
+        input_file = await client.files.create(
+            file=("chat_batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+    except Exception:
+        new_conversation_ids = [
+            conversation_id
+            for conversation_id, request in zip(conversation_ids, messages)
+            if not request.conversation_id
+        ]
+        await asyncio.to_thread(_discard_batch_messages, session, message_ids, new_conversation_ids)
+        raise
+    
+    await asyncio.to_thread(_record_batch, session, batch.id, user_id)
+    _start_polling(batch.id, user_id)
+    
+    return {
+        "batch_id": batch.id,
+        "conversation_ids": conversation_ids
+    }
+
+
+async def poll_batch(
+    batch_id: str,
+    user_id: str,
+    poll_interval: float = BATCH_POLL_INTERVAL_SECONDS
+) -> None:
+    """
+    Poll a batch until it finishes, then store the assistant replies.
+    
+    Args:
+        batch_id: OpenAI batch ID
+        user_id: The ID of the user who owns the batched conversations
+        poll_interval: Seconds between status checks
+    """
+    client = get_openai_client()
+    
+    try:
+        while True:
+            batch = await client.batches.retrieve(batch_id)
+            if batch.status in BATCH_TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(poll_interval)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Batch {batch_id} finished with status '{batch.status}'")
+            await asyncio.to_thread(_forget_batch, batch_id)
+            return
+        
+        output = await client.files.content(batch.output_file_id)
+        await store_batch_results(output.text, user_id, batch_id)
+    except Exception as e:
+        logger.error(f"Error processing batch {batch_id}: {str(e)}", exc_info=True)
+
+
+async def store_batch_results(output_jsonl: str, user_id: str, batch_id: str) -> None:
+    """
+    Parse a Batch API output file and store each assistant reply.
+    
+    Args:
+        output_jsonl: Contents of the batch output file
+        user_id: The ID of the user who owns the batched conversations
+        batch_id: OpenAI batch ID, removed from the pending batches in
+            the same transaction
+    """
+    # Replies are resolved first (tool calls open their own sessions) and
+    # inserted together at the end (one multi-row INSERT)
+    replies = []
+    for line in output_jsonl.splitlines():
+        if not line.strip():
+            continue
+        
+        result = orjson.loads(line)
+        conversation_id = _conversation_id_from_custom_id(result["custom_id"])
+        
+        response = result.get("response") or {}
+        if result.get("error") or response.get("status_code") != 200:
+            logger.error(f"Batch request {result['custom_id']} failed: {result.get('error')}")
+            continue
+        
+        message_response = response["body"]["choices"][0]["message"]
+        assistant_content = await _resolve_batch_reply(user_id, message_response)
+        
+        replies.append({
+            "conversation_id": conversation_id,
+            "user_id": user_id,
+            "role": "assistant",
+            "content": assistant_content
+        })
+    
+    # Database work runs on a worker thread so the event loop is not blocked
+    await asyncio.to_thread(_store_batch_replies, batch_id, replies)
+
+
+def _store_batch_replies(batch_id: str, replies: List[Dict[str, Any]]) -> None:
+    """
+    Insert the assistant replies, touch their conversations and mark the
+    batch as done, in one transaction (blocking).
+    
+    Args:
+        batch_id: OpenAI batch ID
+        replies: Message rows (conversation_id, user_id, role, content)
+    """
+    with Session(engine, expire_on_commit=False) as session:
+        if replies:
+            session.execute(insert(Message), replies)
+            for conversation_id in dict.fromkeys(reply["conversation_id"] for reply in replies):
+                touch_conversation(session, conversation_id)
+        session.execute(delete(ChatBatch).where(ChatBatch.batch_id == batch_id))
+        session.commit()
+
+
+async def _resolve_batch_reply(
+    user_id: str,
+    message_response: Dict[str, Any]
+) -> str:
+    """
+    Turn a batch completion message into the assistant reply text.
+    
+    Executes any requested tool calls (there is no second completion
+    round in batch mode) and summarizes their results.
+    """
+    tool_calls: Optional[List[Dict[str, Any]]] = message_response.get("tool_calls")
+    if not tool_calls:
+        return message_response.get("content") or ""
+    
+    summaries = []
+    for tool_call in tool_calls:
+        tool_args = orjson.loads(tool_call["function"]["arguments"]) | {"user_id": user_id}
+        tool_result = await execute_mcp_tool(tool_call["function"]["name"], tool_args)
+        
+        if "error" in tool_result:
+            summaries.append("I couldn't complete one of the requested task changes.")
+        elif "title" in tool_result:
+            summaries.append(f"Task '{tool_result['title']}' is now {tool_result.get('status', 'updated')}.")
+        elif "tasks" in tool_result:
+            summaries.append(f"You have {tool_result.get('count', 0)} {tool_result.get('status', 'all')} tasks.")
+    
+    return " ".join(summaries) or (message_response.get("content") or "")
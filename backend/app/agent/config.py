@@ -8,7 +8,7 @@ DESIGN PRINCIPLES:
 - MCP tools attached as callable functions
 - Environment-based API key configuration
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.config import get_settings
 
 
@@ -18,274 +18,150 @@ AGENT_TEMPERATURE = 0.1  # Very low temperature for maximum determinism in tool
 AGENT_MAX_TOKENS = 1000  # Sufficient for task management responses
 
 
-def get_agent_system_prompt() -> str:
+# Role statement
+_PROMPT_INTRO = """You are a friendly task management assistant. You manage the user's todo list only through the task tools."""
+
+# Deterministic keyword → tool mapping
+_PROMPT_INTENTS = """# INTENTS (first match wins)
+1. CREATE → add_task: add, create, remember, remind, need to, don't forget, new task, todo
+2. LIST → list_tasks: show, list, see, what, view, display, tell me, get
+3. COMPLETE → complete_task: done, complete, finish, did, mark, check off
+4. DELETE → delete_task: delete, remove, cancel, clear, get rid of, drop
+5. UPDATE → update_task: change, update, edit, rename, modify
+6. HELP, GREETING (hi, hello), ACKNOWLEDGMENT (ok, thanks), UNCLEAR → reply directly, NEVER call tools"""
+
+# Tool usage and task resolution rules
+_PROMPT_RULES = """# RULES
+- Task intents: ALWAYS call the tool before replying; never claim an action you did not perform.
+- add_task: call at once, never ask for details. Title = message minus command words ("Remember to call mom" → "call mom").
+- Finding the task for complete/delete/update:
+  1. Explicit ID ("task 3", "#5", "id 12") → use it directly.
+  2. Else call list_tasks(status="all"), match the title (exact, then substring, ignoring case), then call the action tool with that task_id. list_tasks alone is never enough.
+  3. Several matches → don't guess; list them as "1. [TITLE] (ID: [ID])" and ask which one.
+  4. No match → "I couldn't find task [ID/TITLE]. Would you like to see your current tasks?"
+- "it"/"that" means the last task mentioned; if none, ask which task (number or title).
+- list_tasks status: all (default), pending, completed."""
+
+# Response templates
+_PROMPT_REPLIES = """# REPLIES (1-2 friendly sentences, first person, never technical errors)
+- Added: "I've added '[TITLE]' to your list."
+- Completed: "Great job! I've marked '[TITLE]' as complete."
+- Deleted: "I've deleted '[TITLE]' from your list."
+- Updated: "I've updated '[TITLE]'."
+- Listed: "Here are your [STATUS] tasks:" + numbered titles; none: "You don't have any [STATUS] tasks. You're all caught up!"
+- Greeting/help/unclear: say you can add, view, complete, update and delete tasks, with an example ("add [task]", "show my tasks"), and ask what they'd like to do."""
+
+
+def _build_system_prompt() -> str:
     """
-    Get the system prompt for the task management agent.
+    Build the system prompt for the task management agent.
     
-    This prompt defines:
-    - Agent personality and behavior
-    - Tool usage guidelines
+    The prompt is assembled from compact sections that define:
+    - Agent role
     - Intent detection rules (deterministic keyword matching)
-    - Task resolution strategies
+    - Tool usage and task resolution strategies
     - Response templates
     
+    Keep it short: every token here is paid on every request.
+    
     Returns:
         System prompt string
     """
-    return """You are a friendly task management assistant that helps users manage their todo lists using natural language.
-
-# CRITICAL TOOL PRIORITY RULES (ABSOLUTE HIGHEST PRIORITY)
-
-**MULTI-STEP TOOL CALLING IS REQUIRED:**
-When a user asks to complete/delete/update a task BY TITLE (not by ID), you MUST:
-1. Call list_tasks to get all tasks
-2. Find the matching task and extract its task_id
-3. Call the appropriate action tool (complete_task/delete_task/update_task) with that task_id
-4. NEVER stop after step 1 - you MUST complete all steps
-
-**CRITICAL: For task completion ("mark X as done", "complete X"):**
-- If you call list_tasks, you MUST then call complete_task with the task_id
-- DO NOT respond to the user without calling complete_task
-- Calling list_tasks alone is NOT sufficient - it's only step 1
-
-**EXAMPLE - Correct Multi-Step Behavior:**
-User: "Mark buy groceries as done"
-→ Tool Call 1: list_tasks(user_id="user123", status="all")
-→ Result: [{"id": 22, "title": "buy groceries", "completed": false}, ...]
-→ Tool Call 2: complete_task(user_id="user123", task_id=22)
-→ Result: {"status": "completed", "title": "buy groceries"}
-→ Response: "Great job! I've marked 'buy groceries' as complete."
-
-**WRONG Behavior (DO NOT DO THIS):**
-User: "Mark buy groceries as done"
-→ Tool Call 1: list_tasks(user_id="user123", status="all")
-→ Response: "Great job! I've marked 'buy groceries' as complete." ❌ WRONG!
-(This is wrong because complete_task was never called!)
-
-# CRITICAL TOOL USAGE RULES (HIGHEST PRIORITY - MUST FOLLOW)
-
-**YOU MUST CALL TOOLS FOR ALL TASK OPERATIONS. DO NOT RESPOND WITHOUT CALLING TOOLS FIRST.**
-
-**TASK CREATION (add_task) - CALL IMMEDIATELY:**
-When the user says ANYTHING that implies they want to add/create/remember a task, you MUST call add_task tool FIRST.
-
-MANDATORY TRIGGERS - Always call add_task when user message contains:
-- "add" + task description → call add_task
-- "create" + task description → call add_task  
-- "I need to" + action → call add_task (title = the action)
-- "need to" + action → call add_task (title = the action)
-- "remind me" + action → call add_task (title = the action)
-- "don't forget" + action → call add_task (title = the action)
-- "remember to" + action → call add_task (title = the action)
-- "new task" → call add_task
-- "todo" → call add_task
-- ANY phrasing that indicates creating/adding a task → call add_task
-
-EXTRACTION RULE FOR TITLE:
-- Remove command words ("add", "create", "remind me to", "I need to", "need to", etc.)
-- Use remaining text as title
-- Example: "Add a task to buy groceries" → title: "buy groceries"
-- Example: "I need to finish the project report" → title: "finish the project report"
-- Example: "Add finish the project report to my tasks" → title: "finish the project report"
-- Example: "Remember to call mom" → title: "call mom"
-
-DO NOT:
-- Ask for clarification about task details
-- Ask about descriptions or due dates
-- Hesitate or ask permission
-- Just acknowledge without calling the tool
-
-EXAMPLES OF CORRECT BEHAVIOR:
-User: "Add a task to buy groceries"
-→ IMMEDIATELY call add_task(title="buy groceries")
-→ THEN respond: "I've added 'buy groceries' to your list."
-
-User: "I need to finish the project report"  
-→ IMMEDIATELY call add_task(title="finish the project report")
-→ THEN respond: "I've added 'finish the project report' to your list."
-
-User: "Add finish the project report to my tasks"
-→ IMMEDIATELY call add_task(title="finish the project report")
-→ THEN respond: "I've added 'finish the project report' to your list."
-
-**TASK LISTING (list_tasks):**
-- Keywords: "show", "list", "see", "what", "view", "display", "tell me", "get", "fetch"
-- IMMEDIATELY call list_tasks without asking for clarification
-
-**TASK COMPLETION (complete_task):**
-- Keywords: "done", "complete", "finish", "completed", "mark as done", "finished", "did", "mark", "check off"
-- STRICT BEHAVIOR BASED ON USER INPUT:
-
-CASE A - User provides task ID explicitly (e.g., "mark task 5 as done", "complete #3"):
-  → IMMEDIATELY call complete_task(task_id=<ID>) - NO list_tasks needed
-
-CASE B - User provides task title/description (e.g., "mark buy groceries as done"):
-  → STEP 1: Call list_tasks(status="all") to get all tasks
-  → STEP 2: Parse the result to find task with matching title
-  → STEP 3: Extract the task_id from the matched task
-  → STEP 4: IMMEDIATELY call complete_task(task_id=<extracted_id>)
-  → CRITICAL: You MUST call complete_task after getting list_tasks results
-  → NEVER respond without calling complete_task if a match is found
-
-EXAMPLE FLOW FOR "Mark buy groceries as done":
-  Step 1: Call list_tasks → Get result: [{"id": 22, "title": "buy groceries", ...}]
-  Step 2: Match "buy groceries" in results → Found task with id=22
-  Step 3: IMMEDIATELY call complete_task(task_id=22)
-  Step 4: Respond: "Great job! I've marked 'buy groceries' as complete."
-
-CRITICAL RULES:
-- If list_tasks is called for completion, complete_task MUST follow
-- NEVER say a task is complete without actually calling complete_task
-- If ONE match found → call complete_task with that task_id
-- If MULTIPLE matches → ask for clarification  
-- If NO match → inform user task not found
-
-**TASK DELETION (delete_task):**
-- Keywords: "delete", "remove", "cancel", "clear", "get rid of"
-- MULTI-STEP PROCESS when task title is provided (not ID):
-  1. FIRST call list_tasks to get all tasks
-  2. THEN match the title against task titles
-  3. IF exactly ONE match → IMMEDIATELY call delete_task with that task_id
-  4. IF multiple matches → ask for clarification
-  5. IF no match → inform user task not found
-- If task ID is explicitly provided → IMMEDIATELY call delete_task with that ID
-
-**TASK UPDATE (update_task):**
-- Keywords: "change", "update", "edit", "rename", "modify"
-- MULTI-STEP PROCESS when task title is provided (not ID):
-  1. FIRST call list_tasks to get all tasks
-  2. THEN match the title against task titles
-  3. IF exactly ONE match → IMMEDIATELY call update_task with that task_id
-  4. IF multiple matches → ask for clarification
-  5. IF no match → inform user task not found
-- If task ID is explicitly provided → IMMEDIATELY call update_task with that ID
-
-**NO TOOL CALLS:**
-- ONLY for: greetings ("hi", "hello"), acknowledgments ("thanks", "ok"), help requests, unclear messages
-- For casual conversation → respond directly WITHOUT calling any tools
-
-# CORE PRINCIPLES
-- Use DETERMINISTIC keyword-based pattern matching (no probabilistic inference)
-- For task operations: ALWAYS use MCP tools
-- For greetings/casual messages: Respond directly WITHOUT calling tools
-- ALWAYS confirm successful actions in natural, conversational language
-- Handle errors gracefully without exposing technical details
-- If task reference is ambiguous, ALWAYS ask for clarification before proceeding
-
-# STRICT BEHAVIOR RULES (MUST FOLLOW)
-1. Add/remember → MUST call add_task tool
-2. Show/list → MUST call list_tasks tool
-3. Done/complete → MUST call complete_task tool
-4. Delete/remove → MUST call delete_task tool
-5. Change/update → MUST call update_task tool
-6. Greeting/casual message → MUST respond directly WITHOUT calling any tools
-7. Unclear/vague message → MUST respond with friendly guidance WITHOUT calling tools
-8. Ambiguous task reference → MUST ask clarification before tool call
-9. After successful tool call → MUST confirm in natural language
-
-# INTENT DETECTION (DETERMINISTIC KEYWORD MATCHING)
-Detect intent using FIRST keyword match:
-1. CREATE_TASK: "add", "create", "remember", "remind", "need to", "don't forget", "make a note", "new task"
-2. LIST_TASKS: "show", "list", "see", "what", "view", "display", "tell me", "get", "fetch"
-3. COMPLETE_TASK: "done", "complete", "finish", "completed", "mark as done", "finished", "did"
-4. DELETE_TASK: "delete", "remove", "cancel", "clear", "get rid of", "eliminate", "drop"
-5. UPDATE_TASK: "change", "update", "edit", "rename", "modify", "revise", "alter"
-6. HELP: "help", "how", "what can you do", "commands", "instructions"
-7. GREETING: "hi", "hello", "hey", "good morning", "good afternoon", "good evening", "yo", "sup", "howdy"
-8. ACKNOWLEDGMENT: "ok", "okay", "thanks", "thank you", "got it", "sure", "alright", "cool", "nice", "great"
-9. UNCLEAR: Message doesn't match any above patterns
-
-# TASK RESOLUTION PRIORITY (STRICT ORDER)
-When resolving task references for complete/delete/update:
-1. **Explicit ID** (highest priority): "task 3", "#5", "id 12" → use ID directly
-2. **Exact Title Match**: Call list_tasks(), find case-insensitive exact match
-3. **Fuzzy Match** (lowest priority): Substring matching
-   - If 1 match: Use it
-   - If >1 match: Ask clarification with numbered list
-   - If 0 matches: Inform user task not found
-
-# AMBIGUOUS TASK HANDLING (MANDATORY)
-CRITICAL: If multiple tasks match a query, DO NOT proceed with tool call.
-Instead, MUST respond with clarification request:
-
-Response format (use exactly):
-"I found multiple tasks matching '[QUERY]':
-1. [TITLE] (ID: [ID])
-2. [TITLE] (ID: [ID])
-Which task would you like to [ACTION]? Please specify by number or provide more details."
-
-NEVER guess which task the user means - ALWAYS ask for clarification.
-
-# PRONOUN RESOLUTION (RULE 3)
-Track last mentioned task_id from:
-- User stating task ID explicitly
-- Agent response after add_task/complete_task/delete_task/update_task
-- First task in list_tasks results
-
-Resolve pronouns ("it", "that", "that task") to last tracked task_id.
-If no task_id in context: Ask "Which task would you like to [ACTION]? You can say the task number or title."
-
-# CONTEXT WINDOW (RULE 4)
-Only consider last 50 messages for contextual understanding.
-References older than 50 messages cannot be resolved.
-
-# PARAMETER EXTRACTION
-- task_id: Pattern match "task <num>", "#<num>", "id <num>"
-- title (CREATE/UPDATE): Everything after command keyword
-- description (CREATE): Optional, follows title or "--desc" flag
-- status (LIST): "all" (default), "pending", "completed"
-
-# TOOL CALLING RULES (MANDATORY FOR TASK OPERATIONS)
-When user intent matches task operations (CREATE/LIST/COMPLETE/DELETE/UPDATE):
-- ALWAYS call the appropriate MCP tool
-- NEVER respond without calling tool first
-- After successful tool call, MUST confirm in natural language
-
-When user intent is GREETING, ACKNOWLEDGMENT, HELP, or UNCLEAR:
-- NEVER call any tools
-- Respond directly with friendly guidance
-- NO tool calls for casual conversation
-
-# MULTI-STEP TASK RESOLUTION (For ambiguous task references)
-When user refers to task by title (not ID):
-1. Call list_tasks(status="all") to get all tasks
-2. Match user's query against task titles
-3. If EXACTLY ONE match: Call appropriate tool (delete_task/complete_task/update_task)
-4. If MULTIPLE matches: STOP and ask clarification (do NOT guess)
-5. If NO matches: Inform user task not found
-
-Execute tools in logical dependency order. Stop immediately on error or ambiguity.
-
-# RESPONSE TEMPLATES (MANDATORY - Natural Language)
-- Task Created (add_task): "I've added '[TITLE]' to your list."
-- Task Completed (complete_task): "[ENCOURAGEMENT] I've marked '[TITLE]' as complete." 
-  (Encouragements: Great job! | Awesome! | Well done! | Nice work! | Excellent!)
-- Task Deleted (delete_task): "I've deleted '[TITLE]' from your list."
-- Task Updated (update_task): "I've updated '[TITLE]'."
-- Tasks Listed (list_tasks with results): "Here are your [STATUS] tasks:\n1. [TITLE]\n2. [TITLE]"
-- Tasks Listed (list_tasks empty): "You don't have any [STATUS] tasks. You're all caught up!"
-- Greeting: "Hi! I'm your task assistant. I can help you add, view, complete, update, and delete tasks. What would you like to do?"
-- Acknowledgment: "You're welcome! Let me know if you need anything else with your tasks." OR "Sounds good! Anything else I can help with?"
-- Help Request: "I can help you with:\n• Adding tasks - just say 'add [task]'\n• Viewing tasks - say 'show my tasks'\n• Completing tasks - say 'mark [task] as done'\n• Deleting tasks - say 'delete [task]'\n• Updating tasks - say 'change [task] to [new details]'\n\nWhat would you like to do?"
-- Unclear Intent: "I'm here to help with your tasks! You can:\n• Add a new task\n• View your tasks\n• Mark tasks as complete\n• Delete tasks\n• Update task details\n\nWhat would you like to do?"
-- Task Not Found: "I couldn't find task [ID/TITLE]. Would you like to see your current tasks?"
-- Missing Parameter: "Which task would you like to [ACTION]? You can say the task number or title."
-- Clarification Needed: "I found [N] tasks. Which one did you mean? Please specify by number or give more details."
-
-# CRITICAL REMINDERS
-- For TASK OPERATIONS: ALWAYS call tools first, then confirm
-- For GREETINGS/CASUAL: NEVER call tools, respond directly
-- NEVER expose technical errors to users
-- ALWAYS be friendly and conversational
-- ALWAYS ask for clarification when task reference is ambiguous
-
-# TONE GUIDELINES
-✅ DO: Be conversational, use first person ("I've added"), confirm actions, be brief (1-2 sentences)
-✅ DO: Respond to greetings and casual messages without calling any tools
-✅ DO: Provide helpful guidance when user's intent is unclear
-❌ DON'T: Be robotic, over-explain, use technical jargon, expose internal errors
-❌ DON'T: Call tools for greetings, acknowledgments, or unclear messages
-❌ DON'T: Throw errors for casual conversation"""
+    return "\n\n".join((
+        _PROMPT_INTRO,
+        _PROMPT_INTENTS,
+        _PROMPT_RULES,
+        _PROMPT_REPLIES
+    ))
+
+
+# Built once at import - the prompt is static, so every request reuses
+# the same string object instead of rebuilding it per chat turn
+SYSTEM_PROMPT: str = _build_system_prompt()
+
+# Shared system message - never mutate, build_agent_messages copies the list
+_SYSTEM_MESSAGE: Dict[str, str] = {
+    "role": "system",
+    "content": SYSTEM_PROMPT
+}
+
+
+# Server-side response templates (same wording as the prompt's REPLIES section)
+# Used when a reply can be produced without an OpenAI round-trip
+RESPONSE_TEMPLATES: Dict[str, str] = {
+    "GREETING": (
+        "Hi! I'm your task assistant. I can help you add, view, complete, update, "
+        "and delete tasks. What would you like to do?"
+    ),
+    "ACKNOWLEDGMENT": "You're welcome! Let me know if you need anything else with your tasks.",
+    "HELP": (
+        "I can help you with:\n"
+        "• Adding tasks - just say 'add [task]'\n"
+        "• Viewing tasks - say 'show my tasks'\n"
+        "• Completing tasks - say 'mark [task] as done'\n"
+        "• Deleting tasks - say 'delete [task]'\n"
+        "• Updating tasks - say 'change [task] to [new details]'\n\n"
+        "What would you like to do?"
+    ),
+    "UNCLEAR": (
+        "I'm here to help with your tasks! You can:\n"
+        "• Add a new task\n"
+        "• View your tasks\n"
+        "• Mark tasks as complete\n"
+        "• Delete tasks\n"
+        "• Update task details\n\n"
+        "What would you like to do?"
+    ),
+    "add_task": "I've added '{title}' to your list.",
+    "complete_task": "Great job! I've marked '{title}' as complete.",
+    "delete_task": "I've deleted '{title}' from your list.",
+    "update_task": "I've updated '{title}'.",
+    "task_not_found": "I couldn't find task #{task_id}. Would you like to see your current tasks?",
+}
+
+
+def get_agent_system_prompt() -> str:
+    """
+    Get the system prompt for the task management agent.
+    
+    Returns:
+        System prompt string (built once at import)
+    """
+    return SYSTEM_PROMPT
+
+
+def count_prompt_tokens(text: str) -> Optional[int]:
+    """
+    Count tokens in text for the agent model.
+    
+    Uses tiktoken when it is installed (optional dependency).
+    
+    Args:
+        text: Text to tokenize
+        
+    Returns:
+        Token count, or None if tiktoken is unavailable
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None  # tiktoken is optional, size logging just degrades
+    
+    try:
+        encoding = tiktoken.encoding_for_model(AGENT_MODEL)
+    except Exception:
+        return None  # Unknown model or encoding files not downloadable
+    
+    return len(encoding.encode(text))
+
+
+# Agent configuration, built once at import (read-only)
+AGENT_CONFIG: Dict[str, Any] = {
+    "model": AGENT_MODEL,
+    "temperature": AGENT_TEMPERATURE,
+    "max_tokens": AGENT_MAX_TOKENS,
+    "api_key": get_settings().openai_api_key
+}
 
 
 def get_agent_config() -> Dict[str, Any]:
@@ -294,6 +170,7 @@ def get_agent_config() -> Dict[str, Any]:
     
     This configuration is used for each request to create a stateless agent.
     No memory is stored in RAM - all conversation state comes from the database.
+    The dict is shared by all callers; they must treat it as read-only.
     
     Returns:
         Dictionary with agent configuration:
@@ -302,38 +179,48 @@ def get_agent_config() -> Dict[str, Any]:
         - max_tokens: Maximum response length
         - api_key: OpenAI API key from environment
     """
-    settings = get_settings()
+    return AGENT_CONFIG
+
+
+def _system_cache_block() -> Dict[str, str]:
+    """
+    Build the system message that forms the cacheable prompt prefix.
+    
+    OpenAI applies prompt caching automatically to repeated request
+    prefixes, so the system prompt must stay byte-identical across
+    requests: never interpolate timestamps, user IDs or other
+    per-request values into it.
     
-    return {
-        "model": AGENT_MODEL,
-        "temperature": AGENT_TEMPERATURE,
-        "max_tokens": AGENT_MAX_TOKENS,
-        "api_key": settings.openai_api_key
-    }
+    Returns:
+        System message dict for the OpenAI messages array
+    """
+    return _SYSTEM_MESSAGE
 
 
 def build_agent_messages(
-    conversation_history: List[Dict[str, str]]
+    conversation_history: List[Dict[str, str]],
+    summary: Optional[str] = None
 ) -> List[Dict[str, str]]:
     """
     Build messages array for OpenAI API from conversation history.
     
-    Prepends system message to conversation history.
+    Prepends the system message to conversation history so every
+    request shares the same cacheable prefix.
     This function is called per request - no persistent state.
     
     Args:
         conversation_history: List of message dicts with 'role' and 'content'
+        summary: Optional summary of messages older than the history
         
     Returns:
         List of messages including system prompt
     """
-    system_message = {
-        "role": "system",
-        "content": get_agent_system_prompt()
-    }
-    
-    # Insert system message at beginning
-    return [system_message] + conversation_history
+    # Insert system message at beginning (cacheable prefix)
+    if summary:
+        # After the static prompt, so the cacheable prefix is unchanged
+        summary_block = {"role": "system", "content": f"Summary of the earlier conversation: {summary}"}
+        return [_system_cache_block(), summary_block, *conversation_history]
+    return [_system_cache_block(), *conversation_history]
 
 
 # Maximum context window (messages)
@@ -354,6 +241,20 @@ def should_truncate_context(message_count: int) -> bool:
     return message_count > MAX_CONTEXT_MESSAGES
 
 
+# Rolling summary: once the unsummarized history fills the context window,
+# everything but the newest SUMMARY_KEEP_MESSAGES is folded into the summary
+# (so it is refreshed every MAX_CONTEXT_MESSAGES - SUMMARY_KEEP_MESSAGES messages)
+SUMMARY_KEEP_MESSAGES = 20
+SUMMARY_MAX_TOKENS = 200
+
+SUMMARY_PROMPT = (
+    "Summarize this task-management conversation in under 150 words. "
+    "Keep task titles and IDs, what was added, completed, changed or deleted, "
+    "and any user preferences. Merge in the previous summary if one is given. "
+    "Reply with the summary only."
+)
+
+
 def get_context_window_size() -> int:
     """
     Get the maximum number of messages to include in agent context.
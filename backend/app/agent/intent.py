@@ -0,0 +1,151 @@
+"""
+Intent Classification - Deterministic keyword matching for user messages.
+Mirrors the intent rules in the agent system prompt so that trivial messages
+(greetings, acknowledgments, help, explicit "complete task N") can be answered
+without an OpenAI round-trip.
+
+DESIGN PRINCIPLES:
+- Same keyword lists and priority order as the system prompt
+- One combined pattern compiled at import (single scan per message)
+- Task intents win over conversational ones ("ok, add milk" is CREATE)
+- Shortcuts only act on unambiguous messages (see matched_intents,
+  extract_task_ids, is_small_talk); anything else goes to the model
+"""
+import re
+from typing import FrozenSet, List, Optional
+
+
+# Intent names, in detection priority order
+CREATE = "CREATE_TASK"
+LIST = "LIST_TASKS"
+COMPLETE = "COMPLETE_TASK"
+DELETE = "DELETE_TASK"
+UPDATE = "UPDATE_TASK"
+HELP = "HELP"
+GREETING = "GREETING"
+ACKNOWLEDGMENT = "ACKNOWLEDGMENT"
+UNCLEAR = "UNCLEAR"
+
+# Intents answered with a template - no tools, no LLM call. UNCLEAR is not
+# one of them: a message with no keyword may still be a task ("buy eggs")
+CONVERSATIONAL_INTENTS = frozenset({HELP, GREETING, ACKNOWLEDGMENT})
+
+# Small talk is short and never mentions tasks or numbers
+SMALL_TALK_MAX_WORDS = 4
+_TASK_MENTION_RE = re.compile(r"\b(?:tasks?|todos?|list)\b|\d", re.IGNORECASE)
+
+# Keyword lists (first matching intent wins)
+_INTENT_KEYWORDS = (
+    (CREATE, ("add", "create", "remember", "remind", "need to", "don't forget", "make a note", "new task", "todo")),
+    (LIST, ("show", "list", "see", "what", "view", "display", "tell me", "get", "fetch")),
+    (COMPLETE, ("done", "complete", "completed", "finish", "finished", "did", "mark", "check off")),
+    (DELETE, ("delete", "remove", "cancel", "clear", "get rid of", "eliminate", "drop")),
+    (UPDATE, ("change", "update", "edit", "rename", "modify", "revise", "alter")),
+    (HELP, ("help", "how", "what can you do", "commands", "instructions")),
+    (GREETING, ("hi", "hello", "hey", "good morning", "good afternoon", "good evening", "yo", "sup", "howdy")),
+    (ACKNOWLEDGMENT, ("ok", "okay", "thanks", "thank you", "got it", "sure", "alright", "cool", "nice", "great")),
+)
+
+# All keywords in one pattern, one named group per intent (alternatives are
+# tried in priority order at each position)
+_INTENT_RE = re.compile(
+    "|".join(
+        f"(?P<{intent}>" + r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b)"
+        for intent, keywords in _INTENT_KEYWORDS
+    ),
+    re.IGNORECASE
+)
+
+# Lower value wins when a message contains keywords for several intents
+_INTENT_PRIORITY = {intent: rank for rank, (intent, _) in enumerate(_INTENT_KEYWORDS)}
+
+# Explicit task reference: "task 5", "task #5", "#5", "id 12"
+TASK_ID_RE = re.compile(r"(?:\btask|#|\bid)\s*#?(\d+)\b", re.IGNORECASE)
+
+# Negations that flip a completion request ("mark task 5 as not done",
+# "don't complete task 5"), including negative contractions
+NEGATION_RE = re.compile(
+    r"\b(?:not|no|never|cannot|undo|unmark|uncheck|pending)\b|n['\u2019]t\b",
+    re.IGNORECASE
+)
+
+
+def classify(message: str) -> str:
+    """
+    Classify a user message into an intent using keyword matching.
+    
+    Scans the message once with the combined pattern and returns the
+    highest-priority intent among the keywords found.
+    
+    Args:
+        message: User's message text
+    
+    Returns:
+        Intent name (UNCLEAR if no keyword matches)
+    """
+    best = UNCLEAR
+    best_rank = len(_INTENT_PRIORITY)
+    for match in _INTENT_RE.finditer(message):
+        rank = _INTENT_PRIORITY[match.lastgroup]
+        if rank < best_rank:
+            best, best_rank = match.lastgroup, rank
+            if rank == 0:
+                break  # Nothing outranks the first intent
+    return best
+
+
+def matched_intents(message: str) -> FrozenSet[str]:
+    """
+    Return every intent whose keywords occur in a message.
+    
+    Used by shortcuts, which need exactly one intent: "complete task 5
+    and delete task 6" matches two and must go to the model.
+    
+    Args:
+        message: User's message text
+    
+    Returns:
+        Matched intent names (empty if no keyword matches)
+    """
+    return frozenset(match.lastgroup for match in _INTENT_RE.finditer(message))
+
+
+def is_small_talk(message: str) -> bool:
+    """
+    Check that a message is short and doesn't mention tasks or numbers.
+    
+    A conversational keyword alone is not enough for a template reply:
+    "how many tasks do I have left" contains "how" but is a question
+    about the task list.
+    
+    Args:
+        message: User's message text
+    """
+    return len(message.split()) <= SMALL_TALK_MAX_WORDS and not _TASK_MENTION_RE.search(message)
+
+
+def extract_task_ids(message: str) -> List[int]:
+    """
+    Extract every explicit task ID from a user message, in order.
+    
+    Args:
+        message: User's message text
+    
+    Returns:
+        Task IDs (empty if the message has no explicit ID)
+    """
+    return [int(task_id) for task_id in TASK_ID_RE.findall(message)]
+
+
+def extract_task_id(message: str) -> Optional[int]:
+    """
+    Extract an explicit task ID from a user message.
+    
+    Args:
+        message: User's message text
+    
+    Returns:
+        Task ID, or None if the message has no explicit ID
+    """
+    match = TASK_ID_RE.search(message)
+    return int(match.group(1)) if match else None
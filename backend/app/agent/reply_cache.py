@@ -0,0 +1,103 @@
+"""
+Reply Cache - Reuse the model's tool-free replies for repeated messages.
+Repeated questions in the same context ("what can you do?" at the start of
+a new conversation) are answered from memory instead of another OpenAI call.
+
+DESIGN PRINCIPLES:
+- Only replies the model gave without calling a tool are cached - they
+  don't depend on the user's task data
+- Keyed by user, conversation summary, the recent messages and the
+  normalized current message, so a reply is only reused in the same context
+- In-process LRU with a short TTL (per worker, nothing to deploy)
+"""
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+
+# Cache size and lifetime
+REPLY_CACHE_MAX_ENTRIES = 1024
+REPLY_CACHE_TTL_SECONDS = 300
+
+# Messages of context (current message included) that are part of the key
+REPLY_CACHE_CONTEXT_MESSAGES = 5
+
+# Case, whitespace and trailing punctuation other than "?" don't change a reply
+_TRAILING_PUNCTUATION_RE = re.compile(r"[\s.!,;:]+$")
+
+# Key -> (expiry time, reply), least recently used first
+_cache: OrderedDict[bytes, Tuple[float, str]] = OrderedDict()
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation (except "?")."""
+    return _TRAILING_PUNCTUATION_RE.sub("", " ".join(message.lower().split()))
+
+
+def reply_cache_key(
+    user_id: str,
+    summary: Optional[str],
+    history: List[Dict[str, str]]
+) -> bytes:
+    """
+    Build the cache key for the current turn.
+    
+    Args:
+        user_id: The ID of the user
+        summary: Rolling conversation summary (None if there is none)
+        history: Context window as role/content dicts (current message last)
+    
+    Returns:
+        Digest of the user, summary, recent context and normalized message
+    """
+    *context, current = history[-REPLY_CACHE_CONTEXT_MESSAGES:]
+    payload = orjson.dumps([
+        user_id,
+        summary,
+        [[item["role"], item["content"]] for item in context],
+        normalize_message(current["content"])
+    ])
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def get_cached_reply(key: bytes) -> Optional[str]:
+    """
+    Return the cached reply for key, or None if missing or expired.
+    
+    Args:
+        key: Key from reply_cache_key()
+    """
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    
+    expires_at, reply = entry
+    if expires_at <= time.monotonic():
+        del _cache[key]
+        return None
+    
+    _cache.move_to_end(key)
+    return reply
+
+
+def cache_reply(key: bytes, reply: str) -> None:
+    """
+    Store a tool-free reply, evicting the least recently used entry when full.
+    
+    Args:
+        key: Key from reply_cache_key()
+        reply: The assistant reply text
+    """
+    _cache[key] = (time.monotonic() + REPLY_CACHE_TTL_SECONDS, reply)
+    _cache.move_to_end(key)
+    if len(_cache) > REPLY_CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+
+def clear_reply_cache() -> None:
+    """Drop all cached replies."""
+    _cache.clear()
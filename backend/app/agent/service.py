@@ -5,14 +5,18 @@ Handles conversation state, tool calling, and response generation.
 ARCHITECTURE NOTES:
 - Stateless agent: No memory stored in RAM
 - Conversation state: Loaded from database per request
-- Agent creation: Fresh instance per request using environment API key
+- OpenAI client: One shared instance per process (pooled keep-alive connections)
 - MCP tools: Attached as callable functions per request
 - Error handling: All errors converted to user-friendly messages
 """
-import json
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+import asyncio
+import importlib.util
+import logging
+import httpx
+import orjson
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
 from openai import AsyncOpenAI, APIError, RateLimitError, APIConnectionError, AuthenticationError
+from sqlalchemy import func, insert, update
 from sqlmodel import Session, select
 
 from app.config import get_settings
@@ -22,41 +26,385 @@ from app.agent.config import (
     get_agent_config,
     get_agent_system_prompt,
     build_agent_messages,
-    get_context_window_size
+    get_context_window_size,
+    RESPONSE_TEMPLATES,
+    MAX_CONTEXT_MESSAGES
 )
-from app.mcp.client import get_mcp_tools, execute_mcp_tool
+from app.agent.summary import schedule_summary
+from app.agent.reply_cache import reply_cache_key, get_cached_reply, cache_reply
+from app.agent.intent import (
+    matched_intents,
+    is_small_talk,
+    extract_task_ids,
+    CONVERSATIONAL_INTENTS,
+    COMPLETE,
+    NEGATION_RE
+)
+from app.mcp.client import get_mcp_tools, execute_mcp_tool, execute_mcp_tools_raw
 from app.mcp.errors import DatabaseError, OpenAIAPIError
 
+logger = logging.getLogger(__name__)
+
+
+# OpenAI HTTP client settings
+OPENAI_TIMEOUT_SECONDS = 30.0
+OPENAI_MAX_RETRIES = 2
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 50
+OPENAI_PROBE_TIMEOUT_SECONDS = 5.0  # Startup key check: one short attempt, no retries
+
+# Tools whose confirmation is a fixed template (no second completion needed)
+TEMPLATED_TOOLS = frozenset({"add_task", "complete_task", "delete_task", "update_task"})
+
+# Built once; messages are inserted from plain dicts - no Message objects to
+# construct or track. A list of rows is sent as one multi-row INSERT
+_INSERT_MESSAGES_STATEMENT = insert(Message)
+
+# HTTP/2 needs the optional "h2" package (httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Set when the startup probe finds the configured key is rejected by OpenAI
+_OPENAI_KEY_REJECTED = False
+
+# Shared client - reuses TLS sessions and keep-alive connections across requests
+_CLIENT: Optional[AsyncOpenAI] = None
+
+
+def openai_available() -> bool:
+    """
+    Check whether chat requests can reach OpenAI.
+    
+    Returns:
+        False if no API key is configured or the startup probe rejected it
+    """
+    return get_settings().openai_configured and not _OPENAI_KEY_REJECTED
+
+
+async def verify_openai_key() -> bool:
+    """
+    Probe the configured API key once at startup (models.list).
+    
+    Network failures are logged and treated as available, so a transient
+    outage at boot does not disable chat for the life of the process.
+    The probe makes a single short attempt instead of the chat timeout
+    and retries.
+    
+    Returns:
+        Whether chat is available after the probe
+    """
+    global _OPENAI_KEY_REJECTED
+    if not get_settings().openai_configured:
+        logger.warning("OPENAI_API_KEY is not set - chat endpoints will return 503")
+        return False
+    
+    try:
+        await get_openai_client().with_options(
+            timeout=OPENAI_PROBE_TIMEOUT_SECONDS,
+            max_retries=0
+        ).models.list()
+    except AuthenticationError:
+        _OPENAI_KEY_REJECTED = True
+        logger.error("OpenAI rejected OPENAI_API_KEY - chat endpoints will return 503")
+    except Exception as e:
+        logger.warning(f"Could not verify OpenAI API key at startup: {str(e)}")
+    
+    return openai_available()
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Get the process-wide OpenAI client, creating it on first use.
+    
+    Returns:
+        Shared AsyncOpenAI client configured from the environment API key
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = AsyncOpenAI(
+            api_key=get_agent_config()["api_key"],
+            max_retries=OPENAI_MAX_RETRIES,
+            timeout=OPENAI_TIMEOUT_SECONDS,
+            http_client=httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(OPENAI_TIMEOUT_SECONDS),
+                limits=httpx.Limits(max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS)
+            )
+        )
+    return _CLIENT
+
+
+async def close_openai_client() -> None:
+    """Close the shared OpenAI client (called at application shutdown)."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.close()
+        _CLIENT = None
+
 
 def load_message_history(
     session: Session,
     conversation_id: int,
-    limit: Optional[int] = None
-) -> List[Message]:
+    user_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None
+) -> List[Dict[str, str]]:
     """
     Load message history from database.
     
+    Selects only role/content (no ORM hydration) and lets the database
+    return the newest N messages in chronological order, using the
+    (conversation_id, created_at) index for the ORDER BY + LIMIT.
+    
     Args:
         session: Database session
         conversation_id: ID of conversation
+        user_id: Optional owner filter (defense in depth)
         limit: Maximum number of messages (defaults to MAX_CONTEXT_MESSAGES)
-        
+        after_id: Only messages with a greater ID (those not yet summarized)
+    
     Returns:
-        List of messages, ordered from oldest to newest
+        List of role/content dicts, ordered from oldest to newest
     """
     if limit is None:
         limit = get_context_window_size()
     
-    query = (
-        select(Message)
+    # Newest N messages...
+    recent = (
+        select(Message.role, Message.content, Message.created_at, Message.id)
         .where(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at.desc())
-        .limit(limit)
     )
+    if user_id is not None:
+        recent = recent.where(Message.user_id == user_id)
+    if after_id is not None:
+        recent = recent.where(Message.id > after_id)
+    recent = recent.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit).subquery()
+    
+    # ...returned oldest first (id breaks ties within one transaction)
+    query = select(recent.c.role, recent.c.content).order_by(recent.c.created_at.asc(), recent.c.id.asc())
+    
+    return [
+        {"role": role, "content": content}
+        for role, content in session.exec(query).all()
+    ]
+
+
+async def resolve_without_llm(
+    user_id: str,
+    message: str,
+    history: List[Dict[str, str]]
+) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Answer deterministic intents server-side, skipping the OpenAI round-trip.
+    
+    Handles the same cases the system prompt resolves without reasoning:
+    - Short greetings, acknowledgments and help requests (template reply)
+    - "Complete task N" with an explicit ID (direct complete_task call)
+    
+    Only unambiguous messages are shortcut: exactly one intent, and for
+    completions exactly one task ID and no negation. Questions, replies
+    to a question the assistant asked, messages without any keyword
+    ("buy eggs tomorrow" may be a task) and mixed requests always go to
+    the model.
+    
+    Args:
+        user_id: The ID of the user
+        message: User's message text
+        history: Context window as role/content dicts (current message last)
+    
+    Returns:
+        (assistant_content, tool_calls) or None if the model is needed
+    """
+    if message.rstrip().endswith("?"):
+        return None
+    
+    previous = history[-2] if len(history) >= 2 else None
+    if previous and previous["role"] == "assistant" and previous["content"].rstrip().endswith("?"):
+        return None
+    
+    intents = matched_intents(message)
+    if len(intents) != 1:
+        return None  # No keyword, or several requests in one message
+    intent, = intents
+    
+    if intent in CONVERSATIONAL_INTENTS:
+        return (RESPONSE_TEMPLATES[intent], []) if is_small_talk(message) else None
+    
+    if intent != COMPLETE or NEGATION_RE.search(message):
+        return None
+    
+    task_ids = extract_task_ids(message)
+    if len(task_ids) != 1:
+        return None
+    task_id = task_ids[0]
+    
+    tool_args = {"user_id": user_id, "task_id": task_id}
+    tool_result = await execute_mcp_tool("complete_task", tool_args)
+    tool_calls = [{
+        "tool": "complete_task",
+        "arguments": tool_args,
+        "result": tool_result
+    }]
+    
+    assistant_content = template_tool_reply("complete_task", tool_args, tool_result)
+    if assistant_content is None:
+        return None  # Unexpected tool error - let the model phrase it
+    return assistant_content, tool_calls
+
+
+def template_tool_reply(
+    tool_name: str,
+    tool_args: Dict[str, Any],
+    tool_result: Dict[str, Any]
+) -> Optional[str]:
+    """
+    Phrase the confirmation for a single task action from RESPONSE_TEMPLATES.
+    
+    Used instead of a second OpenAI completion: the system prompt dictates
+    these confirmations verbatim, so the model adds nothing but latency.
+    
+    Args:
+        tool_name: Name of the executed tool
+        tool_args: Arguments the tool was called with
+        tool_result: Result returned by the tool
+    
+    Returns:
+        Confirmation text, or None if the result needs the model to explain it
+    """
+    if tool_name not in TEMPLATED_TOOLS:
+        return None
+    if "error" not in tool_result and "title" in tool_result:
+        return RESPONSE_TEMPLATES[tool_name].format(title=tool_result["title"])
+    if tool_result.get("error_type") == "TaskNotFoundError" and "task_id" in tool_args:
+        return RESPONSE_TEMPLATES["task_not_found"].format(task_id=tool_args["task_id"])
+    return None
+
+
+def _load_turn_context(
+    session: Session,
+    user_id: str,
+    conversation_id: Optional[int]
+) -> Tuple[Optional[str], List[Dict[str, str]]]:
+    """
+    Load the conversation summary and the previous N-1 messages, then end
+    the read transaction so no connection is held during the OpenAI call.
+    
+    Returns:
+        (summary, history) - (None, []) for a new conversation
+    
+    Raises:
+        ValueError: If the conversation doesn't exist or belongs to another user
+    """
+    if not conversation_id:
+        return None, []
+    
+    try:
+        conversation = session.get(Conversation, conversation_id)
+        if not conversation or conversation.user_id != user_id:
+            raise ValueError(f"Conversation {conversation_id} not found or doesn't belong to user")
+        
+        history = load_message_history(
+            session=session,
+            conversation_id=conversation_id,
+            user_id=user_id,
+            limit=get_context_window_size() - 1,
+            after_id=conversation.summary_up_to_msg_id
+        )
+        return conversation.summary, history
+    finally:
+        session.rollback()  # Read-only; releases the connection to the pool
+
+
+def touch_conversation(session: Session, conversation_id: int) -> None:
+    """
+    Bump a conversation's updated_at to the database clock.
+    
+    Args:
+        session: Database session
+        conversation_id: ID of conversation
+    """
+    session.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .values(updated_at=func.now())
+        .execution_options(synchronize_session=False)  # No in-memory sync (or RETURNING) needed
+    )
+
+
+def _store_assistant_message(
+    session: Session,
+    conversation_id: Optional[int],
+    user_id: str,
+    content: str,
+    user_content: str
+) -> int:
+    """
+    Store the user message and the assistant response, bump the
+    conversation timestamp and commit.
+    
+    This is the only transaction that writes during a chat turn: it runs
+    after the model has replied, so no connection is held (or left idle
+    in a transaction) while OpenAI is working. Both messages are inserted
+    with one statement. A conversation created here already carries the
+    transaction's now() as updated_at, so its bump is skipped.
+    
+    Args:
+        conversation_id: Existing conversation, or None to create one
+        user_content: The user's message
+    
+    Returns:
+        ID of the conversation the messages were stored in
     
-    messages = session.exec(query).all()
-    # Reverse to get chronological order (oldest first)
-    return list(reversed(messages))
+    Raises:
+        DatabaseError: If the write fails
+    """
+    try:
+        if not conversation_id:
+            conversation = Conversation(user_id=user_id)
+            session.add(conversation)
+            session.flush()  # Assigns conversation.id
+            stored_conversation_id = conversation.id
+        else:
+            touch_conversation(session, conversation_id)
+            stored_conversation_id = conversation_id
+        
+        session.execute(_INSERT_MESSAGES_STATEMENT, [
+            {
+                "conversation_id": stored_conversation_id,
+                "user_id": user_id,
+                "role": "user",
+                "content": user_content
+            },
+            {
+                "conversation_id": stored_conversation_id,
+                "user_id": user_id,
+                "role": "assistant",
+                "content": content
+            }
+        ])
+        
+        session.commit()
+    except Exception as e:
+        raise DatabaseError() from e
+    
+    return stored_conversation_id
+
+
+def _delta_event(content: str) -> Dict[str, Any]:
+    """Build a stream event carrying the next piece of the assistant reply."""
+    return {"type": "delta", "content": content}
+
+
+def _done_event(
+    conversation_id: int,
+    response: str,
+    tool_calls: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Build the final stream event (same fields as the JSON chat response)."""
+    return {
+        "type": "done",
+        "conversation_id": conversation_id,
+        "response": response,
+        "tool_calls": tool_calls
+    }
 
 
 async def process_chat_message(
@@ -65,77 +413,117 @@ async def process_chat_message(
     message: str,
     conversation_id: Optional[int] = None
 ) -> Dict[str, Any]:
+    """
+    Process a chat message and return the complete response.
+    Buffers stream_chat_message() for callers that need a single JSON body.
+    
+    Args:
+        session: Database session (injected dependency)
+        user_id: The ID of the user
+        message: User's message text
+        conversation_id: Optional existing conversation ID
+    
+    Returns:
+        Dictionary with conversation_id, response, and tool_calls
+    """
+    result = None
+    async for event in stream_chat_message(session, user_id, message, conversation_id):
+        if event["type"] == "done":
+            result = {
+                "conversation_id": event["conversation_id"],
+                "response": event["response"],
+                "tool_calls": event["tool_calls"]
+            }
+    
+    if result is None:
+        raise RuntimeError("Chat stream ended without a final event")
+    return result
+
+
+async def stream_chat_message(
+    session: Session,
+    user_id: str,
+    message: str,
+    conversation_id: Optional[int] = None
+) -> AsyncIterator[Dict[str, Any]]:
     """
     Process a chat message using OpenAI Agents with MCP tools.
     Completely stateless - loads conversation from DB, processes, saves back.
     
+    Yields events as the reply is produced:
+    - {"type": "delta", "content": str} - next piece of the assistant reply
+    - {"type": "done", "conversation_id", "response", "tool_calls"} - final,
+      yielded once the turn has been committed (a new conversation only
+      gets its ID here)
+    
+    Only the final completion of the tool-calling path is streamed; the
+    first completion needs complete tool_calls, so its reply arrives as
+    a single delta.
+    
     STATELESS DESIGN:
-    - Creates fresh OpenAI client per request using environment API key
+    - Reuses the shared OpenAI client (no per-request connection setup)
     - Loads conversation history from database
     - No agent memory stored in RAM
-    - Context window: Last 50 messages only
+    - Context window: Rolling summary + up to 50 unsummarized messages
+    - Reads run in a short transaction that ends before the OpenAI call
+    - Single write transaction: the conversation, user message and reply
+      are stored and committed together once the reply is complete
     
     Args:
         session: Database session (injected dependency)
         user_id: The ID of the user
         message: User's message text
         conversation_id: Optional existing conversation ID
-        
-    Returns:
-        Dictionary with conversation_id, response, and tool_calls
+    
+    Yields:
+        Delta events, then one done event
     """
-    # Create fresh OpenAI client per request (stateless)
-    # Uses API key from environment via get_agent_config()
+    # Shared OpenAI client - holds connections only, no conversation state
     agent_config = get_agent_config()
-    client = AsyncOpenAI(api_key=agent_config["api_key"])
+    client = get_openai_client()
     
+    # Database calls below run on worker threads so the event loop keeps
+    # serving other requests while this one waits on Postgres
     try:
-        # Step 1: Get or create conversation
-        if conversation_id:
-            conversation = session.get(Conversation, conversation_id)
-            if not conversation or conversation.user_id != user_id:
-                raise ValueError(f"Conversation {conversation_id} not found or doesn't belong to user")
-        else:
-            conversation = Conversation(user_id=user_id)
-            session.add(conversation)
-            session.commit()
-            session.refresh(conversation)
-    except Exception as e:
-        raise DatabaseError() from e
-    
-    try:
-        # Step 2: Store user message in database
-        user_message = Message(
-            conversation_id=conversation.id,
-            user_id=user_id,
-            role="user",
-            content=message
+        # Steps 1-2: Check the conversation and load the previous N-1
+        # messages (context window); the current message is appended in
+        # memory and stored with the reply
+        summary, history = await asyncio.to_thread(
+            _load_turn_context, session, user_id, conversation_id
         )
-        session.add(user_message)
-        session.commit()
+    except ValueError:
+        raise
     except Exception as e:
         raise DatabaseError() from e
+    history.append({"role": "user", "content": message})
     
-    try:
-        # Step 3: Load last N messages from database (context window)
-        history_messages = load_message_history(
-            session=session,
-            conversation_id=conversation.id,
-            limit=get_context_window_size()
-        )
-    except Exception as e:
-        raise DatabaseError() from e
+    # Unsummarized history fills the window - fold older messages into the
+    # conversation summary in the background (used from the next turn on)
+    if len(history) >= get_context_window_size():
+        schedule_summary(client, conversation_id)
     
-    # Step 4: Build messages for OpenAI (system + history)
+    # Step 3: Build messages for OpenAI (system + summary + history)
     # Includes system prompt with behavior rules
-    # Convert Message objects to dictionaries
-    history_dicts = [
-        {"role": msg.role, "content": msg.content}
-        for msg in history_messages
-    ]
-    openai_messages = build_agent_messages(history_dicts)
+    openai_messages = build_agent_messages(history, summary)
+    
+    # Step 4: Answer deterministic intents without calling OpenAI, or reuse
+    # the model's tool-free reply to the same message in the same context
+    shortcut = await resolve_without_llm(user_id, message, history)
+    cache_key = reply_cache_key(user_id, summary, history)
+    if shortcut is None:
+        cached_reply = get_cached_reply(cache_key)
+        if cached_reply is not None:
+            shortcut = cached_reply, []
+    if shortcut is not None:
+        assistant_content, tool_calls_made = shortcut
+        conversation_id = await asyncio.to_thread(
+            _store_assistant_message, session, conversation_id, user_id, assistant_content, message
+        )
+        yield _delta_event(assistant_content)
+        yield _done_event(conversation_id, assistant_content, tool_calls_made)
+        return
     
-    # Step 5: Get MCP tools (stateless - loaded per request)
+    # Step 5: Get MCP tools (built once per process, shared tuple)
     mcp_tools = get_mcp_tools()
     
     # Step 6: Call OpenAI with tools
@@ -148,36 +536,9 @@ async def process_chat_message(
             messages=openai_messages,
             tools=mcp_tools,
             temperature=agent_config["temperature"],
-            max_tokens=agent_config["max_tokens"]
+            max_tokens=agent_config["max_tokens"],
+            user=user_id  # Keeps a user's requests on the same prompt-cache shard
         )
-    except AuthenticationError as e:
-        # Invalid or missing API key - graceful fallback
-        assistant_content = (
-            "I'm currently unable to process AI responses because the OpenAI API key is not properly configured. "
-            "However, the system is fully set up and ready! Your messages are being saved to the database. "
-            "Once the API key is configured, I'll be able to help you manage your tasks with natural language."
-        )
-        
-        # Store fallback message in database
-        try:
-            assistant_message = Message(
-                conversation_id=conversation.id,
-                user_id=user_id,
-                role="assistant",
-                content=assistant_content
-            )
-            session.add(assistant_message)
-            conversation.updated_at = datetime.utcnow()
-            session.add(conversation)
-            session.commit()
-        except Exception as db_error:
-            raise DatabaseError() from db_error
-        
-        return {
-            "conversation_id": conversation.id,
-            "response": assistant_content,
-            "tool_calls": []
-        }
     except RateLimitError as e:
         raise OpenAIAPIError(retry_after=60) from e
     except APIConnectionError as e:
@@ -192,66 +553,72 @@ async def process_chat_message(
         # Append assistant's tool call message
         openai_messages.append(message_response)
         
-        # Execute each tool call
-        for tool_call in message_response.tool_calls:
-            tool_name = tool_call.function.name
-            tool_args = json.loads(tool_call.function.arguments)
-            
-            # Add user_id to tool arguments (required by all tools)
-            tool_args["user_id"] = user_id
-            
-            # Execute MCP tool
-            tool_result = await execute_mcp_tool(session, tool_name, tool_args)
-            
-            # Record tool call
+        # Parse arguments into fresh dicts that are never mutated afterwards
+        # (user_id is required by all tools and always overrides the model's)
+        tool_args_list = [
+            orjson.loads(tool_call.function.arguments) | {"user_id": user_id}
+            for tool_call in message_response.tool_calls
+        ]
+        
+        # Execute MCP tools concurrently (each call opens its own DB session;
+        # calls on the same task, and reads after writes, keep their order)
+        tool_results = await execute_mcp_tools_raw([
+            (tool_call.function.name, tool_args)
+            for tool_call, tool_args in zip(message_response.tool_calls, tool_args_list)
+        ])
+        
+        # Record tool calls and results in the order the model issued them
+        for tool_call, tool_args, tool_result in zip(message_response.tool_calls, tool_args_list, tool_results):
             tool_calls_made.append({
-                "tool": tool_name,
+                "tool": tool_call.function.name,
                 "arguments": tool_args,
-                "result": tool_result
+                "result": tool_result.value
             })
             
-            # Append tool result message
+            # Append tool result message (server's JSON text, not re-encoded)
             openai_messages.append({
                 "role": "tool",
                 "tool_call_id": tool_call.id,
-                "content": json.dumps(tool_result)
+                "content": tool_result.json_text
             })
         
+        # Single task action: phrase the confirmation from its template
+        if len(tool_calls_made) == 1:
+            tool_call_made = tool_calls_made[0]
+            assistant_content = template_tool_reply(
+                tool_call_made["tool"],
+                tool_call_made["arguments"],
+                tool_call_made["result"]
+            )
+            if assistant_content is not None:
+                conversation_id = await asyncio.to_thread(
+                    _store_assistant_message, session, conversation_id, user_id, assistant_content, message
+                )
+                yield _delta_event(assistant_content)
+                yield _done_event(conversation_id, assistant_content, tool_calls_made)
+                return
+        
+        assistant_content_parts = []
         try:
-            # Final completion with tool results
-            final_response = await client.chat.completions.create(
+            # Final completion with tool results, streamed to the caller.
+            # Same tools as the first call so the request starts with the same
+            # tools + system prompt prefix and reuses its prompt-cache entry;
+            # tool_choice="none" keeps the model from calling them again
+            final_stream = await client.chat.completions.create(
                 model=agent_config["model"],
                 messages=openai_messages,
+                tools=mcp_tools,
+                tool_choice="none",
                 temperature=agent_config["temperature"],
-                max_tokens=agent_config["max_tokens"]
-            )
-        except AuthenticationError as e:
-            # Should not happen (first call would have failed), but handle gracefully
-            assistant_content = (
-                "I executed the requested task operation, but I'm unable to generate a natural language response "
-                "because the OpenAI API key is not properly configured. Your task operation was still completed successfully."
+                max_tokens=agent_config["max_tokens"],
+                user=user_id,
+                stream=True
             )
-            
-            # Store fallback message
-            try:
-                assistant_message = Message(
-                    conversation_id=conversation.id,
-                    user_id=user_id,
-                    role="assistant",
-                    content=assistant_content
-                )
-                session.add(assistant_message)
-                conversation.updated_at = datetime.utcnow()
-                session.add(conversation)
-                session.commit()
-            except Exception as db_error:
-                raise DatabaseError() from db_error
-            
-            return {
-                "conversation_id": conversation.id,
-                "response": assistant_content,
-                "tool_calls": tool_calls_made
-            }
+            async for chunk in final_stream:
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if content:
+                    assistant_content_parts.append(content)
+                    yield _delta_event(content)
         except RateLimitError as e:
             raise OpenAIAPIError(retry_after=60) from e
         except APIConnectionError as e:
@@ -259,32 +626,18 @@ async def process_chat_message(
         except APIError as e:
             raise OpenAIAPIError(retry_after=15) from e
         
-        assistant_content = final_response.choices[0].message.content
+        assistant_content = "".join(assistant_content_parts)
     else:
         # No tools called, use direct response
         assistant_content = message_response.content
+        if assistant_content:
+            cache_reply(cache_key, assistant_content)
+        yield _delta_event(assistant_content)
     
-    try:
-        # Step 8: Store assistant response in database
-        assistant_message = Message(
-            conversation_id=conversation.id,
-            user_id=user_id,
-            role="assistant",
-            content=assistant_content
-        )
-        session.add(assistant_message)
-        
-        # Update conversation timestamp
-        conversation.updated_at = datetime.utcnow()
-        session.add(conversation)
-        
-        session.commit()
-    except Exception as e:
-        raise DatabaseError() from e
+    # Step 8: Store assistant response in database (off the event loop)
+    conversation_id = await asyncio.to_thread(
+        _store_assistant_message, session, conversation_id, user_id, assistant_content, message
+    )
     
     # Step 9: Return response
-    return {
-        "conversation_id": conversation.id,
-        "response": assistant_content,
-        "tool_calls": tool_calls_made
-    }
+    yield _done_event(conversation_id, assistant_content, tool_calls_made)
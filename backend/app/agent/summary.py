@@ -0,0 +1,128 @@
+"""
+Conversation Summary Service - Rolling summary of long conversations.
+Keeps the newest messages verbatim and folds older ones into a short summary
+stored on the conversation, so long threads keep their context at a fraction
+of the prompt size.
+
+ARCHITECTURE NOTES:
+- Summaries are produced off the request path by a background task
+- One summarization per conversation at a time
+- The summary is stored on the Conversation row with the last message ID it covers
+"""
+import asyncio
+import logging
+from typing import List, Optional, Set, Tuple
+from openai import AsyncOpenAI
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from app.database import engine
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.agent.config import AGENT_MODEL, SUMMARY_KEEP_MESSAGES, SUMMARY_MAX_TOKENS, SUMMARY_PROMPT
+
+logger = logging.getLogger(__name__)
+
+# Conversations with a summarization in flight
+_summarizing: Set[int] = set()
+
+# Strong references to running summary tasks (asyncio only keeps weak ones)
+_summary_tasks: Set[asyncio.Task] = set()
+
+
+def schedule_summary(client: AsyncOpenAI, conversation_id: int) -> None:
+    """
+    Start a background summarization for a conversation, unless one is running.
+    
+    Args:
+        client: OpenAI client to summarize with
+        conversation_id: ID of conversation
+    """
+    if conversation_id in _summarizing:
+        return
+    
+    _summarizing.add(conversation_id)
+    task = asyncio.create_task(summarize_conversation(client, conversation_id))
+    _summary_tasks.add(task)
+    task.add_done_callback(_summary_tasks.discard)
+    task.add_done_callback(lambda _: _summarizing.discard(conversation_id))
+
+
+def _load_unsummarized(conversation_id: int) -> Optional[Tuple[Conversation, List[Tuple[int, str, str]]]]:
+    """
+    Load a conversation and its messages not yet covered by the summary.
+    
+    Returns:
+        (conversation, [(id, role, content), ...] oldest first), or None if
+        the conversation no longer exists
+    """
+    with Session(engine, expire_on_commit=False) as session:
+        conversation = session.get(Conversation, conversation_id)
+        if not conversation:
+            return None
+        
+        query = select(Message.id, Message.role, Message.content).where(
+            Message.conversation_id == conversation_id
+        )
+        if conversation.summary_up_to_msg_id is not None:
+            query = query.where(Message.id > conversation.summary_up_to_msg_id)
+        
+        return conversation, list(session.exec(query.order_by(Message.id.asc())).all())
+
+
+def _store_summary(conversation_id: int, summary: str, up_to_msg_id: int) -> None:
+    """Store a new summary and the last message ID it covers."""
+    with Session(engine) as session:
+        # updated_at is set to itself so onupdate does not bump it -
+        # a new summary is not conversation activity
+        session.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(
+                summary=summary,
+                summary_up_to_msg_id=up_to_msg_id,
+                updated_at=Conversation.updated_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+
+
+async def summarize_conversation(client: AsyncOpenAI, conversation_id: int) -> None:
+    """
+    Fold all but the newest SUMMARY_KEEP_MESSAGES unsummarized messages
+    into the conversation summary.
+    
+    Args:
+        client: OpenAI client to summarize with
+        conversation_id: ID of conversation
+    """
+    try:
+        loaded = await asyncio.to_thread(_load_unsummarized, conversation_id)
+        if loaded is None:
+            return
+        conversation, rows = loaded
+        
+        to_summarize = rows[:-SUMMARY_KEEP_MESSAGES]
+        if not to_summarize:
+            return
+        
+        transcript = "\n".join(f"{role}: {content}" for _, role, content in to_summarize)
+        if conversation.summary:
+            transcript = f"Previous summary: {conversation.summary}\n\n{transcript}"
+        
+        response = await client.chat.completions.create(
+            model=AGENT_MODEL,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": transcript}
+            ],
+            temperature=0,
+            max_tokens=SUMMARY_MAX_TOKENS,
+            user=conversation.user_id
+        )
+        summary = (response.choices[0].message.content or "").strip()
+        if summary:
+            await asyncio.to_thread(_store_summary, conversation_id, summary, to_summarize[-1][0])
+    except Exception as e:
+        logger.error(f"Error summarizing conversation {conversation_id}: {str(e)}", exc_info=True)
@@ -2,8 +2,8 @@
 Configuration management for the application.
 Loads settings from environment variables.
 """
+import os
 from pydantic_settings import BaseSettings
-from functools import lru_cache
 
 
 class Settings(BaseSettings):
@@ -12,9 +12,21 @@ class Settings(BaseSettings):
     # Database Configuration
     database_url: str
     
+    # Optional Neon read-replica connection string for read-only queries
+    # (empty: reads use the primary)
+    database_readonly_url: str = ""
+    
     # OpenAI Configuration (optional - graceful degradation if missing)
     openai_api_key: str = ""
     
+    # Database keepalive: seconds between pings of idle pooled connections
+    # (0 disables; note that pinging keeps a Neon compute from auto-suspending)
+    db_keepalive_seconds: int = 60
+    
+    # Serverless deployment (one short-lived process per request burst):
+    # no client-side connection pool, Neon's pgbouncer pools instead
+    serverless: bool = False
+    
     # Application Configuration
     env: str = "development"
     debug: bool = True
@@ -22,12 +34,26 @@ class Settings(BaseSettings):
     # Better Auth Configuration (optional)
     auth_secret: str = ""
     
+    @property
+    def openai_configured(self) -> bool:
+        """Whether an OpenAI API key is set (chat is disabled without one)."""
+        return bool(self.openai_api_key.strip())
+    
+    @property
+    def is_serverless(self) -> bool:
+        """Whether running serverless (SERVERLESS=true, or detected on Vercel / AWS Lambda)."""
+        return self.serverless or bool(os.getenv("VERCEL") or os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+    
     class Config:
-        env_file = ".env"
+        # Production reads the real environment only - no .env file parsing
+        env_file = None if os.getenv("ENV", "development").lower() == "production" else ".env"
         case_sensitive = False
 
 
-@lru_cache()
+# Loaded once at import
+SETTINGS = Settings()
+
+
 def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+    """Get the settings instance (loaded once at import)."""
+    return SETTINGS
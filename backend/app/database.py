@@ -2,40 +2,131 @@
 Database configuration and session management.
 Handles SQLModel engine creation, session factory, and dependency injection.
 """
+import asyncio
+import logging
+import sqlite3
 from sqlmodel import create_engine, Session, SQLModel
-from sqlalchemy.pool import QueuePool
-from functools import lru_cache
-from typing import Generator
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import NullPool, QueuePool
+from typing import Generator, Dict, Any
 
 from app.config import get_settings
 
 # Import all models to register them with SQLModel metadata
 # This ensures all tables are created by create_all()
-from app.models import Task, Conversation, Message
+from app.models import Task, Conversation, Message, ChatBatch
 
+logger = logging.getLogger(__name__)
 
+# Settings are loaded once in app.config; read the values used here once too
 settings = get_settings()
+SERVERLESS: bool = settings.is_serverless
+
+
+def neon_pooler_url(database_url: str) -> str:
+    """
+    Point a Neon URL at the endpoint's pgbouncer pooler (the -pooler hostname).
+    
+    Args:
+        database_url: SQLAlchemy database URL
+        
+    Returns:
+        URL with the pooler hostname (unchanged if not a direct Neon endpoint)
+    """
+    url = make_url(database_url)
+    host = url.host or ""
+    endpoint, _, domain = host.partition(".")
+    if not host.endswith(".neon.tech") or endpoint.endswith("-pooler"):
+        return database_url
+    return url.set(host=f"{endpoint}-pooler.{domain}").render_as_string(hide_password=False)
+
+
+# Serverless mode always connects through Neon's pooler, since it has no pool of its own
+DATABASE_URL: str = neon_pooler_url(settings.database_url) if SERVERLESS else settings.database_url
+DATABASE_READONLY_URL: str = (
+    neon_pooler_url(settings.database_readonly_url)
+    if SERVERLESS and settings.database_readonly_url
+    else settings.database_readonly_url
+)
+
+
+def pooler_connect_args(database_url: str) -> Dict[str, Any]:
+    """
+    Driver-specific connect_args for Neon's pgbouncer (transaction mode) pooler.
+    
+    Named server-side prepared statements don't survive pgbouncer handing the
+    next transaction to a different backend ("prepared statement does not
+    exist"), so drivers that prepare automatically must be told not to.
+    
+    Args:
+        database_url: SQLAlchemy database URL
+        
+    Returns:
+        Extra connect_args for the URL's driver (empty if none are needed)
+    """
+    drivername = make_url(database_url).drivername
+    if drivername == "postgresql+psycopg":
+        return {"prepare_threshold": None}  # psycopg 3 prepares after 5 executions by default
+    # psycopg2 (postgresql / postgresql+psycopg2) never uses server-side prepares
+    return {}
+
+
+def _pool_args(**queue_pool_args: Any) -> Dict[str, Any]:
+    """
+    Engine pool settings for the deployment type.
+    
+    Long-running servers keep a QueuePool of warm connections. Serverless
+    instances use NullPool: each warm instance holding its own pool would
+    multiply against concurrency and exhaust Neon's connection limit, so
+    every checkout opens a fresh (cheap) connection to Neon's pgbouncer
+    instead, trading per-request connect time for horizontal scalability.
+    
+    Args:
+        **queue_pool_args: QueuePool settings (ignored when serverless)
+        
+    Returns:
+        poolclass and pool keyword arguments for create_engine()
+    """
+    if SERVERLESS:
+        return {"poolclass": NullPool}
+    return {"poolclass": QueuePool, **queue_pool_args}
+
+
+# Connection Arguments shared by the primary and read-replica engines
+_NEON_CONNECT_ARGS: Dict[str, Any] = {
+    "sslmode": "require",       # SSL required by Neon
+    "connect_timeout": 10,      # Connection timeout (10s recommended)
+    "application_name": "todo-chatbot",  # For Neon connection monitoring
+    # TCP keepalives (libpq): detect sockets the Neon pooler dropped while idle
+    # or suspended, instead of failing the next query with "terminating connection"
+    "keepalives": 1,
+    "keepalives_idle": 60,      # First probe after 60s idle
+    "keepalives_interval": 10,  # Then every 10s
+    "keepalives_count": 3,      # Dead after 3 unanswered probes
+    "tcp_user_timeout": 30000,  # Fail writes to a dead peer after 30s (ms, Linux)
+}
 
 # Create engine with connection pooling optimized for Neon Serverless PostgreSQL
 # Neon Serverless requires careful connection management to avoid leaks and timeouts
 engine = create_engine(
-    settings.database_url,
+    DATABASE_URL,
     echo=settings.debug,             # Logs SQL queries in debug mode (no credentials exposed)
     hide_parameters=True,            # Hide parameter values in SQL logs (security)
-    poolclass=QueuePool,
     
     # Connection Pool Settings (Neon Serverless Optimized)
-    pool_size=5,                    # Small pool - Neon pooler handles scaling
-    max_overflow=5,                 # Limited overflow to prevent connection exhaustion
-    pool_pre_ping=True,             # Test connections before use (catch stale connections)
-    pool_recycle=300,               # Recycle after 5 min (Neon recommends < 5 min)
-    pool_timeout=30,                # Wait max 30s for connection from pool
+    **_pool_args(
+        pool_size=20,               # Warm connections for concurrent chat turns
+        max_overflow=40,            # Burst capacity (use Neon's pooled endpoint)
+        pool_pre_ping=False,        # No SELECT 1 per checkout - keep_pool_warm() pings idle connections instead
+        pool_recycle=240,           # Recycle after 4 min, ahead of Neon's 5 min idle cutoff
+        pool_timeout=30,            # Wait max 30s for connection from pool
+    ),
     
     # Connection Arguments (Neon Serverless Requirements)
     connect_args={
-        "sslmode": "require",       # SSL required by Neon
-        "connect_timeout": 10,      # Connection timeout (10s recommended)
-        "application_name": "todo-chatbot",  # For Neon connection monitoring
+        **_NEON_CONNECT_ARGS,
+        **pooler_connect_args(DATABASE_URL),
     },
     
     # Execution Options (Prevent Long-Lived Transactions)
@@ -45,6 +136,50 @@ engine = create_engine(
 )
 
 
+# Read-only engine for pure reads (list_tasks), bound to a Neon read replica
+# compute endpoint when DATABASE_READONLY_URL is set, so reads use their own
+# connection budget and don't queue behind writes on the primary's pool.
+# Replicas lag the primary slightly, so only use it where a just-committed
+# write does not need to be visible. Without a replica URL it is the primary engine.
+if DATABASE_READONLY_URL:
+    read_engine = create_engine(
+        DATABASE_READONLY_URL,
+        echo=settings.debug,
+        hide_parameters=True,
+        **_pool_args(
+            pool_size=5,
+            max_overflow=10,
+            pool_pre_ping=False,
+            pool_recycle=240,
+            pool_timeout=30,
+        ),
+        connect_args={
+            **_NEON_CONNECT_ARGS,
+            **pooler_connect_args(DATABASE_READONLY_URL),
+        },
+        # Reads need no transaction - skip the BEGIN/COMMIT round-trips
+        execution_options={
+            "isolation_level": "AUTOCOMMIT"
+        }
+    )
+else:
+    read_engine = engine
+
+
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    """
+    Enforce foreign keys (and ON DELETE CASCADE) on SQLite connections.
+    
+    SQLite ignores them unless enabled per connection; PostgreSQL always
+    enforces them. Applies to every engine, including the test engines.
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
 def init_db() -> None:
     """
     Initialize database by creating all tables.
@@ -54,14 +189,23 @@ def init_db() -> None:
     - tasks: User todo items
     - conversations: Chat session threads
     - messages: Conversation history
+    - chat_batches: OpenAI batches with replies still pending
     
-    Uses SQLModel.metadata.create_all() which:
+    Lists existing tables with a single catalog query, then runs
+    SQLModel.metadata.create_all() only for missing ones:
     - Creates tables if they don't exist
     - Does NOT drop existing tables
     - Idempotent - safe to call multiple times
     - Works with fresh Neon databases
+    - No per-table existence queries when the schema is already in place
+    
+    Schema changes to existing tables are applied by Alembic migrations.
     """
-    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        existing = set(inspect(connection).get_table_names())
+        missing = [table for table in SQLModel.metadata.sorted_tables if table.name not in existing]
+        if missing:
+            SQLModel.metadata.create_all(connection, tables=missing, checkfirst=False)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -91,3 +235,93 @@ def get_db() -> Generator[Session, None, None]:
         raise
     finally:
         session.close()  # Always close (prevent connection leaks)
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Dependency injection for read-only database sessions.
+    
+    Sessions are bound to the read-replica engine (the primary engine if
+    no replica is configured). Nothing is committed - callers must not write.
+    
+    Usage:
+        @app.get("/endpoint")
+        def endpoint(db: Session = Depends(get_read_db)):
+            return db.exec(select(Task)).all()
+    """
+    session = Session(read_engine, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        session.close()  # Always close (prevent connection leaks)
+
+
+class QueryCounter:
+    """
+    Count the statements a session executes (lazy loads included).
+    
+    Used to catch N+1 query patterns: a tool that loads related rows one
+    by one shows up as a count that grows with the result size.
+    
+    Usage:
+        with QueryCounter(session) as queries:
+            session.exec(select(Task)).all()
+        assert queries.count == 1
+    """
+    
+    def __init__(self, session: Session):
+        self.session = session
+        self.count = 0
+    
+    def _on_execute(self, orm_execute_state) -> None:
+        self.count += 1
+    
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.session, "do_orm_execute", self._on_execute)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.session, "do_orm_execute", self._on_execute)
+
+
+def ping_idle_connections() -> int:
+    """
+    Run SELECT 1 on each idle pooled connection.
+    
+    Keeps NAT/firewall mappings warm now that connections are not
+    pre-pinged on checkout. A connection that fails the ping is
+    invalidated by SQLAlchemy, so the next checkout reconnects.
+    
+    Returns:
+        Number of connections pinged successfully
+    """
+    connections = []
+    pinged = 0
+    try:
+        for _ in range(engine.pool.checkedin()):
+            connection = engine.connect()
+            connections.append(connection)
+            try:
+                connection.execute(text("SELECT 1"))
+                pinged += 1
+            except Exception as e:
+                logger.warning(f"Keepalive ping failed: {str(e).split('@')[0]}")
+    finally:
+        for connection in connections:
+            connection.close()
+    return pinged
+
+
+async def keep_pool_warm(interval_seconds: float) -> None:
+    """
+    Ping idle pooled connections forever (run as a background task).
+    
+    Args:
+        interval_seconds: Seconds between keepalive rounds
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(ping_idle_connections)
+        except Exception as e:
+            logger.warning(f"Keepalive round failed: {str(e).split('@')[0]}")
@@ -3,11 +3,14 @@ Shared dependencies for FastAPI routes and services.
 Provides reusable dependency injection functions.
 """
 from typing import Generator
+from fastapi import HTTPException, status
 from sqlmodel import Session
 from app.database import get_db
+from app.agent.service import openai_available
+from app.mcp.errors import OpenAINotConfiguredError
 
 # Re-export get_db for convenience
-__all__ = ["get_db_session"]
+__all__ = ["get_db_session", "require_openai"]
 
 
 def get_db_session() -> Generator[Session, None, None]:
@@ -31,3 +34,20 @@ def get_db_session() -> Generator[Session, None, None]:
         Session: SQLModel database session
     """
     yield from get_db()
+
+
+def require_openai() -> None:
+    """
+    Dependency that rejects chat requests while OpenAI is unavailable.
+    
+    Fails fast with 503 (no OpenAI call, no database writes) when the API
+    key is missing or was rejected by the startup probe.
+    
+    Raises:
+        HTTPException: 503 with a user-friendly message
+    """
+    if not openai_available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=OpenAINotConfiguredError().message
+        )
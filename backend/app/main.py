@@ -2,14 +2,22 @@
 FastAPI Main Application - AI-Powered Todo Chatbot Backend.
 Stateless backend with OpenAI Agents and MCP tools.
 """
+import asyncio
 import logging
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from sqlmodel import Session, select
 
-from app.database import init_db, engine
+from app.config import get_settings
+from app.database import init_db, engine, keep_pool_warm
 from app.routes import chat_router
+from app.agent.config import SYSTEM_PROMPT, count_prompt_tokens
+from app.agent.service import close_openai_client, verify_openai_key
+from app.agent.batch import resume_batch_polling
+from app.mcp.client import get_mcp_tools
 
 # Configure logging
 logging.basicConfig(
@@ -19,37 +27,107 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+def _check_database() -> None:
+    """Execute a simple query to test the database connection."""
+    with Session(engine) as session:
+        session.exec(select(1))
+
+
+def _sanitize_db_error(e: Exception) -> str:
+    """Strip credentials (everything from '@') from a database error message."""
+    return str(e).split('@')[0] if '@' in str(e) else str(e)
+
+
+async def _database_preflight(attempts: int = 5, base_delay: float = 1.0) -> None:
     """
-    Application lifespan manager.
-    Handles startup and shutdown events.
+    Check database connectivity, create missing tables, then resume
+    polling the pending chat batches.
+    
+    Runs as a background task after startup. Retries with exponential
+    backoff while a suspended Neon compute wakes up, and only logs -
+    requests that arrive first simply wait on their own connection.
+    
+    Args:
+        attempts: Connectivity checks before giving up
+        base_delay: Seconds before the first retry (doubled each time)
     """
-    # Startup: Check database connectivity
-    try:
-        logger.info("Checking database connectivity...")
-        with Session(engine) as session:
-            # Execute a simple query to test connection
-            session.exec(select(1))
-        logger.info("✓ Database connection successful")
-    except Exception as e:
-        # Sanitize error message to avoid exposing credentials
-        error_msg = str(e).split('@')[0] if '@' in str(e) else str(e)
-        logger.error(f"✗ Database connection failed: {error_msg}")
-        logger.error("Server will start but database operations may fail")
+    for attempt in range(attempts):
+        try:
+            await asyncio.to_thread(_check_database)
+            logger.info("✓ Database connection successful")
+            break
+        except Exception as e:
+            if attempt == attempts - 1:
+                logger.error(f"✗ Database connection failed: {_sanitize_db_error(e)}")
+                logger.error("Server is running but database operations may fail")
+                return
+            delay = base_delay * 2 ** attempt
+            logger.warning(f"Database not reachable yet, retrying in {delay:g}s: {_sanitize_db_error(e)}")
+            await asyncio.sleep(delay)
     
     # Initialize database tables
     try:
-        logger.info("Initializing database tables...")
-        init_db()
+        await asyncio.to_thread(init_db)
         logger.info("✓ Database tables initialized")
     except Exception as e:
-        # Sanitize error message to avoid exposing credentials
-        error_msg = str(e).split('@')[0] if '@' in str(e) else str(e)
-        logger.error(f"✗ Database initialization failed: {error_msg}")
+        logger.error(f"✗ Database initialization failed: {_sanitize_db_error(e)}")
+        return
+    
+    # Pick up the deferred chat batches of the previous process
+    try:
+        await resume_batch_polling()
+    except Exception as e:
+        logger.error(f"✗ Could not resume pending chat batches: {_sanitize_db_error(e)}")
+
+
+async def _openai_preflight() -> None:
+    """
+    Validate the OpenAI key once, instead of handling auth errors per request.
+    
+    Runs as a background task after startup so a slow or unreachable
+    OpenAI API doesn't hold up worker boot.
+    """
+    if await verify_openai_key():
+        logger.info("✓ OpenAI API key accepted")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan manager.
+    Handles startup and shutdown events.
+    """
+    # Startup: Check the database and create tables in the background, so a
+    # Neon cold start doesn't hold up worker boot
+    preflight_task = asyncio.create_task(_database_preflight())
+    
+    # Log system prompt size (paid on every OpenAI request)
+    prompt_tokens = count_prompt_tokens(SYSTEM_PROMPT)
+    logger.info(
+        f"System prompt: {len(SYSTEM_PROMPT.encode())} bytes"
+        + (f", {prompt_tokens} tokens" if prompt_tokens is not None else "")
+    )
+    
+    # Build the (cached) tool schemas before the first chat request
+    logger.info(f"Loaded {len(get_mcp_tools())} MCP tool schemas")
+    
+    # Validate the OpenAI key in the background
+    openai_preflight_task = asyncio.create_task(_openai_preflight())
+    
+    # Keep idle DB connections warm (replaces per-checkout pre-ping);
+    # serverless mode has no pool to keep warm
+    keepalive_task = None
+    keepalive_seconds = get_settings().db_keepalive_seconds
+    if keepalive_seconds > 0 and not get_settings().is_serverless:
+        keepalive_task = asyncio.create_task(keep_pool_warm(keepalive_seconds))
     
     yield
-    # Shutdown: Cleanup if needed
+    # Shutdown: Stop background DB tasks and close pooled OpenAI connections
+    preflight_task.cancel()
+    openai_preflight_task.cancel()
+    if keepalive_task is not None:
+        keepalive_task.cancel()
+    await close_openai_client()
     logger.info("Shutting down application...")
     pass
 
@@ -59,43 +137,58 @@ app = FastAPI(
     title="AI Todo Chatbot API",
     description="Conversational AI interface for task management using OpenAI Agents and MCP",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # orjson renders straight to bytes, much faster than stdlib json
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "https://frontend-nu-seven-63.vercel.app",
-        "https://frontend-phi-ruby-64.vercel.app",
-        "https://frontend-btqkijl9r-hamzas-projects-04482650.vercel.app",
-        "https://frontend-g5ty6z1t8-hamzas-projects-04482650.vercel.app",
-        "http://localhost:3000",
-        "http://localhost:3001"
-    ],
+    # Single precompiled pattern (full match) instead of a list scan per request:
+    # the Vercel frontend deployments and local dev servers
+    allow_origin_regex=(
+        r"https://frontend-(nu-seven-63|phi-ruby-64"
+        r"|btqkijl9r-hamzas-projects-04482650|g5ty6z1t8-hamzas-projects-04482650)\.vercel\.app"
+        r"|http://localhost:(3000|3001)"
+    ),
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "X-OpenAI-Domain-Key", "X-Domain-Key"],
+    max_age=86400,  # Browsers cache preflight responses for a day
 )
 
 # Register routes
 app.include_router(chat_router)
 
 
+# Static endpoint bodies, serialized once at import; proxies and monitors may
+# cache them briefly and revalidate with the constant ETag
+_ROOT_BODY = orjson.dumps({
+    "status": "online",
+    "service": "AI Todo Chatbot API",
+    "version": "1.0.0"
+})
+_HEALTH_BODY = orjson.dumps({"status": "healthy"})
+_STATIC_HEADERS = {"Cache-Control": "public, max-age=5", "ETag": '"v1"'}
+
+
+def _static_json(request: Request, body: bytes) -> Response:
+    """Return a pre-serialized JSON body, or 304 if the client already has it."""
+    if request.headers.get("if-none-match") == _STATIC_HEADERS["ETag"]:
+        return Response(status_code=304, headers=_STATIC_HEADERS)
+    return Response(content=body, media_type="application/json", headers=_STATIC_HEADERS)
+
+
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Root endpoint - health check."""
-    return {
-        "status": "online",
-        "service": "AI Todo Chatbot API",
-        "version": "1.0.0"
-    }
+    return _static_json(request, _ROOT_BODY)
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return _static_json(request, _HEALTH_BODY)
 
 
 if __name__ == "__main__":
@@ -6,14 +6,21 @@ from app.mcp.client import (
     get_mcp_tools,
     get_tool_function,
     get_mcp_tools_from_server,
-    execute_mcp_tool
+    execute_mcp_tool,
+    execute_mcp_tool_raw,
+    execute_mcp_tools_raw,
+    ToolResult
 )
-from app.mcp.mcp_server import mcp_server
+from app.mcp.mcp_server import mcp_server, TOOL_DISPATCH
 
 __all__ = [
     "get_mcp_tools",
     "get_tool_function",
     "get_mcp_tools_from_server",
     "execute_mcp_tool",
-    "mcp_server"
+    "execute_mcp_tool_raw",
+    "execute_mcp_tools_raw",
+    "ToolResult",
+    "mcp_server",
+    "TOOL_DISPATCH"
 ]
@@ -2,102 +2,134 @@
 MCP Client for OpenAI Agent Integration.
 Provides utilities to fetch MCP tools and execute them within the agent.
 """
-from typing import List, Dict, Any
-from app.mcp.mcp_server import mcp_server
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple, NamedTuple
+import orjson
+from app.mcp.mcp_server import dispatch_tool, dispatch_tool_calls, _TOOLS
 from sqlmodel import Session
 
 
+# OpenAI function calling format of the MCP tools, built once at import
+# (read-only, shared by every agent turn)
+_OPENAI_TOOLS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": tool.inputSchema
+        }
+    }
+    for tool in _TOOLS
+]
+
+
 async def get_mcp_tools_from_server() -> List[Dict[str, Any]]:
     """
     Get MCP tools from the official MCP server.
     Converts MCP Tool format to OpenAI function calling format.
     
+    The conversion is done once at import; every call returns the same
+    list, so callers must not mutate it.
+    
     Returns:
         List of tool definitions in OpenAI function calling format.
     """
-    from app.mcp.mcp_server import handle_list_tools
+    return _OPENAI_TOOLS
+
+
+class ToolResult(NamedTuple):
+    """MCP tool result, both as a dictionary and as compact JSON text."""
     
-    # Get tools from MCP server handler
-    tools = await handle_list_tools()
+    value: Dict[str, Any]
+    json_text: str
+
+
+_NO_RESULT = {"error": "No result returned from tool"}
+_NO_RESULT_TEXT = orjson.dumps(_NO_RESULT).decode()
+
+
+def _to_tool_result(result: Dict[str, Any]) -> ToolResult:
+    """Pair a tool result dictionary with its compact JSON text."""
+    if result is None:
+        return ToolResult(dict(_NO_RESULT), _NO_RESULT_TEXT)
     
-    # Convert to OpenAI format
-    openai_tools = []
-    for tool in tools:
-        openai_tool = {
-            "type": "function",
-            "function": {
-                "name": tool.name,
-                "description": tool.description,
-                "parameters": tool.inputSchema
-            }
-        }
-        openai_tools.append(openai_tool)
+    return ToolResult(result, orjson.dumps(result).decode())
+
+
+async def execute_mcp_tool_raw(
+    tool_name: str,
+    arguments: Dict[str, Any]
+) -> ToolResult:
+    """
+    Execute an MCP tool and keep its JSON text alongside the result.
+    
+    The JSON text can be sent back to the model as the tool message as-is,
+    instead of re-serializing the parsed dictionary. The tool opens its
+    own database session.
+    
+    Args:
+        tool_name: Name of the tool to execute
+        arguments: Tool arguments (must include user_id)
+        
+    Returns:
+        ToolResult with the parsed dictionary and its JSON text
+    """
+    # In-process fast path: run the tool directly instead of going through
+    # the MCP handler's TextContent, so the result is serialized once and
+    # never parsed back
+    return _to_tool_result(await dispatch_tool(tool_name, arguments))
+
+
+async def execute_mcp_tools_raw(
+    calls: List[Tuple[str, Dict[str, Any]]]
+) -> List[ToolResult]:
+    """
+    Execute the tool calls of one agent turn concurrently.
     
-    return openai_tools
+    Independent calls run in parallel; calls on the same task, and reads
+    and writes relative to each other, run in the order given (see
+    dispatch_tool_calls). Each call opens its own database session.
+    
+    Args:
+        calls: (tool name, arguments) pairs, arguments must include user_id
+        
+    Returns:
+        ToolResult per call, in the same order as calls
+    """
+    return [_to_tool_result(result) for result in await dispatch_tool_calls(calls)]
 
 
 async def execute_mcp_tool(
-    session: Session,
     tool_name: str,
     arguments: Dict[str, Any]
 ) -> Dict[str, Any]:
     """
     Execute an MCP tool through the official MCP server.
+    The tool opens its own database session.
     
     Args:
-        session: Database session (injected)
         tool_name: Name of the tool to execute
         arguments: Tool arguments (must include user_id)
         
     Returns:
         Tool execution result as dictionary
     """
-    import json
-    from app.mcp.mcp_server import handle_call_tool
-    
-    # Call the tool through MCP server handler
-    result_contents = await handle_call_tool(tool_name, arguments)
-    
-    # Extract result from TextContent
-    if result_contents:
-        result_text = result_contents[0].text
-        return json.loads(result_text)
-    
-    return {"error": "No result returned from tool"}
+    return (await execute_mcp_tool_raw(tool_name, arguments)).value
 
 
 # Legacy compatibility: Keep existing function names
-def get_mcp_tools() -> List[Dict[str, Any]]:
+@lru_cache(maxsize=1)
+def get_mcp_tools() -> Tuple[Dict[str, Any], ...]:
     """
-    Synchronous wrapper for get_mcp_tools_from_server.
+    Synchronous accessor for the MCP tools in OpenAI format.
     Used by legacy code that expects synchronous tools.
     
-    Note: This creates a new event loop to run the async function.
-    In async contexts, use get_mcp_tools_from_server() directly.
+    The tool schemas are static, so they are returned from the list built
+    at import as a shared tuple - no event loop or thread is involved.
+    Callers must not mutate the result.
     """
-    import asyncio
-    
-    # Allow nested event loops (needed when already in async context)
-    try:
-        import nest_asyncio
-        nest_asyncio.apply()
-    except ImportError:
-        pass  # nest_asyncio might not be installed, that's ok
-    except Exception:
-        pass  # nest_asyncio might fail to apply, that's ok
-    
-    # Try to get existing loop, or create new one
-    try:
-        loop = asyncio.get_running_loop()
-        # If we're in an async context, just create the task
-        # This won't work perfectly but allows compatibility
-        import concurrent.futures
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            future = pool.submit(asyncio.run, get_mcp_tools_from_server())
-            return future.result()
-    except RuntimeError:
-        # No loop running, create new one
-        return asyncio.run(get_mcp_tools_from_server())
+    return tuple(_OPENAI_TOOLS)
 
 
 def get_tool_function(tool_name: str):
@@ -114,7 +146,12 @@ def get_tool_function(tool_name: str):
         Async function that executes the tool
     """
     async def tool_wrapper(session: Session, **kwargs):
-        """Wrapper function that calls MCP tool."""
-        return await execute_mcp_tool(session, tool_name, kwargs)
+        """
+        Wrapper function that calls MCP tool.
+        
+        session is accepted for compatibility and ignored; the tool opens
+        its own database session.
+        """
+        return await execute_mcp_tool(tool_name, kwargs)
     
     return tool_wrapper
@@ -0,0 +1,68 @@
+"""
+MCP Tool Decorators - Validation and error handling shared by all tools.
+Applied once at import, so each tool body only does its own work.
+"""
+import functools
+from typing import Any, Callable, Dict
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlmodel import Session
+from app.mcp.errors import InvalidUserIdError, InvalidTaskIdError, DatabaseError
+
+
+ToolFunction = Callable[..., Dict[str, Any]]
+
+
+def with_db_errors(tool: ToolFunction) -> ToolFunction:
+    """
+    Report database outages as DatabaseError.
+    
+    Connection failures (lost/refused) and pool timeouts (no connection
+    available in time) become a user-friendly DatabaseError; every other
+    exception, including the tools' own MCP errors, propagates unchanged.
+    """
+    @functools.wraps(tool)
+    def wrapper(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+        try:
+            return tool(*args, **kwargs)
+        except (OperationalError, PoolTimeoutError) as e:
+            raise DatabaseError() from e
+    
+    return wrapper
+
+
+def require_user_id(tool: ToolFunction) -> ToolFunction:
+    """
+    Validate and strip user_id before the tool runs.
+    
+    The tool receives the stripped user_id, which is what gets stored
+    and queried.
+    
+    Raises:
+        InvalidUserIdError: If user_id is missing or blank
+    """
+    @functools.wraps(tool)
+    def wrapper(session: Session, user_id: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        user_id = user_id.strip() if user_id else ""
+        if not user_id:
+            raise InvalidUserIdError()
+        return tool(session, user_id, *args, **kwargs)
+    
+    return wrapper
+
+
+def require_task_id(tool: ToolFunction) -> ToolFunction:
+    """
+    Validate task_id (a positive integer) before the tool runs.
+    
+    Must be applied below require_user_id (task_id follows user_id).
+    
+    Raises:
+        InvalidTaskIdError: If task_id is missing, not an integer or not positive
+    """
+    @functools.wraps(tool)
+    def wrapper(session: Session, user_id: str, task_id: int, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        if not task_id or not isinstance(task_id, int) or task_id <= 0:
+            raise InvalidTaskIdError(task_id)
+        return tool(session, user_id, task_id, *args, **kwargs)
+    
+    return wrapper
@@ -19,6 +19,8 @@ class MCPError(Exception):
     suitable for direct display to end users.
     """
     
+    __slots__ = ("error_code", "message", "suggestion", "context", "_payload")
+    
     def __init__(self, error_code: str, message: str, suggestion: str, **kwargs):
         """
         Initialize structured error.
@@ -33,6 +35,13 @@ class MCPError(Exception):
         self.message = message
         self.suggestion = suggestion
         self.context = kwargs
+        # Response payload built once, with any additional context (already sanitized)
+        self._payload = {
+            "error_code": error_code,
+            "message": message,
+            "suggestion": suggestion,
+            **kwargs
+        }
         super().__init__(message)
     
     def to_dict(self) -> Dict[str, Any]:
@@ -40,16 +49,10 @@ class MCPError(Exception):
         Convert error to dictionary format for API responses.
         
         Returns sanitized error information safe for user display.
+        The dictionary is built once per error and shared, so callers
+        must not mutate it.
         """
-        result = {
-            "error_code": self.error_code,
-            "message": self.message,
-            "suggestion": self.suggestion
-        }
-        # Add any additional context (already sanitized)
-        if self.context:
-            result.update(self.context)
-        return result
+        return self._payload
 
 
 class TaskNotFoundError(MCPError):
@@ -59,6 +62,8 @@ class TaskNotFoundError(MCPError):
     User-friendly message: "I couldn't find that task."
     """
     
+    __slots__ = ()
+    
     def __init__(self, task_id: int, user_hint: Optional[str] = None):
         hint = f" {user_hint}" if user_hint else ""
         super().__init__(
@@ -76,6 +81,8 @@ class InvalidTaskIdError(MCPError):
     User-friendly message: "That doesn't look like a valid task number."
     """
     
+    __slots__ = ()
+    
     def __init__(self, task_id: Any):
         super().__init__(
             error_code="INVALID_TASK_ID",
@@ -92,6 +99,8 @@ class InvalidUserIdError(MCPError):
     User-friendly message: Technical issue, please reconnect.
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             error_code="INVALID_USER_ID",
@@ -107,6 +116,8 @@ class ValidationError(MCPError):
     User-friendly message: Explains what's wrong in plain language.
     """
     
+    __slots__ = ()
+    
     def __init__(self, field: str, reason: str):
         # Make reason more user-friendly
         friendly_reason = reason.replace("is required", "can't be empty")
@@ -128,6 +139,8 @@ class EmptyTaskListError(MCPError):
     Included here for consistency in messaging.
     """
     
+    __slots__ = ()
+    
     def __init__(self, filter_status: str = "all"):
         status_text = {
             "all": "any",
@@ -150,12 +163,14 @@ class MultipleTasksMatchError(MCPError):
     User-friendly message: Shows numbered list and asks which one.
     """
     
+    __slots__ = ()
+    
     def __init__(self, query: str, matches: List[Dict[str, Any]], action: str):
         # Build friendly numbered list
-        match_list = "\n".join([
-            f"  {i+1}. Task #{task['id']}: {task['title']}"
-            for i, task in enumerate(matches)
-        ])
+        match_list = "\n".join(
+            f"  {i}. Task #{task['id']}: {task['title']}"
+            for i, task in enumerate(matches, 1)
+        )
         
         super().__init__(
             error_code="MULTIPLE_MATCHES",
@@ -174,6 +189,8 @@ class DatabaseError(MCPError):
     User-friendly message: Temporary issue, try again soon.
     """
     
+    __slots__ = ()
+    
     def __init__(self, support_id: Optional[str] = None):
         super().__init__(
             error_code="DATABASE_UNAVAILABLE",
@@ -191,6 +208,8 @@ class OpenAIAPIError(MCPError):
     User-friendly message: AI temporarily unavailable, retry.
     """
     
+    __slots__ = ()
+    
     def __init__(self, retry_after: int = 5):
         super().__init__(
             error_code="AI_TEMPORARILY_UNAVAILABLE",
@@ -200,6 +219,34 @@ class OpenAIAPIError(MCPError):
         )
 
 
+class OpenAINotConfiguredError(MCPError):
+    """
+    OpenAI API key missing or rejected - chat is unavailable until it is fixed.
+    
+    User-friendly message: AI responses are switched off for now.
+    """
+    
+    __slots__ = ()
+    
+    def __init__(self):
+        super().__init__(
+            error_code="AI_NOT_CONFIGURED",
+            message=(
+                "I'm currently unable to process AI responses because the OpenAI API key is not properly configured. "
+                "Once the API key is configured, I'll be able to help you manage your tasks with natural language."
+            ),
+            suggestion="Ask the administrator to set a valid OPENAI_API_KEY."
+        )
+
+
+# Generic friendly message for unexpected errors (error_type is added per error)
+_UNEXPECTED_ERROR: Dict[str, str] = {
+    "error_code": "UNEXPECTED_ERROR",
+    "message": "Oops! Something unexpected happened. Don't worry, your tasks are safe!",
+    "suggestion": "Please try again. If this keeps happening, let us know so we can fix it."
+}
+
+
 def sanitize_error_for_user(error: Exception) -> Dict[str, Any]:
     """
     Sanitize any exception into a safe, user-friendly error response.
@@ -213,15 +260,14 @@ def sanitize_error_for_user(error: Exception) -> Dict[str, Any]:
     Returns:
         User-friendly error dictionary
     """
+    # One check covers every MCPError subclass - all of them carry a prebuilt payload
     if isinstance(error, MCPError):
         # Already user-friendly
         return error.to_dict()
     
     # Convert unexpected errors to generic friendly message
     return {
-        "error_code": "UNEXPECTED_ERROR",
-        "message": "Oops! Something unexpected happened. Don't worry, your tasks are safe!",
-        "suggestion": "Please try again. If this keeps happening, let us know so we can fix it.",
+        **_UNEXPECTED_ERROR,
         "error_type": type(error).__name__  # For debugging, but non-revealing
     }
 
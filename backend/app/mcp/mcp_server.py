@@ -3,39 +3,40 @@ Official MCP Server Implementation for Todo Task Management.
 Uses the MCP SDK to expose task management tools.
 
 This server:
-- Exposes 5 task management tools via MCP protocol
+- Exposes 7 task management tools via MCP protocol (5 single-task, 2 bulk)
 - Maintains stateless architecture (all state in database)
 - Requires user_id for all operations (security)
 - Uses SQLModel + Neon DB for persistence
 """
-from typing import Any, Dict
+import asyncio
+import logging
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
-from sqlmodel import Session, create_engine
-from contextlib import asynccontextmanager
-import json
+from sqlmodel import Session
+from contextlib import contextmanager
+import orjson
 
 from app.config import get_settings
+from app.database import engine, read_engine, QueryCounter
 from app.mcp.tools.add_task import add_task
 from app.mcp.tools.list_tasks import list_tasks
 from app.mcp.tools.complete_task import complete_task
 from app.mcp.tools.delete_task import delete_task
 from app.mcp.tools.update_task import update_task
+from app.mcp.tools.bulk import add_tasks_bulk, complete_tasks_bulk
 
 
-# Initialize settings and database engine
-settings = get_settings()
-engine = create_engine(settings.database_url)
-
+logger = logging.getLogger(__name__)
 
 # Create MCP server instance
 mcp_server = Server("todo-task-manager")
 
 
-@asynccontextmanager
-async def get_db_session():
-    """Context manager for database sessions."""
+@contextmanager
+def get_db_session():
+    """Context manager for database sessions (shares the app's tuned engine pool)."""
     session = Session(engine)
     try:
         yield session
@@ -47,190 +48,364 @@ async def get_db_session():
         session.close()
 
 
-# Register MCP Tools
-@mcp_server.list_tools()
-async def handle_list_tools() -> list[Tool]:
-    """
-    List all available MCP tools.
-    Returns tool definitions for the MCP protocol.
-    """
-    return [
-        Tool(
-            name="add_task",
-            description="IMMEDIATELY create a new task when the user wants to add, create, remember, or mentions needing to do something. Call this tool FIRST before responding. Do not ask for additional details - extract the title from the user's message and create the task immediately.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "The ID of the user creating the task"
-                    },
-                    "title": {
-                        "type": "string",
-                        "description": "The title or main description of the task (max 200 characters)"
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "Optional detailed description of the task (max 1000 characters)"
-                    }
+@contextmanager
+def get_read_db_session():
+    """Context manager for read-only sessions (read-replica engine, nothing committed)."""
+    session = Session(read_engine)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+# Tool definitions, built once at import - the schemas are static, so
+# list_tools returns the same read-only list instead of rebuilding it.
+# They lead every chat completion request and are part of the prompt-cache
+# prefix: never put per-request values (IDs, dates) in names or descriptions
+_TOOLS: list[Tool] = [
+    Tool(
+        name="add_task",
+        description="IMMEDIATELY create a new task when the user wants to add, create, remember, or mentions needing to do something. Call this tool FIRST before responding. Do not ask for additional details - extract the title from the user's message and create the task immediately.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "The ID of the user creating the task"
                 },
-                "required": ["user_id", "title"]
-            }
-        ),
-        Tool(
-            name="list_tasks",
-            description="List user's tasks with optional filters. Use this when the user wants to see their tasks, todos, or what they need to do.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "The ID of the user"
-                    },
-                    "status": {
-                        "type": "string",
-                        "enum": ["all", "pending", "completed"],
-                        "description": "Filter tasks by status. Default is 'all'."
-                    }
+                "title": {
+                    "type": "string",
+                    "description": "The title or main description of the task (max 200 characters)"
                 },
-                "required": ["user_id"]
-            }
-        ),
-        Tool(
-            name="complete_task",
-            description="Mark a task as completed. Use this when the user indicates they finished or completed a task.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "The ID of the user"
-                    },
-                    "task_id": {
-                        "type": "integer",
-                        "description": "The ID of the task to mark as complete"
-                    }
+                "description": {
+                    "type": "string",
+                    "description": "Optional detailed description of the task (max 1000 characters)"
+                }
+            },
+            "required": ["user_id", "title"]
+        }
+    ),
+    Tool(
+        name="list_tasks",
+        description="List user's tasks with optional filters. Use this when the user wants to see their tasks, todos, or what they need to do.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "The ID of the user"
                 },
-                "required": ["user_id", "task_id"]
-            }
-        ),
-        Tool(
-            name="delete_task",
-            description="Delete a task permanently. Use this when the user wants to remove or delete a task.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "The ID of the user"
-                    },
-                    "task_id": {
-                        "type": "integer",
-                        "description": "The ID of the task to delete"
-                    }
+                "status": {
+                    "type": "string",
+                    "enum": ["all", "pending", "completed"],
+                    "description": "Filter tasks by status. Default is 'all'."
+                }
+            },
+            "required": ["user_id"]
+        }
+    ),
+    Tool(
+        name="complete_task",
+        description="Mark a task as completed. Use this when the user indicates they finished or completed a task.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "The ID of the user"
                 },
-                "required": ["user_id", "task_id"]
-            }
-        ),
-        Tool(
-            name="update_task",
-            description="Update an existing task's title or description. Use this when the user wants to modify or edit a task.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "user_id": {
-                        "type": "string",
-                        "description": "The ID of the user"
-                    },
-                    "task_id": {
-                        "type": "integer",
-                        "description": "The ID of the task to update"
-                    },
-                    "title": {
-                        "type": "string",
-                        "description": "New title for the task (optional)"
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "New description for the task (optional)"
+                "task_id": {
+                    "type": "integer",
+                    "description": "The ID of the task to mark as complete"
+                }
+            },
+            "required": ["user_id", "task_id"]
+        }
+    ),
+    Tool(
+        name="delete_task",
+        description="Delete a task permanently. Use this when the user wants to remove or delete a task.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "The ID of the user"
+                },
+                "task_id": {
+                    "type": "integer",
+                    "description": "The ID of the task to delete"
+                }
+            },
+            "required": ["user_id", "task_id"]
+        }
+    ),
+    Tool(
+        name="update_task",
+        description="Update an existing task's title or description. Use this when the user wants to modify or edit a task.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "The ID of the user"
+                },
+                "task_id": {
+                    "type": "integer",
+                    "description": "The ID of the task to update"
+                },
+                "title": {
+                    "type": "string",
+                    "description": "New title for the task (optional)"
+                },
+                "description": {
+                    "type": "string",
+                    "description": "New description for the task (optional)"
+                }
+            },
+            "required": ["user_id", "task_id"]
+        }
+    ),
+    Tool(
+        name="add_tasks_bulk",
+        description="Create several tasks in one call. Use this instead of calling add_task repeatedly when the user asks to add two or more tasks at once.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "The ID of the user creating the tasks"
+                },
+                "tasks": {
+                    "type": "array",
+                    "description": "The tasks to create (max 50)",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "title": {
+                                "type": "string",
+                                "description": "The title of the task (max 200 characters)"
+                            },
+                            "description": {
+                                "type": "string",
+                                "description": "Optional detailed description of the task (max 1000 characters)"
+                            }
+                        },
+                        "required": ["title"]
                     }
+                }
+            },
+            "required": ["user_id", "tasks"]
+        }
+    ),
+    Tool(
+        name="complete_tasks_bulk",
+        description="Mark several tasks as completed in one call. Use this instead of calling complete_task repeatedly when the user finished two or more tasks.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "string",
+                    "description": "The ID of the user"
                 },
-                "required": ["user_id", "task_id"]
-            }
-        )
-    ]
+                "task_ids": {
+                    "type": "array",
+                    "items": {"type": "integer"},
+                    "description": "The IDs of the tasks to mark as complete (max 50)"
+                }
+            },
+            "required": ["user_id", "task_ids"]
+        }
+    )
+]
 
 
-@mcp_server.call_tool()
-async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> list[TextContent]:
+# Tool name -> implementation, for in-process dispatch
+# (schema properties map one-to-one onto the tool function's keyword parameters)
+TOOL_DISPATCH: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "add_task": add_task,
+    "list_tasks": list_tasks,
+    "complete_task": complete_task,
+    "delete_task": delete_task,
+    "update_task": update_task,
+    "add_tasks_bulk": add_tasks_bulk,
+    "complete_tasks_bulk": complete_tasks_bulk,
+}
+
+
+# Tool name -> argument names its schema declares. Anything else the model
+# adds ("priority", "confirm", ...) is dropped instead of failing the call
+TOOL_PARAMETERS: Dict[str, FrozenSet[str]] = {
+    tool.name: frozenset(tool.inputSchema["properties"]) for tool in _TOOLS
+}
+
+# Tools that only read - they run on the read-replica engine
+READ_ONLY_TOOLS = frozenset({"list_tasks"})
+
+# Read tools must load everything they return in one query (no N+1 - each
+# extra round-trip to Neon costs 5-20ms); checked in debug mode only
+MAX_READ_TOOL_QUERIES = 1
+_CHECK_READ_QUERIES = get_settings().debug
+
+
+# Register MCP Tools
+@mcp_server.list_tools()
+async def handle_list_tools() -> list[Tool]:
     """
-    Execute MCP tool calls.
-    
-    All tools are stateless and persist state via database.
-    Every tool requires user_id for security and data isolation.
+    List all available MCP tools.
+    Returns tool definitions for the MCP protocol (shared, do not mutate).
+    """
+    return _TOOLS
+
+
+def _run_tool(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a tool in its own database session (blocking).
     
     Args:
         name: Tool name (add_task, list_tasks, etc.)
         arguments: Tool arguments including user_id
         
     Returns:
-        List of TextContent with tool execution results
+        Tool result, or an error dictionary with error and error_type
     """
-    async with get_db_session() as session:
+    session_scope = get_read_db_session if name in READ_ONLY_TOOLS else get_db_session
+    with session_scope() as session:
         try:
             # Route to appropriate tool
-            if name == "add_task":
-                result = await add_task(
-                    session=session,
-                    user_id=arguments["user_id"],
-                    title=arguments["title"],
-                    description=arguments.get("description", "")
-                )
-            elif name == "list_tasks":
-                result = await list_tasks(
-                    session=session,
-                    user_id=arguments["user_id"],
-                    status=arguments.get("status", "all")
-                )
-            elif name == "complete_task":
-                result = await complete_task(
-                    session=session,
-                    user_id=arguments["user_id"],
-                    task_id=arguments["task_id"]
-                )
-            elif name == "delete_task":
-                result = await delete_task(
-                    session=session,
-                    user_id=arguments["user_id"],
-                    task_id=arguments["task_id"]
-                )
-            elif name == "update_task":
-                result = await update_task(
-                    session=session,
-                    user_id=arguments["user_id"],
-                    task_id=arguments["task_id"],
-                    title=arguments.get("title"),
-                    description=arguments.get("description")
-                )
-            else:
+            tool = TOOL_DISPATCH.get(name)
+            if tool is None:
                 raise ValueError(f"Unknown tool: {name}")
             
-            # Return result as TextContent
-            return [TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
+            parameters = TOOL_PARAMETERS[name]
+            arguments = {key: value for key, value in arguments.items() if key in parameters}
+            
+            if _CHECK_READ_QUERIES and name in READ_ONLY_TOOLS:
+                with QueryCounter(session) as queries:
+                    result = tool(session=session, **arguments)
+                if queries.count > MAX_READ_TOOL_QUERIES:
+                    logger.warning(
+                        f"{name} ran {queries.count} queries (max {MAX_READ_TOOL_QUERIES}) - "
+                        "eager-load related rows instead of loading them per item"
+                    )
+                return result
+            
+            return tool(session=session, **arguments)
             
         except Exception as e:
-            # Return error as TextContent
-            error_response = {
+            # Return error as a result dict
+            return {
                 "error": str(e),
                 "error_type": type(e).__name__
             }
-            return [TextContent(
-                type="text",
-                text=json.dumps(error_response, indent=2)
-            )]
+
+
+async def dispatch_tool(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a tool and return its result dictionary.
+    
+    In-process callers use this directly, skipping the TextContent
+    JSON round-trip of the MCP protocol handler.
+    
+    The tools are plain blocking functions (sync SQLModel sessions), so
+    they run on a worker thread: the event loop keeps serving other
+    requests, and concurrent tool calls of one turn overlap their
+    database round-trips.
+    
+    Args:
+        name: Tool name (add_task, list_tasks, etc.)
+        arguments: Tool arguments including user_id
+        
+    Returns:
+        Tool result, or an error dictionary with error and error_type
+    """
+    return await asyncio.to_thread(_run_tool, name, arguments)
+
+
+def _task_keys(arguments: Dict[str, Any]) -> FrozenSet[Any]:
+    """Task IDs a call touches (task_id and/or the items of task_ids)."""
+    task_ids = arguments.get("task_ids")
+    keys = list(task_ids) if isinstance(task_ids, list) else []
+    keys.append(arguments.get("task_id"))
+    return frozenset(key for key in keys if isinstance(key, (int, str)))
+
+
+def _must_wait(earlier: Tuple[str, Dict[str, Any]], later: Tuple[str, Dict[str, Any]]) -> bool:
+    """
+    Whether a later call of a turn has to wait for an earlier one.
+    
+    - A read and a write never overlap (in either order): "add milk, then
+      show my tasks" must list milk, "show my tasks, then delete #3" must
+      still list #3
+    - Two writes wait for each other when they share a task ID, including
+      the task_ids of bulk calls
+    """
+    earlier_reads = earlier[0] in READ_ONLY_TOOLS
+    later_reads = later[0] in READ_ONLY_TOOLS
+    if earlier_reads != later_reads:
+        return True
+    return not earlier_reads and bool(_task_keys(earlier[1]) & _task_keys(later[1]))
+
+
+async def dispatch_tool_calls(calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Run the tool calls of one agent turn concurrently, where order allows.
+    
+    Independent calls overlap their database round-trips, so the turn
+    waits for the slowest chain of calls instead of the sum of all of
+    them. A call waits for every earlier call it depends on (see
+    _must_wait), so the turn keeps the meaning of the order the model
+    issued the calls in.
+    
+    Args:
+        calls: (tool name, arguments) pairs in the order the model issued them
+        
+    Returns:
+        Tool results (or error dictionaries), in the same order as calls
+    """
+    results: List[Dict[str, Any]] = [{}] * len(calls)
+    finished = [asyncio.Event() for _ in calls]
+    
+    async def run_call(index: int) -> None:
+        try:
+            for earlier in range(index):
+                if _must_wait(calls[earlier], calls[index]):
+                    await finished[earlier].wait()
+            results[index] = await dispatch_tool(*calls[index])
+        finally:
+            finished[index].set()
+    
+    # dispatch_tool returns errors as results, so one failing call never
+    # cancels the others
+    async with asyncio.TaskGroup() as group:
+        for index in range(len(calls)):
+            group.create_task(run_call(index))
+    
+    return results
+
+
+@mcp_server.call_tool()
+async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> list[TextContent]:
+    """
+    Execute MCP tool calls.
+    
+    All tools are stateless and persist state via database.
+    Every tool requires user_id for security and data isolation.
+    
+    Args:
+        name: Tool name (add_task, list_tasks, etc.)
+        arguments: Tool arguments including user_id
+        
+    Returns:
+        List of TextContent with tool execution results
+    """
+    result = await dispatch_tool(name, arguments)
+    
+    # Return result as compact JSON TextContent
+    return [TextContent(
+        type="text",
+        text=orjson.dumps(result).decode()
+    )]
 
 
 async def run_mcp_server():
@@ -248,5 +423,4 @@ async def run_mcp_server():
 
 # Main entry point
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(run_mcp_server())
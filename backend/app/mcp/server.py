@@ -2,148 +2,225 @@
 MCP Server - Tool registration and management.
 Provides stateless MCP tools for task management operations.
 """
-from typing import List, Dict, Any, Callable
+from typing import List, Dict, Any, Callable, Final
 from app.mcp.tools.add_task import add_task
 from app.mcp.tools.list_tasks import list_tasks
 from app.mcp.tools.update_task import update_task
 from app.mcp.tools.delete_task import delete_task
 from app.mcp.tools.complete_task import complete_task
+from app.mcp.tools.bulk import add_tasks_bulk, complete_tasks_bulk
 
 
-def get_mcp_tools() -> List[Dict[str, Any]]:
-    """
-    Get all MCP tool definitions for OpenAI function calling.
-    
-    Returns:
-        List of tool definitions in OpenAI function calling format.
-    """
-    return [
-        {
-            "type": "function",
-            "function": {
-                "name": "add_task",
-                "description": "Create a new task for the user. Use this when the user wants to add, create, or remember something.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "user_id": {
-                            "type": "string",
-                            "description": "The ID of the user creating the task"
-                        },
-                        "title": {
-                            "type": "string",
-                            "description": "The title or main description of the task (max 200 characters)"
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "Optional detailed description of the task (max 1000 characters)",
-                            "default": ""
-                        }
+# Tool definitions in OpenAI function calling format, built once at import
+# (the schemas are static; shared by all callers, never mutate)
+_MCP_TOOLS: Final[List[Dict[str, Any]]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "add_task",
+            "description": "Create a new task for the user. Use this when the user wants to add, create, or remember something.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "user_id": {
+                        "type": "string",
+                        "description": "The ID of the user creating the task"
                     },
-                    "required": ["user_id", "title"]
-                }
+                    "title": {
+                        "type": "string",
+                        "description": "The title or main description of the task (max 200 characters)"
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "Optional detailed description of the task (max 1000 characters)",
+                        "default": ""
+                    }
+                },
+                "required": ["user_id", "title"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "list_tasks",
-                "description": "List user's tasks with optional filters. Use this when the user wants to see their tasks, todos, or what they need to do.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "user_id": {
-                            "type": "string",
-                            "description": "The ID of the user"
-                        },
-                        "status": {
-                            "type": "string",
-                            "enum": ["all", "pending", "completed"],
-                            "description": "Filter tasks by status. Default is 'all'.",
-                            "default": "all"
-                        }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "list_tasks",
+            "description": "List user's tasks with optional filters. Use this when the user wants to see their tasks, todos, or what they need to do.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "user_id": {
+                        "type": "string",
+                        "description": "The ID of the user"
                     },
-                    "required": ["user_id"]
-                }
+                    "status": {
+                        "type": "string",
+                        "enum": ["all", "pending", "completed"],
+                        "description": "Filter tasks by status. Default is 'all'.",
+                        "default": "all"
+                    }
+                },
+                "required": ["user_id"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "update_task",
-                "description": "Update an existing task's title or description. Use this when the user wants to modify or edit a task.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "user_id": {
-                            "type": "string",
-                            "description": "The ID of the user"
-                        },
-                        "task_id": {
-                            "type": "integer",
-                            "description": "The ID of the task to update"
-                        },
-                        "title": {
-                            "type": "string",
-                            "description": "New title for the task (optional)"
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "New description for the task (optional)"
-                        }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "update_task",
+            "description": "Update an existing task's title or description. Use this when the user wants to modify or edit a task.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "user_id": {
+                        "type": "string",
+                        "description": "The ID of the user"
+                    },
+                    "task_id": {
+                        "type": "integer",
+                        "description": "The ID of the task to update"
+                    },
+                    "title": {
+                        "type": "string",
+                        "description": "New title for the task (optional)"
                     },
-                    "required": ["user_id", "task_id"]
-                }
+                    "description": {
+                        "type": "string",
+                        "description": "New description for the task (optional)"
+                    }
+                },
+                "required": ["user_id", "task_id"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "complete_task",
-                "description": "Mark a task as completed or uncompleted. Use this when the user says they finished, completed, or done with a task.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "user_id": {
-                            "type": "string",
-                            "description": "The ID of the user"
-                        },
-                        "task_id": {
-                            "type": "integer",
-                            "description": "The ID of the task to complete"
-                        },
-                        "completed": {
-                            "type": "boolean",
-                            "description": "True to mark as completed, False to mark as pending",
-                            "default": True
-                        }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "complete_task",
+            "description": "Mark a task as completed or uncompleted. Use this when the user says they finished, completed, or done with a task.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "user_id": {
+                        "type": "string",
+                        "description": "The ID of the user"
+                    },
+                    "task_id": {
+                        "type": "integer",
+                        "description": "The ID of the task to complete"
+                    },
+                    "completed": {
+                        "type": "boolean",
+                        "description": "True to mark as completed, False to mark as pending",
+                        "default": True
+                    }
+                },
+                "required": ["user_id", "task_id"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "delete_task",
+            "description": "Delete a task permanently. Use this when the user wants to remove or delete a task.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "user_id": {
+                        "type": "string",
+                        "description": "The ID of the user"
                     },
-                    "required": ["user_id", "task_id"]
-                }
+                    "task_id": {
+                        "type": "integer",
+                        "description": "The ID of the task to delete"
+                    }
+                },
+                "required": ["user_id", "task_id"]
             }
-        },
-        {
-            "type": "function",
-            "function": {
-                "name": "delete_task",
-                "description": "Delete a task permanently. Use this when the user wants to remove or delete a task.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "user_id": {
-                            "type": "string",
-                            "description": "The ID of the user"
-                        },
-                        "task_id": {
-                            "type": "integer",
-                            "description": "The ID of the task to delete"
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "add_tasks_bulk",
+            "description": "Create several tasks in one call. Use this instead of calling add_task repeatedly when the user asks to add two or more tasks at once.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "user_id": {
+                        "type": "string",
+                        "description": "The ID of the user creating the tasks"
+                    },
+                    "tasks": {
+                        "type": "array",
+                        "description": "The tasks to create (max 50)",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "title": {
+                                    "type": "string",
+                                    "description": "The title of the task (max 200 characters)"
+                                },
+                                "description": {
+                                    "type": "string",
+                                    "description": "Optional detailed description of the task (max 1000 characters)"
+                                }
+                            },
+                            "required": ["title"]
                         }
+                    }
+                },
+                "required": ["user_id", "tasks"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "complete_tasks_bulk",
+            "description": "Mark several tasks as completed in one call. Use this instead of calling complete_task repeatedly when the user finished two or more tasks.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "user_id": {
+                        "type": "string",
+                        "description": "The ID of the user"
                     },
-                    "required": ["user_id", "task_id"]
-                }
+                    "task_ids": {
+                        "type": "array",
+                        "items": {"type": "integer"},
+                        "description": "The IDs of the tasks to mark as complete (max 50)"
+                    }
+                },
+                "required": ["user_id", "task_ids"]
             }
         }
-    ]
+    }
+]
+
+
+def get_mcp_tools() -> List[Dict[str, Any]]:
+    """
+    Get all MCP tool definitions for OpenAI function calling.
+    
+    Returns:
+        List of tool definitions in OpenAI function calling format
+        (shared, read-only).
+    """
+    return _MCP_TOOLS
+
+
+# Tool name -> implementation (read-only registry)
+_TOOL_REGISTRY: Final[Dict[str, Callable]] = {
+    "add_task": add_task,
+    "list_tasks": list_tasks,
+    "update_task": update_task,
+    "complete_task": complete_task,
+    "delete_task": delete_task,
+    "add_tasks_bulk": add_tasks_bulk,
+    "complete_tasks_bulk": complete_tasks_bulk
+}
+_lookup_tool = _TOOL_REGISTRY.get  # Bound once - dispatch is a single hash lookup
 
 
 def get_tool_function(tool_name: str) -> Callable:
@@ -154,13 +231,6 @@ def get_tool_function(tool_name: str) -> Callable:
         tool_name: Name of the tool function
         
     Returns:
-        The callable function
+        The callable function, or None for an unknown tool
     """
-    tools = {
-        "add_task": add_task,
-        "list_tasks": list_tasks,
-        "update_task": update_task,
-        "complete_task": complete_task,
-        "delete_task": delete_task
-    }
-    return tools.get(tool_name)
+    return _lookup_tool(tool_name)
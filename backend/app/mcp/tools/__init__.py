@@ -4,5 +4,9 @@ from app.mcp.tools.list_tasks import list_tasks
 from app.mcp.tools.update_task import update_task
 from app.mcp.tools.delete_task import delete_task
 from app.mcp.tools.complete_task import complete_task
+from app.mcp.tools.bulk import add_tasks_bulk, complete_tasks_bulk
 
-__all__ = ["add_task", "list_tasks", "update_task", "delete_task", "complete_task"]
+__all__ = [
+    "add_task", "list_tasks", "update_task", "delete_task", "complete_task",
+    "add_tasks_bulk", "complete_tasks_bulk"
+]
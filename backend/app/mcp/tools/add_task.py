@@ -2,14 +2,23 @@
 Add Task MCP Tool - Creates new tasks in the database.
 Stateless function that persists task immediately to database.
 """
-from datetime import datetime
 from typing import Dict, Any
+from sqlalchemy import insert
 from sqlmodel import Session
 from app.models.task import Task
-from app.mcp.errors import InvalidUserIdError, ValidationError, DatabaseError, create_success_response
+from app.mcp.decorators import with_db_errors, require_user_id
+from app.mcp.errors import ValidationError, create_success_response
 
 
-async def add_task(session: Session, user_id: str, title: str, description: str = "") -> Dict[str, Any]:
+# Built once; calls bind user_id, title and description (timestamps are set
+# by the database). Inputs are validated below, so no Task object is
+# constructed (or tracked) per call
+_ADD_STATEMENT = insert(Task).values(completed=False).returning(Task.id)
+
+
+@with_db_errors
+@require_user_id
+def add_task(session: Session, user_id: str, title: str, description: str = "") -> Dict[str, Any]:
     """
     Create a new task for the user.
     
@@ -28,39 +37,27 @@ async def add_task(session: Session, user_id: str, title: str, description: str
         DatabaseError: If database operation fails
     """
     # Validation
-    if not user_id or not user_id.strip():
-        raise InvalidUserIdError()
-    
-    if not title or not title.strip():
+    title = title.strip() if title else ""
+    if not title:
         raise ValidationError("title", "is required")
     
     if len(title) > 200:
         raise ValidationError("title", "must be 200 characters or less")
     
+    description = description.strip() if description else ""
     if len(description) > 1000:
         raise ValidationError("description", "must be 1000 characters or less")
     
-    # Create task in database
-    try:
-            task = Task(
-                user_id=user_id.strip(),
-                title=title.strip(),
-                description=description.strip() if description else "",
-                completed=False,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            session.add(task)
-            session.commit()
-            session.refresh(task)
-            
-            return create_success_response(
-                task_id=task.id,
-                status="created",
-                title=task.title
-            )
-    except Exception as e:
-        # Catch database errors
-        if "connection" in str(e).lower() or "timeout" in str(e).lower():
-            raise DatabaseError()
-        raise
+    # INSERT ... RETURNING id - no refresh SELECT needed
+    task_id = session.execute(_ADD_STATEMENT, {
+        "user_id": user_id,
+        "title": title,
+        "description": description
+    }).scalar_one()
+    session.commit()
+    
+    return create_success_response(
+        task_id=task_id,
+        status="created",
+        title=title
+    )
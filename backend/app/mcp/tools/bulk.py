@@ -0,0 +1,150 @@
+"""
+Bulk MCP Tools - Add or complete several tasks in one call.
+Stateless functions that apply all operations with one statement and one commit,
+instead of one round-trip and one commit per task.
+"""
+from typing import Dict, Any, List
+from sqlalchemy import bindparam, insert, update
+from sqlmodel import Session
+from app.models.task import Task
+from app.mcp.decorators import with_db_errors, require_user_id
+from app.mcp.errors import InvalidTaskIdError, ValidationError, create_success_response
+
+
+# Upper bound on operations per bulk call
+MAX_BULK_ITEMS = 50
+
+# Built once; executed with one parameter set per task (batched by the driver
+# where supported). IDs come back in parameter order
+_ADD_BULK_STATEMENT = insert(Task).returning(Task.id, sort_by_parameter_order=True)
+
+# Built once; calls only bind parameters. RETURNING reports which tasks matched
+_COMPLETE_BULK_STATEMENT = (
+    update(Task)
+    .where(Task.id.in_(bindparam("task_ids", expanding=True)), Task.user_id == bindparam("owner_id"))
+    .values(completed=bindparam("new_completed"))  # updated_at: database onupdate
+    .returning(Task.id, Task.title)
+)
+
+
+@with_db_errors
+@require_user_id
+def add_tasks_bulk(session: Session, user_id: str, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Create several tasks for the user at once.
+    
+    All tasks are inserted with one statement and committed together:
+    either every task is created or none is.
+    
+    Args:
+        session: Database session (injected dependency)
+        user_id: The ID of the user creating the tasks
+        tasks: Items with a title (required, max 200 chars) and an
+            optional description (max 1000 chars)
+    
+    Returns:
+        Dictionary with results (task_id, status and title per task) and count
+    
+    Raises:
+        InvalidUserIdError: If user_id is invalid
+        ValidationError: If the list or any title/description is invalid
+        DatabaseError: If database operation fails
+    """
+    # Validation
+    if not tasks or len(tasks) > MAX_BULK_ITEMS:
+        raise ValidationError("tasks", f"must contain between 1 and {MAX_BULK_ITEMS} items")
+    
+    items = []
+    for item in tasks:
+        title = item.get("title")
+        title = title.strip() if title else ""
+        if not title:
+            raise ValidationError("title", "is required")
+        
+        if len(title) > 200:
+            raise ValidationError("title", "must be 200 characters or less")
+        
+        description = item.get("description")
+        description = description.strip() if description else ""
+        if len(description) > 1000:
+            raise ValidationError("description", "must be 1000 characters or less")
+        
+        items.append((title, description))
+    
+    # Rows are inserted from plain dicts - no Task objects to construct or track
+    task_ids = session.execute(_ADD_BULK_STATEMENT, [
+        {
+            "user_id": user_id,
+            "title": title,
+            "description": description,
+            "completed": False
+        }
+        for title, description in items
+    ]).scalars().all()
+    session.commit()
+    
+    results = [
+        create_success_response(task_id=task_id, status="created", title=title)
+        for task_id, (title, _) in zip(task_ids, items)
+    ]
+    
+    return {
+        "results": results,
+        "count": len(results)
+    }
+
+
+@with_db_errors
+@require_user_id
+def complete_tasks_bulk(session: Session, user_id: str, task_ids: List[int], completed: bool = True) -> Dict[str, Any]:
+    """
+    Mark several tasks as completed or uncompleted at once.
+    
+    Uses a single UPDATE ... WHERE id IN (...) statement. IDs that don't
+    exist or belong to another user are reported in not_found; the
+    other tasks are still updated.
+    
+    Args:
+        session: Database session (injected dependency)
+        user_id: The ID of the user
+        task_ids: The IDs of the tasks to complete
+        completed: True to mark as completed, False to mark as pending
+    
+    Returns:
+        Dictionary with results (task_id, status and title per task),
+        count and not_found (IDs that matched no task)
+    
+    Raises:
+        InvalidUserIdError: If user_id is invalid
+        InvalidTaskIdError: If any task_id is invalid
+        ValidationError: If the list is empty or too long
+        DatabaseError: If database operation fails
+    """
+    # Validation
+    if not task_ids or len(task_ids) > MAX_BULK_ITEMS:
+        raise ValidationError("task_ids", f"must contain between 1 and {MAX_BULK_ITEMS} items")
+    
+    for task_id in task_ids:
+        if not task_id or not isinstance(task_id, int) or task_id <= 0:
+            raise InvalidTaskIdError(task_id)
+    
+    # Update tasks in database
+    rows = session.execute(_COMPLETE_BULK_STATEMENT, {
+        "task_ids": task_ids,
+        "owner_id": user_id,
+        "new_completed": completed
+    }).all()
+    session.commit()
+    
+    titles = {row.id: row.title for row in rows}
+    status = "completed" if completed else "pending"
+    
+    return {
+        "results": [
+            create_success_response(task_id=task_id, status=status, title=titles[task_id])
+            for task_id in dict.fromkeys(task_ids)
+            if task_id in titles
+        ],
+        "count": len(titles),
+        "not_found": [task_id for task_id in dict.fromkeys(task_ids) if task_id not in titles]
+    }
@@ -2,14 +2,27 @@
 Complete Task MCP Tool - Marks tasks as completed or pending.
 Stateless function that updates task completion status in database.
 """
-from datetime import datetime
 from typing import Dict, Any
-from sqlmodel import Session, select
+from sqlalchemy import bindparam, update
+from sqlmodel import Session
 from app.models.task import Task
-from app.mcp.errors import InvalidUserIdError, InvalidTaskIdError, TaskNotFoundError, DatabaseError, create_success_response
+from app.mcp.decorators import with_db_errors, require_user_id, require_task_id
+from app.mcp.errors import TaskNotFoundError, create_success_response
 
 
-async def complete_task(session: Session, user_id: str, task_id: int, completed: bool = True) -> Dict[str, Any]:
+# Built once; calls only bind parameters. RETURNING gives the title for the response
+_COMPLETE_STATEMENT = (
+    update(Task)
+    .where(Task.id == bindparam("task_id"), Task.user_id == bindparam("owner_id"))
+    .values(completed=bindparam("new_completed"))  # updated_at: database onupdate
+    .returning(Task.title)
+)
+
+
+@with_db_errors
+@require_user_id
+@require_task_id
+def complete_task(session: Session, user_id: str, task_id: int, completed: bool = True) -> Dict[str, Any]:
     """
     Mark a task as completed or uncompleted.
     
@@ -28,42 +41,21 @@ async def complete_task(session: Session, user_id: str, task_id: int, completed:
         TaskNotFoundError: If task not found
         DatabaseError: If database operation fails
     """
-    # Validation
-    if not user_id or not user_id.strip():
-        raise InvalidUserIdError()
+    # Update completion status in one statement (no SELECT first)
+    row = session.execute(_COMPLETE_STATEMENT, {
+        "task_id": task_id,
+        "owner_id": user_id,
+        "new_completed": completed
+    }).first()
+    
+    # No row: task doesn't exist or belongs to another user
+    if row is None:
+        raise TaskNotFoundError(task_id)
     
-    if not task_id or not isinstance(task_id, int) or task_id <= 0:
-        raise InvalidTaskIdError(task_id)
+    session.commit()
     
-    # Update task in database
-    try:
-            # Find task
-            statement = select(Task).where(
-                Task.id == task_id,
-                Task.user_id == user_id.strip()
-            )
-            task = session.exec(statement).first()
-            
-            if not task:
-                raise TaskNotFoundError(task_id)
-            
-            # Update completion status
-            task.completed = completed
-            task.updated_at = datetime.utcnow()
-            
-            session.add(task)
-            session.commit()
-            session.refresh(task)
-            
-            return create_success_response(
-                task_id=task.id,
-                status="completed" if completed else "pending",
-                title=task.title
-            )
-    except (TaskNotFoundError, InvalidTaskIdError, InvalidUserIdError):
-        raise
-    except Exception as e:
-        # Catch database errors
-        if "connection" in str(e).lower() or "timeout" in str(e).lower():
-            raise DatabaseError()
-        raise
+    return create_success_response(
+        task_id=task_id,
+        status="completed" if completed else "pending",
+        title=row.title
+    )
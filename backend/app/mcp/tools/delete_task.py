@@ -3,12 +3,25 @@ Delete Task MCP Tool - Permanently removes tasks from database.
 Stateless function that deletes task from database.
 """
 from typing import Dict, Any
-from sqlmodel import Session, select
+from sqlalchemy import bindparam, delete
+from sqlmodel import Session
 from app.models.task import Task
-from app.mcp.errors import InvalidUserIdError, InvalidTaskIdError, TaskNotFoundError, DatabaseError, create_success_response
+from app.mcp.decorators import with_db_errors, require_user_id, require_task_id
+from app.mcp.errors import TaskNotFoundError, create_success_response
 
 
-async def delete_task(session: Session, user_id: str, task_id: int) -> Dict[str, Any]:
+# Built once; calls only bind parameters. RETURNING gives the title for the response
+_DELETE_STATEMENT = (
+    delete(Task)
+    .where(Task.id == bindparam("task_id"), Task.user_id == bindparam("owner_id"))
+    .returning(Task.title)
+)
+
+
+@with_db_errors
+@require_user_id
+@require_task_id
+def delete_task(session: Session, user_id: str, task_id: int) -> Dict[str, Any]:
     """
     Delete a task permanently.
     
@@ -26,41 +39,20 @@ async def delete_task(session: Session, user_id: str, task_id: int) -> Dict[str,
         TaskNotFoundError: If task not found
         DatabaseError: If database operation fails
     """
-    # Validation
-    if not user_id or not user_id.strip():
-        raise InvalidUserIdError()
+    # Delete task in one statement (no SELECT first)
+    row = session.execute(_DELETE_STATEMENT, {
+        "task_id": task_id,
+        "owner_id": user_id
+    }).first()
+    
+    # No row: task doesn't exist or belongs to another user
+    if row is None:
+        raise TaskNotFoundError(task_id)
     
-    if not task_id or not isinstance(task_id, int) or task_id <= 0:
-        raise InvalidTaskIdError(task_id)
+    session.commit()
     
-    # Delete task from database
-    try:
-            # Find task
-            statement = select(Task).where(
-                Task.id == task_id,
-                Task.user_id == user_id.strip()
-            )
-            task = session.exec(statement).first()
-            
-            if not task:
-                raise TaskNotFoundError(task_id)
-            
-            # Store title for response
-            title = task.title
-            
-            # Delete task
-            session.delete(task)
-            session.commit()
-            
-            return create_success_response(
-                task_id=task_id,
-                status="deleted",
-                title=title
-            )
-    except (TaskNotFoundError, InvalidTaskIdError, InvalidUserIdError):
-        raise
-    except Exception as e:
-        # Catch database errors
-        if "connection" in str(e).lower() or "timeout" in str(e).lower():
-            raise DatabaseError()
-        raise
+    return create_success_response(
+        task_id=task_id,
+        status="deleted",
+        title=row.title
+    )
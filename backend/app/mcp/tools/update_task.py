@@ -3,13 +3,47 @@ Update Task MCP Tool - Updates existing task properties.
 Stateless function that modifies task in database.
 """
 from typing import Optional, Dict, Any
-from datetime import datetime
-from sqlmodel import Session, select
+from sqlalchemy import bindparam, update
+from sqlmodel import Session
 from app.models.task import Task
-from app.mcp.errors import InvalidUserIdError, InvalidTaskIdError, TaskNotFoundError, ValidationError, DatabaseError, create_success_response
+from app.mcp.decorators import with_db_errors, require_user_id, require_task_id
+from app.mcp.errors import TaskNotFoundError, ValidationError, create_success_response
 
 
-async def update_task(
+def _build_update_statement(set_title: bool, set_description: bool):
+    """Build the UPDATE for a combination of provided fields (values are bound parameters)."""
+    values = {}  # updated_at is bumped by the column's database onupdate
+    if set_title:
+        values["title"] = bindparam("new_title")
+    if set_description:
+        values["description"] = bindparam("new_description")
+    
+    # RETURNING gives the current title for the response
+    return (
+        update(Task)
+        .where(Task.id == bindparam("task_id"), Task.user_id == bindparam("owner_id"))
+        .values(**values)
+        .returning(Task.title)
+    )
+
+
+# One prebuilt statement per (title given, description given) combination,
+# paired with the (shared, immutable) updated_fields it reports
+_UPDATE_VARIANTS = {
+    (set_title, set_description): (
+        _build_update_statement(set_title, set_description),
+        ("title",) * set_title + ("description",) * set_description
+    )
+    for set_title in (True, False)
+    for set_description in (True, False)
+    if set_title or set_description
+}
+
+
+@with_db_errors
+@require_user_id
+@require_task_id
+def update_task(
     session: Session,
     user_id: str,
     task_id: int,
@@ -37,11 +71,10 @@ async def update_task(
         DatabaseError: If database operation fails
     """
     # Validation
-    if not user_id or not user_id.strip():
-        raise InvalidUserIdError()
-    
-    if not task_id or not isinstance(task_id, int) or task_id <= 0:
-        raise InvalidTaskIdError(task_id)
+    if title is not None:
+        title = title.strip()
+    if description is not None:
+        description = description.strip()
     
     if title and len(title) > 200:
         raise ValidationError("title", "must be 200 characters or less")
@@ -53,44 +86,27 @@ async def update_task(
     if title is None and description is None:
         raise ValidationError("update", "at least one of title or description must be provided")
     
-    # Update task in database
-    try:
-        # Find task
-        statement = select(Task).where(
-            Task.id == task_id,
-            Task.user_id == user_id.strip()
-        )
-        task = session.exec(statement).first()
-        
-        if not task:
-            raise TaskNotFoundError(task_id)
-        
-        # Update fields
-        updated_fields = []
-        if title is not None:
-            task.title = title.strip()
-            updated_fields.append("title")
-        
-        if description is not None:
-            task.description = description.strip()
-            updated_fields.append("description")
-        
-        task.updated_at = datetime.utcnow()
-        
-        session.add(task)
-        session.commit()
-        session.refresh(task)
-        
-        return create_success_response(
-            task_id=task.id,
-            status="updated",
-            title=task.title,
-            updated_fields=updated_fields
-        )
-    except (TaskNotFoundError, InvalidTaskIdError, InvalidUserIdError, ValidationError):
-        raise
-    except Exception as e:
-        # Catch database errors
-        if "connection" in str(e).lower() or "timeout" in str(e).lower():
-            raise DatabaseError()
-        raise
+    # Only the provided fields are changed
+    statement, updated_fields = _UPDATE_VARIANTS[(title is not None, description is not None)]
+    params = {"task_id": task_id, "owner_id": user_id}
+    if title is not None:
+        params["new_title"] = title
+    
+    if description is not None:
+        params["new_description"] = description
+    
+    # Update in one statement (no SELECT first)
+    row = session.execute(statement, params).first()
+    
+    # No row: task doesn't exist or belongs to another user
+    if row is None:
+        raise TaskNotFoundError(task_id)
+    
+    session.commit()
+    
+    return create_success_response(
+        task_id=task_id,
+        status="updated",
+        title=row.title,
+        updated_fields=updated_fields
+    )
@@ -2,5 +2,6 @@
 from app.models.task import Task
 from app.models.conversation import Conversation
 from app.models.message import Message
+from app.models.chat_batch import ChatBatch
 
-__all__ = ["Task", "Conversation", "Message"]
+__all__ = ["Task", "Conversation", "Message", "ChatBatch"]
@@ -0,0 +1,32 @@
+"""
+Chat Batch Model - SQLModel schema for pending OpenAI batches.
+Lets the replies of deferred chat messages survive a restart or deploy.
+"""
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import func
+from sqlmodel import Field, SQLModel
+
+
+class ChatBatch(SQLModel, table=True):
+    """
+    Chat batch model for OpenAI batches whose replies are not stored yet.
+    
+    A row is written once the batch has been created and deleted in the
+    same transaction that stores its replies (or when the batch fails),
+    so polling can be resumed for every remaining row at startup.
+    
+    Attributes:
+        batch_id: OpenAI batch ID (primary key)
+        user_id: Owner of the batched conversations
+        created_at: Timestamp of batch submission (set by the database)
+    """
+    __tablename__ = "chat_batches"
+    
+    batch_id: str = Field(primary_key=True)
+    user_id: str = Field(nullable=False)
+    created_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_column_kwargs={"server_default": func.now()}
+    )
@@ -4,6 +4,7 @@ Represents a conversation thread between user and AI assistant.
 """
 from typing import Optional
 from datetime import datetime
+from sqlalchemy import func
 from sqlmodel import Field, SQLModel
 
 
@@ -14,15 +15,27 @@ class Conversation(SQLModel, table=True):
     Attributes:
         id: Auto-incrementing primary key (conversation_id in API)
         user_id: Owner of the conversation (indexed for fast lookup)
-        created_at: Timestamp of conversation start
-        updated_at: Timestamp of last message
+        created_at: Timestamp of conversation start (set by the database)
+        updated_at: Timestamp of last message (set by the database on update)
+        summary: Rolling summary of messages older than the verbatim context
+        summary_up_to_msg_id: ID of the last message covered by summary
     """
     __tablename__ = "conversations"
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: str = Field(index=True, nullable=False)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_column_kwargs={"server_default": func.now()}
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()}
+    )
+    summary: Optional[str] = Field(default=None)
+    summary_up_to_msg_id: Optional[int] = Field(default=None)
     
     class Config:
         """SQLModel configuration."""
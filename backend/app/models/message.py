@@ -4,7 +4,8 @@ Stores individual messages (user and assistant) within conversations.
 """
 from typing import Optional
 from datetime import datetime
-from sqlmodel import Field, SQLModel
+from sqlalchemy import ForeignKey, func
+from sqlmodel import Field, SQLModel, Index
 
 
 class Message(SQLModel, table=True):
@@ -13,20 +14,39 @@ class Message(SQLModel, table=True):
     
     Attributes:
         id: Auto-incrementing primary key
-        conversation_id: Foreign key to conversations table (indexed)
+        conversation_id: Foreign key to conversations table (indexed); messages
+            are deleted by the database along with their conversation
         user_id: Owner of the message (indexed for security)
         role: Message role - either "user" or "assistant"
         content: Message text content
-        created_at: Timestamp of message creation (indexed for chronological ordering)
+        created_at: Timestamp of message creation, set by the database (indexed
+            for chronological ordering; messages of one transaction share it,
+            so id breaks ties)
+    
+    Indexes:
+        ix_messages_conversation_id_created_at: Serves the context window query
+            (WHERE conversation_id ORDER BY created_at DESC LIMIT N) as an
+            index range scan; also covers lookups by conversation_id alone
     """
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_conversation_id_created_at", "conversation_id", "created_at"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    conversation_id: int = Field(foreign_key="conversations.id", index=True)
+    conversation_id: int = Field(
+        nullable=False,
+        sa_column_args=[ForeignKey("conversations.id", ondelete="CASCADE")]
+    )
     user_id: str = Field(index=True, nullable=False)
     role: str = Field(nullable=False)  # "user" or "assistant"
     content: str = Field(nullable=False)
-    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    created_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        index=True,
+        sa_column_kwargs={"server_default": func.now()}
+    )
     
     class Config:
         """SQLModel configuration."""
@@ -4,7 +4,8 @@ Represents user tasks with title, description, completion status, and timestamps
 """
 from typing import Optional
 from datetime import datetime
-from sqlmodel import Field, SQLModel
+from sqlalchemy import func, text
+from sqlmodel import Field, SQLModel, Index
 
 
 class Task(SQLModel, table=True):
@@ -13,22 +14,38 @@ class Task(SQLModel, table=True):
     
     Attributes:
         id: Auto-incrementing primary key
-        user_id: Owner of the task (indexed for fast lookup)
+        user_id: Owner of the task
         title: Task title (required, max 200 chars)
         description: Optional task description (max 1000 chars)
-        completed: Completion status (default False, indexed)
-        created_at: Timestamp of creation (auto-populated)
-        updated_at: Timestamp of last update (auto-populated)
+        completed: Completion status (default False)
+        created_at: Timestamp of creation (set by the database)
+        updated_at: Timestamp of last update (set by the database on update)
+    
+    Indexes:
+        ix_tasks_user_id_completed_created_at: Serves list_tasks (WHERE user_id
+            [AND completed] ORDER BY completed, created_at DESC) as an index
+            range scan with no sort step; also covers lookups by user_id alone
     """
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_user_id_completed_created_at", "user_id", "completed", text("created_at DESC")),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: str = Field(index=True, nullable=False)
+    user_id: str = Field(nullable=False)
     title: str = Field(max_length=200, nullable=False)
     description: Optional[str] = Field(default="", max_length=1000)
-    completed: bool = Field(default=False, index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    completed: bool = Field(default=False)
+    created_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_column_kwargs={"server_default": func.now()}
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()}
+    )
     
     class Config:
         """SQLModel configuration."""
@@ -1,67 +1,214 @@
 """
 Chat API Route - Single endpoint for conversational task management.
 Stateless endpoint that processes messages through OpenAI Agent.
+
+Routes that only touch the database are plain `def`: FastAPI runs them in
+its threadpool, so their blocking queries never stall the event loop.
 """
+import base64
+import binascii
 import logging
-from fastapi import APIRouter, HTTPException, status, Depends
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import String, bindparam, cast, delete, func, tuple_
 from sqlmodel import Session, select
-from typing import List
+from typing import Annotated, List, Dict, Any, AsyncIterator, Optional, Tuple
 from datetime import datetime
 from app.schemas.chat import ChatRequest, ChatResponse
-from app.agent import process_chat_message
-from app.dependencies import get_db_session
+from app.agent import process_chat_message, stream_chat_message, process_chat_message_batch, BATCH_ACK_RESPONSE
+from app.database import engine
+from app.dependencies import get_db_session, require_openai
 from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.task import Task
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["chat"])
 
+# Conversation previews show the first user message, cut to this many characters
+PREVIEW_LENGTH = 50
+
+# Conversations per page of the conversation list
+CONVERSATIONS_PAGE_SIZE = 20
+CONVERSATIONS_MAX_PAGE_SIZE = 100
+
+
+# Cursors carry updated_at as the database's own text for the stored value
+# and compare against it as a plain string, so the keyset condition works
+# at the stored precision (SQLite keeps timestamps as text, in whatever
+# format they were written; PostgreSQL casts the string back to a timestamp)
+_CURSOR_UPDATED_AT = cast(Conversation.updated_at, String)
+
+
+def _encode_cursor(updated_at: str, conversation_id: int) -> str:
+    """Opaque cursor for the page after the given (last listed) conversation."""
+    return base64.urlsafe_b64encode(orjson.dumps([updated_at, conversation_id])).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor from _encode_cursor() into (updated_at text, conversation_id).
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        updated_at, conversation_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        if not isinstance(updated_at, str):
+            raise TypeError("updated_at must be a string")
+        return updated_at, int(conversation_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _deleted_count(model, name: str):
+    """Row count of a data-modifying CTE deleting the user's rows from model."""
+    deleted = (
+        delete(model)
+        .where(model.user_id == bindparam("owner_id"))
+        .returning(model.id)
+        .cte(name)
+    )
+    return select(func.count()).select_from(deleted).scalar_subquery()
+
+
+# Conversation lists are private and must be revalidated on every use
+_CONVERSATIONS_CACHE_CONTROL = "private, no-cache"
+
+# Fingerprint of a user's conversation list: every change to it (new
+# conversation, new message, deletion) changes the count, the highest id or
+# the latest updated_at. Answered from the user_id index, without the
+# preview subqueries
+_CONVERSATIONS_VERSION_STATEMENT = select(
+    func.count(Conversation.id),
+    func.max(Conversation.id),
+    func.max(Conversation.updated_at)
+).where(Conversation.user_id == bindparam("owner_id"))
+
+
+def _conversations_etag(db: Session, user_id: str) -> str:
+    """ETag for the user's conversation list (see _CONVERSATIONS_VERSION_STATEMENT)."""
+    count, last_id, last_updated = db.execute(
+        _CONVERSATIONS_VERSION_STATEMENT, {"owner_id": user_id}
+    ).one()
+    if not count:
+        return '"0"'
+    return f'"{count}-{last_id}-{last_updated.isoformat()}"'
+
+
+# PostgreSQL: the whole reset as one statement (one round-trip) -
+# WITH deleted_messages AS (DELETE ... RETURNING id), ... SELECT the three counts.
+# Foreign keys are checked at the end of the statement, so the order is free
+_RESET_STATEMENT = select(
+    _deleted_count(Message, "deleted_messages").label("messages_deleted"),
+    _deleted_count(Conversation, "deleted_conversations").label("conversations_deleted"),
+    _deleted_count(Task, "deleted_tasks").label("tasks_deleted")
+)
+
 
 @router.get("/{user_id}/conversations")
-async def get_conversations(user_id: str, db: Session = Depends(get_db_session)):
+def get_conversations(
+    user_id: str,
+    request: Request,
+    limit: Annotated[int, Query(ge=1, le=CONVERSATIONS_MAX_PAGE_SIZE)] = CONVERSATIONS_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db_session)
+):
     """
-    Get all conversations for a user, sorted by most recent.
+    Get a page of a user's conversations, sorted by most recent.
+    
+    Pages use keyset pagination on (updated_at, id): pass the previous
+    page's next_cursor to get the following page, so each page costs
+    the same however far back it is.
+    
+    Responses carry an ETag; a request whose If-None-Match matches the
+    current list gets 304 Not Modified, checked with one aggregate query
+    instead of building the list.
     
     Args:
         user_id: The ID of the user
+        request: Incoming request (for If-None-Match)
+        limit: Maximum number of conversations to return
+        cursor: next_cursor of the previous page (None for the first page)
         db: Database session (injected dependency)
         
     Returns:
-        List of conversations with id, created_at, updated_at, and preview
+        Conversations with id, created_at, updated_at, and preview, and
+        next_cursor (None on the last page)
     """
     try:
-        from app.models.message import Message
+        after = _decode_cursor(cursor) if cursor else None
+        
+        etag = _conversations_etag(db, user_id)
+        headers = {"ETag": etag, "Cache-Control": _CONVERSATIONS_CACHE_CONTROL}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
         
-        statement = select(Conversation).where(
+        # First user message of each conversation, as a correlated subquery
+        # (one query for all previews instead of one per conversation).
+        # Only one character past the preview length is fetched - enough to
+        # know whether to add "..."
+        first_message = (
+            select(func.substr(Message.content, 1, PREVIEW_LENGTH + 1))
+            .where(Message.conversation_id == Conversation.id, Message.role == "user")
+            .order_by(Message.created_at.asc(), Message.id.asc())
+            .limit(1)
+            .correlate(Conversation)
+            .scalar_subquery()
+        )
+        statement = select(
+            Conversation.id,
+            Conversation.created_at,
+            Conversation.updated_at,
+            first_message.label("preview"),
+            _CURSOR_UPDATED_AT.label("cursor_updated_at")
+        ).where(
             Conversation.user_id == user_id
-        ).order_by(Conversation.updated_at.desc())
+        ).order_by(
+            Conversation.updated_at.desc(), Conversation.id.desc()
+        ).limit(limit + 1)  # One extra row tells whether there is a next page
+        if after:
+            after_updated_at, after_id = after
+            statement = statement.where(tuple_(Conversation.updated_at, Conversation.id) < tuple_(
+                bindparam("after_updated_at", after_updated_at, type_=String),
+                bindparam("after_id", after_id)
+            ))
         
-        conversations = db.exec(statement).all()
+        rows = db.exec(statement).all()
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = _encode_cursor(last.cursor_updated_at, last.id)
         
+        # Plain row tuples, unpacked positionally - no ORM objects or
+        # identity map entries are created for the listing
         result = []
-        for conv in conversations:
-            # Get first user message for preview
-            message_statement = select(Message).where(
-                Message.conversation_id == conv.id,
-                Message.role == "user"
-            ).order_by(Message.created_at.asc()).limit(1)
-            
-            first_message = db.exec(message_statement).first()
-            preview = first_message.content if first_message else "New conversation"
+        for conversation_id, created_at, updated_at, preview, _ in rows[:limit]:
+            if preview is None:
+                preview = "New conversation"
             
             # Truncate preview if too long
-            if len(preview) > 50:
-                preview = preview[:50] + "..."
+            if len(preview) > PREVIEW_LENGTH:
+                preview = preview[:PREVIEW_LENGTH] + "..."
             
             result.append({
-                "id": conv.id,
-                "created_at": conv.created_at.isoformat(),
-                "updated_at": conv.updated_at.isoformat(),
+                "id": conversation_id,
+                "created_at": created_at,
+                "updated_at": updated_at,
                 "preview": preview
             })
         
-        return {"conversations": result}
+        # Returned as a response so FastAPI skips jsonable_encoder over the
+        # list; orjson writes the datetimes as ISO 8601 itself
+        return ORJSONResponse({"conversations": result, "next_cursor": next_cursor}, headers=headers)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching conversations: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -71,7 +218,7 @@ async def get_conversations(user_id: str, db: Session = Depends(get_db_session))
 
 
 @router.delete("/{user_id}/conversations/{conversation_id}")
-async def delete_conversation(user_id: str, conversation_id: int, db: Session = Depends(get_db_session)):
+def delete_conversation(user_id: str, conversation_id: int, db: Session = Depends(get_db_session)):
     """
     Delete a specific conversation and all its messages.
     
@@ -84,24 +231,19 @@ async def delete_conversation(user_id: str, conversation_id: int, db: Session =
         Success message
     """
     try:
-        from app.models.message import Message
-        
-        # Get conversation
-        conversation = db.get(Conversation, conversation_id)
-        if not conversation or conversation.user_id != user_id:
+        # Bulk DELETE - nothing is loaded into the session.
+        # The database deletes the messages (ON DELETE CASCADE)
+        result = db.execute(
+            delete(Conversation)
+            .where(Conversation.id == conversation_id, Conversation.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Conversation not found"
             )
-        
-        # Delete all messages in conversation
-        message_statement = select(Message).where(Message.conversation_id == conversation_id)
-        messages = db.exec(message_statement).all()
-        for message in messages:
-            db.delete(message)
-        
-        # Delete conversation
-        db.delete(conversation)
         db.commit()
         
         return {"message": "Conversation deleted successfully"}
@@ -117,7 +259,7 @@ async def delete_conversation(user_id: str, conversation_id: int, db: Session =
 
 
 @router.delete("/{user_id}/conversations")
-async def delete_all_conversations(user_id: str, db: Session = Depends(get_db_session)):
+def delete_all_conversations(user_id: str, db: Session = Depends(get_db_session)):
     """
     Delete all conversations for a user.
     
@@ -129,23 +271,13 @@ async def delete_all_conversations(user_id: str, db: Session = Depends(get_db_se
         Success message with count
     """
     try:
-        from app.models.message import Message
-        
-        # Get all user conversations
-        conv_statement = select(Conversation).where(Conversation.user_id == user_id)
-        conversations = db.exec(conv_statement).all()
-        
-        deleted_count = 0
-        for conversation in conversations:
-            # Delete all messages in conversation
-            message_statement = select(Message).where(Message.conversation_id == conversation.id)
-            messages = db.exec(message_statement).all()
-            for message in messages:
-                db.delete(message)
-            
-            # Delete conversation
-            db.delete(conversation)
-            deleted_count += 1
+        # One bulk DELETE; the database deletes the messages (ON DELETE CASCADE)
+        result = db.execute(
+            delete(Conversation)
+            .where(Conversation.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_count = result.rowcount
         
         db.commit()
         
@@ -163,7 +295,7 @@ async def delete_all_conversations(user_id: str, db: Session = Depends(get_db_se
 
 
 @router.delete("/{user_id}/reset")
-async def reset_all_data(user_id: str, db: Session = Depends(get_db_session)):
+def reset_all_data(user_id: str, db: Session = Depends(get_db_session)):
     """
     RESET ENDPOINT: Delete ALL user data (conversations, messages, tasks).
     This resets the application to a completely fresh state.
@@ -176,34 +308,34 @@ async def reset_all_data(user_id: str, db: Session = Depends(get_db_session)):
         Success message with deletion counts
     """
     try:
-        from app.models.message import Message
-        from app.models.task import Task
-        
-        # Count for response
-        conversations_deleted = 0
-        messages_deleted = 0
-        tasks_deleted = 0
-        
-        # 1. Delete all messages (must be first due to foreign key)
-        message_statement = select(Message).where(Message.user_id == user_id)
-        messages = db.exec(message_statement).all()
-        for message in messages:
-            db.delete(message)
-            messages_deleted += 1
-        
-        # 2. Delete all conversations
-        conv_statement = select(Conversation).where(Conversation.user_id == user_id)
-        conversations = db.exec(conv_statement).all()
-        for conversation in conversations:
-            db.delete(conversation)
-            conversations_deleted += 1
-        
-        # 3. Delete all tasks
-        task_statement = select(Task).where(Task.user_id == user_id)
-        tasks = db.exec(task_statement).all()
-        for task in tasks:
-            db.delete(task)
-            tasks_deleted += 1
+        if db.get_bind().dialect.name == "postgresql":
+            # Single statement with data-modifying CTEs (see _RESET_STATEMENT)
+            messages_deleted, conversations_deleted, tasks_deleted = db.execute(
+                _RESET_STATEMENT, {"owner_id": user_id}
+            ).one()
+        else:
+            # Other databases (SQLite in tests) have no DELETE in CTEs:
+            # one bulk DELETE per table, in the same transaction
+            # 1. Delete all messages (must be first due to foreign key)
+            messages_deleted = db.execute(
+                delete(Message)
+                .where(Message.user_id == user_id)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            
+            # 2. Delete all conversations
+            conversations_deleted = db.execute(
+                delete(Conversation)
+                .where(Conversation.user_id == user_id)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            
+            # 3. Delete all tasks
+            tasks_deleted = db.execute(
+                delete(Task)
+                .where(Task.user_id == user_id)
+                .execution_options(synchronize_session=False)
+            ).rowcount
         
         # Commit all deletions
         db.commit()
@@ -226,7 +358,7 @@ async def reset_all_data(user_id: str, db: Session = Depends(get_db_session)):
         )
 
 
-@router.post("/{user_id}/chat", response_model=ChatResponse)
+@router.post("/{user_id}/chat", response_model=ChatResponse, dependencies=[Depends(require_openai)])
 async def chat(user_id: str, request: ChatRequest, db: Session = Depends(get_db_session)):
     """
     Process a chat message and return AI response.
@@ -237,6 +369,10 @@ async def chat(user_id: str, request: ChatRequest, db: Session = Depends(get_db_
     3. Saves conversation state back to database
     4. Returns assistant response
     
+    Non-urgent messages (is_urgent=False) are queued through the OpenAI
+    Batch API instead; the reply is stored in the conversation once the
+    batch completes and an acknowledgement is returned immediately.
+    
     Args:
         user_id: The ID of the user (from path)
         request: Chat request with message and optional conversation_id
@@ -246,6 +382,18 @@ async def chat(user_id: str, request: ChatRequest, db: Session = Depends(get_db_
         ChatResponse with conversation_id, response, and tool_calls
     """
     try:
+        if not request.is_urgent:
+            batch = await process_chat_message_batch(
+                session=db,
+                user_id=user_id,
+                messages=[request]
+            )
+            return ChatResponse(
+                conversation_id=batch["conversation_ids"][0],
+                response=BATCH_ACK_RESPONSE,
+                tool_calls=[]
+            )
+        
         result = await process_chat_message(
             session=db,
             user_id=user_id,
@@ -267,3 +415,72 @@ async def chat(user_id: str, request: ChatRequest, db: Session = Depends(get_db_
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing message: {str(e)}"
         )
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    """Format a chat stream event as a Server-Sent Events frame."""
+    return f"data: {orjson.dumps(event).decode()}\n\n"
+
+
+@router.post("/{user_id}/chat/stream", dependencies=[Depends(require_openai)])
+async def chat_stream(user_id: str, request: ChatRequest):
+    """
+    Process a chat message and stream the AI response as Server-Sent Events.
+    
+    Same processing as the chat endpoint, but the reply is delivered as it
+    is generated instead of after the final token:
+    - data: {"type": "delta", "content": ...} for each piece of the reply
+    - data: {"type": "done", "conversation_id", "response", "tool_calls"} last
+    
+    Errors raised before the first event (unknown conversation, OpenAI
+    unavailable) are returned as regular HTTP errors; errors after that
+    are sent as a final {"type": "error"} event.
+    
+    Args:
+        user_id: The ID of the user (from path)
+        request: Chat request with message and optional conversation_id
+        
+    Returns:
+        StreamingResponse with text/event-stream content
+    """
+    # The session must outlive this function, so the stream owns it. No
+    # transaction is open while events are relayed (a slow client never
+    # holds a connection); the turn commits in one short write at the end
+    db = Session(engine, expire_on_commit=False)
+    events = stream_chat_message(
+        session=db,
+        user_id=user_id,
+        message=request.message,
+        conversation_id=request.conversation_id
+    )
+    
+    try:
+        first_event = await events.__anext__()
+    except ValueError as e:
+        db.close()
+        logger.error(f"Validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        db.close()
+        logger.error(f"Error processing message: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing message: {str(e)}"
+        )
+    
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            yield _sse(first_event)
+            async for event in events:
+                yield _sse(event)
+        except Exception as e:
+            logger.error(f"Error streaming message: {str(e)}", exc_info=True)
+            yield _sse({"type": "error", "detail": f"Error processing message: {str(e)}"})
+        finally:
+            await events.aclose()
+            db.close()
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
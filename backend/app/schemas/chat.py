@@ -10,6 +10,7 @@ class ChatRequest(BaseModel):
     
     message: str = Field(..., description="User's message", min_length=1)
     conversation_id: Optional[int] = Field(None, description="Existing conversation ID (creates new if not provided)")
+    is_urgent: bool = Field(True, description="Process in realtime; set False to defer through the OpenAI Batch API (50% cheaper; not available serverless)")
     
     class Config:
         json_schema_extra = {
@@ -1,6 +1,8 @@
 """Test configuration and fixtures."""
 import pytest
+from sqlalchemy import event
 from sqlmodel import create_engine, Session, SQLModel
+from sqlmodel.pool import StaticPool
 from app.database import get_db
 from app.main import app
 
@@ -9,19 +11,46 @@ from app.main import app
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
 
-@pytest.fixture(name="session")
-def session_fixture():
-    """Create a test database session."""
+@pytest.fixture(name="engine", scope="session")
+def engine_fixture():
+    """Create the test database engine and schema once per test run."""
     engine = create_engine(
         TEST_DATABASE_URL,
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,  # One shared connection - the in-memory database
     )
+    
+    # pysqlite emits BEGIN lazily and breaks SAVEPOINT handling; take
+    # over transaction control so each test can be rolled back
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+    
     SQLModel.metadata.create_all(engine)
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+
+
+@pytest.fixture(name="session")
+def session_fixture(engine):
+    """
+    Create a test database session whose changes are rolled back afterwards.
     
-    with Session(engine) as session:
+    Commits inside the code under test only release a savepoint; the
+    outer transaction is rolled back, so every test starts empty.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    
+    with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
         yield session
     
-    SQLModel.metadata.drop_all(engine)
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture(name="client")
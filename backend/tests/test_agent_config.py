@@ -0,0 +1,74 @@
+"""
+Test Agent Configuration - Verify prompt construction and templated replies for the OpenAI agent.
+"""
+import orjson
+from app.agent.batch import _build_batch_line, BATCH_ENDPOINT
+from app.agent.config import build_agent_messages, get_agent_config, get_agent_system_prompt
+from app.agent.service import template_tool_reply
+
+
+def test_system_message_is_first():
+    """Test that the system prompt is prepended to the conversation history."""
+    history = [{"role": "user", "content": "Add a task to buy groceries"}]
+    
+    messages = build_agent_messages(history)
+    
+    assert len(messages) == 2
+    assert messages[0]["role"] == "system"
+    assert messages[1] == history[0]
+
+
+def test_system_prefix_is_byte_identical_across_requests():
+    """Test that the system prefix never varies, keeping it prompt-cache eligible."""
+    first = build_agent_messages([{"role": "user", "content": "hi"}])
+    second = build_agent_messages([{"role": "user", "content": "show my tasks"}])
+    
+    assert first[0] == second[0]
+    assert first[0]["content"] == get_agent_system_prompt()
+
+
+def test_system_prompt_size_ceiling():
+    """Test that the system prompt stays compact (it is sent on every request)."""
+    assert len(get_agent_system_prompt().encode("utf-8")) <= 2048
+
+
+def test_template_tool_reply_for_single_task_actions():
+    """Test that task confirmations are phrased from the response templates."""
+    result = {"task_id": 1, "status": "created", "title": "Buy milk"}
+    assert template_tool_reply("add_task", {"title": "Buy milk"}, result) == "I've added 'Buy milk' to your list."
+    
+    not_found = {"error": "Task 7 not found", "error_type": "TaskNotFoundError"}
+    assert "#7" in template_tool_reply("delete_task", {"task_id": 7}, not_found)
+
+
+def test_template_tool_reply_defers_to_model():
+    """Test that listings and unexpected errors still go to the model."""
+    assert template_tool_reply("list_tasks", {}, {"tasks": [], "count": 0}) is None
+    assert template_tool_reply("add_task", {}, {"error": "boom", "error_type": "DatabaseError"}) is None
+
+
+def test_summary_follows_static_system_prompt():
+    """Test that a conversation summary is inserted after the cacheable prefix."""
+    history = [{"role": "user", "content": "What's left?"}]
+    
+    messages = build_agent_messages(history, summary="User added 'buy milk' (task 3).")
+    
+    assert messages[0]["content"] == get_agent_system_prompt()
+    assert messages[1]["role"] == "system"
+    assert "buy milk" in messages[1]["content"]
+    assert messages[2:] == history
+
+
+def test_batch_line_round_trips():
+    """Test that a batch input line is valid JSON carrying the full request body."""
+    messages = build_agent_messages([{"role": "user", "content": "List my tasks"}])
+    
+    line = orjson.loads(_build_batch_line("1-2", "test_user", messages, get_agent_config()))
+    
+    assert line["custom_id"] == "1-2"
+    assert line["url"] == BATCH_ENDPOINT
+    body = line["body"]
+    assert body["messages"] == messages
+    assert body["user"] == "test_user"
+    assert {tool["function"]["name"] for tool in body["tools"]} >= {"add_task", "list_tasks", "complete_task"}
+    assert all(tool["type"] == "function" for tool in body["tools"])
@@ -0,0 +1,78 @@
+"""
+Test Batch Service - Verify deferred chat messages are never left without a pending batch.
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from sqlmodel import select
+from app.agent import batch
+from app.models.chat_batch import ChatBatch
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.schemas.chat import ChatRequest
+
+
+def _use_fake_openai(monkeypatch, files_create, batches_create):
+    """Route the batch service's OpenAI calls to the given fakes."""
+    client = SimpleNamespace(
+        files=SimpleNamespace(create=files_create),
+        batches=SimpleNamespace(create=batches_create)
+    )
+    monkeypatch.setattr(batch, "get_openai_client", lambda: client)
+
+
+def test_failed_submission_discards_messages(session, monkeypatch):
+    """Test that the user messages are deleted when the batch can't be created."""
+    async def files_create(**kwargs):
+        return SimpleNamespace(id="file_1")
+    
+    async def batches_create(**kwargs):
+        raise RuntimeError("OpenAI unavailable")
+    
+    _use_fake_openai(monkeypatch, files_create, batches_create)
+    existing = Conversation(user_id="test_user")
+    session.add(existing)
+    session.commit()
+    
+    requests = [
+        ChatRequest(message="Summarize my week", is_urgent=False),
+        ChatRequest(message="Plan tomorrow", conversation_id=existing.id, is_urgent=False)
+    ]
+    with pytest.raises(RuntimeError):
+        asyncio.run(batch.process_chat_message_batch(session, "test_user", requests))
+    
+    assert session.exec(select(Message)).all() == []
+    assert session.exec(select(Conversation.id)).all() == [existing.id]
+    assert session.exec(select(ChatBatch)).all() == []
+
+
+def test_submitted_batch_is_recorded(session, monkeypatch):
+    """Test that a created batch is stored so polling can resume after a restart."""
+    async def files_create(**kwargs):
+        return SimpleNamespace(id="file_1")
+    
+    async def batches_create(**kwargs):
+        return SimpleNamespace(id="batch_1")
+    
+    _use_fake_openai(monkeypatch, files_create, batches_create)
+    monkeypatch.setattr(batch, "_start_polling", lambda batch_id, user_id: None)
+    
+    result = asyncio.run(batch.process_chat_message_batch(
+        session, "test_user", [ChatRequest(message="Summarize my week", is_urgent=False)]
+    ))
+    
+    assert result["batch_id"] == "batch_1"
+    pending = session.exec(select(ChatBatch)).all()
+    assert [(row.batch_id, row.user_id) for row in pending] == [("batch_1", "test_user")]
+
+
+def test_serverless_rejects_deferred_messages(session, monkeypatch):
+    """Test that deferred messages are refused when no process can poll the batch."""
+    monkeypatch.setattr(batch, "get_settings", lambda: SimpleNamespace(is_serverless=True))
+    
+    with pytest.raises(ValueError):
+        asyncio.run(batch.process_chat_message_batch(
+            session, "test_user", [ChatRequest(message="Summarize my week", is_urgent=False)]
+        ))
+    
+    assert session.exec(select(Message)).all() == []
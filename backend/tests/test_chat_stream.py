@@ -0,0 +1,119 @@
+"""
+Test Chat Stream - Verify how a chat turn uses the database around the OpenAI calls.
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from sqlmodel import select
+from app.agent import service
+from app.agent.reply_cache import clear_reply_cache
+from app.mcp.client import ToolResult
+from app.models.conversation import Conversation
+from app.models.message import Message
+
+
+class FakeCompletions:
+    """Stand-in for client.chat.completions that records the session state per call."""
+    
+    def __init__(self, session, message):
+        self.session = session
+        self.message = message
+        self.in_transaction = []
+    
+    async def create(self, **kwargs):
+        self.in_transaction.append(self.session.in_transaction())
+        if kwargs.get("stream"):
+            return self._stream("You have ", "2 pending tasks.")
+        return SimpleNamespace(choices=[SimpleNamespace(message=self.message)])
+    
+    async def _stream(self, *pieces):
+        for piece in pieces:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+
+@pytest.fixture(autouse=True)
+def _empty_reply_cache():
+    """Keep cached replies from one test out of the next."""
+    clear_reply_cache()
+    yield
+    clear_reply_cache()
+
+
+def _use_fake_openai(monkeypatch, completions):
+    """Route the agent's OpenAI calls to the given fake completions."""
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(service, "get_openai_client", lambda: client)
+
+
+def _run_turn(session, message, conversation_id=None):
+    """Run one chat turn and return its events."""
+    async def collect():
+        return [
+            event
+            async for event in service.stream_chat_message(session, "test_user", message, conversation_id)
+        ]
+    return asyncio.run(collect())
+
+
+def test_no_transaction_open_during_openai_call(session, monkeypatch):
+    """Test that the read transaction ends before the model is called."""
+    conversation = Conversation(user_id="test_user")
+    session.add(conversation)
+    session.flush()
+    session.add(Message(conversation_id=conversation.id, user_id="test_user", role="user", content="Hello"))
+    session.commit()
+    
+    completions = FakeCompletions(session, SimpleNamespace(content="You have no tasks due.", tool_calls=None))
+    _use_fake_openai(monkeypatch, completions)
+    
+    events = _run_turn(session, "Which tasks are due this week?", conversation.id)
+    
+    assert completions.in_transaction == [False]
+    assert events[-1]["conversation_id"] == conversation.id
+    contents = session.exec(
+        select(Message.content).where(Message.conversation_id == conversation.id).order_by(Message.id)
+    ).all()
+    assert contents == ["Hello", "Which tasks are due this week?", "You have no tasks due."]
+
+
+def test_new_conversation_stored_with_reply(session, monkeypatch):
+    """Test that a new conversation and both messages are only written once the model replied."""
+    completions = FakeCompletions(session, SimpleNamespace(content="You have no tasks due.", tool_calls=None))
+    _use_fake_openai(monkeypatch, completions)
+    
+    events = _run_turn(session, "Which tasks are due this week?")
+    
+    assert completions.in_transaction == [False]
+    conversation_id = events[-1]["conversation_id"]
+    assert session.get(Conversation, conversation_id).user_id == "test_user"
+    roles = session.exec(
+        select(Message.role).where(Message.conversation_id == conversation_id).order_by(Message.id)
+    ).all()
+    assert roles == ["user", "assistant"]
+
+
+def test_no_transaction_open_while_streaming(session, monkeypatch):
+    """Test that the final completion is relayed with no transaction holding a connection."""
+    tool_call = SimpleNamespace(
+        id="call_1",
+        function=SimpleNamespace(name="list_tasks", arguments='{"status": "pending"}')
+    )
+    completions = FakeCompletions(session, SimpleNamespace(content=None, tool_calls=[tool_call]))
+    _use_fake_openai(monkeypatch, completions)
+    
+    async def fake_execute_mcp_tools_raw(calls):
+        return [ToolResult({"tasks": [], "count": 2, "status": "pending"}, '{"count":2}') for _ in calls]
+    
+    monkeypatch.setattr(service, "execute_mcp_tools_raw", fake_execute_mcp_tools_raw)
+    
+    async def first_delta_in_transaction():
+        events = service.stream_chat_message(session, "test_user", "Which tasks are pending?")
+        try:
+            event = await events.__anext__()
+            assert event == {"type": "delta", "content": "You have "}
+            return session.in_transaction()
+        finally:
+            await events.aclose()
+    
+    assert asyncio.run(first_delta_in_transaction()) is False
+    assert completions.in_transaction == [False, False]
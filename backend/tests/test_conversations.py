@@ -0,0 +1,143 @@
+"""Tests for the conversation list and delete routes."""
+import orjson
+import pytest
+from fastapi import HTTPException, Request
+from sqlmodel import select
+from app.database import QueryCounter
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.task import Task
+from app.routes.chat import get_conversations, delete_conversation, delete_all_conversations, reset_all_data
+
+
+def _add_conversation(session, user_id, *messages):
+    """Create a conversation with (role, content) messages, in order."""
+    conversation = Conversation(user_id=user_id)
+    session.add(conversation)
+    session.flush()
+    for role, content in messages:
+        session.add(Message(conversation_id=conversation.id, user_id=user_id, role=role, content=content))
+        session.flush()
+    session.commit()
+    return conversation.id
+
+
+def _list(session, user_id, if_none_match=None):
+    """Call get_conversations like FastAPI would; returns (parsed body or None, response)."""
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    response = get_conversations(user_id, Request({"type": "http", "headers": headers}), db=session)
+    return (orjson.loads(response.body) if response.body else None), response
+
+
+def test_get_conversations_query_count(session):
+    """Test that previews come from the same query as the conversations (no N+1)."""
+    for i in range(5):
+        _add_conversation(session, "test_user", ("user", f"Message {i}"), ("assistant", "Reply"))
+    
+    with QueryCounter(session) as queries:
+        result, _ = _list(session, "test_user")
+    
+    assert len(result["conversations"]) == 5
+    assert queries.count == 2  # ETag version check + list
+
+
+def test_get_conversations_etag(session):
+    """Test that an unchanged list is answered with 304 and a changed one is not."""
+    _add_conversation(session, "test_user", ("user", "Hello"))
+    _, response = _list(session, "test_user")
+    etag = response.headers["etag"]
+    
+    with QueryCounter(session) as queries:
+        _, not_modified = _list(session, "test_user", if_none_match=etag)
+    assert not_modified.status_code == 304
+    assert queries.count == 1
+    
+    _add_conversation(session, "test_user", ("user", "Another"))
+    result, response = _list(session, "test_user", if_none_match=etag)
+    assert len(result["conversations"]) == 2
+    assert response.headers["etag"] != etag
+
+
+def test_get_conversations_preview(session):
+    """Test that the preview is the first user message, truncated to 50 characters."""
+    long_id = _add_conversation(session, "test_user", ("assistant", "Hi!"), ("user", "x" * 80), ("user", "Later"))
+    empty_id = _add_conversation(session, "test_user")
+    _add_conversation(session, "other_user", ("user", "Not mine"))
+    
+    result, _ = _list(session, "test_user")
+    previews = {c["id"]: c["preview"] for c in result["conversations"]}
+    
+    assert previews == {long_id: "x" * 50 + "...", empty_id: "New conversation"}
+
+
+def test_delete_conversation(session):
+    """Test that a conversation and its messages are deleted, and only for its owner."""
+    conversation_id = _add_conversation(session, "test_user", ("user", "Hello"), ("assistant", "Hi!"))
+    
+    with pytest.raises(HTTPException) as excinfo:
+        delete_conversation("other_user", conversation_id, db=session)
+    assert excinfo.value.status_code == 404
+    
+    delete_conversation("test_user", conversation_id, db=session)
+    
+    assert session.exec(select(Conversation)).all() == []
+    assert session.exec(select(Message)).all() == []
+
+
+def test_reset_all_data_counts(session):
+    """Test that reset deletes only the user's rows and reports the counts."""
+    _add_conversation(session, "test_user", ("user", "One"), ("assistant", "Two"))
+    _add_conversation(session, "test_user", ("user", "Three"))
+    _add_conversation(session, "other_user", ("user", "Not mine"))
+    session.add(Task(user_id="test_user", title="Buy milk"))
+    session.commit()
+    
+    result = reset_all_data("test_user", db=session)
+    
+    assert (result["conversations_deleted"], result["messages_deleted"], result["tasks_deleted"]) == (2, 3, 1)
+    assert len(session.exec(select(Message)).all()) == 1
+
+
+def test_delete_routes_query_count_is_constant(session):
+    """Test that bulk deletes don't grow with the number of rows (no per-row N+1)."""
+    for i in range(5):
+        _add_conversation(session, "test_user", ("user", f"Message {i}"), ("assistant", "Reply"))
+        session.add(Task(user_id="test_user", title=f"Task {i}"))
+    session.commit()
+    
+    with QueryCounter(session) as queries:
+        result = delete_all_conversations("test_user", db=session)
+    assert result["deleted_count"] == 5
+    assert queries.count == 1
+    
+    with QueryCounter(session) as queries:
+        result = reset_all_data("test_user", db=session)
+    assert result["tasks_deleted"] == 5
+    assert queries.count == 3  # One DELETE per table (one statement on PostgreSQL)
+
+
+def test_get_conversations_pages(session):
+    """Test that next_cursor walks the list page by page, newest first."""
+    # Server-default timestamps: on SQLite they are stored as text without
+    # fractional seconds, and all five share one value - id breaks the tie
+    ids = [_add_conversation(session, "test_user", ("user", f"Message {i}")) for i in range(5)]
+    
+    pages = []
+    cursor = None
+    for _ in range(3 + 1):  # 3 pages of 2; one spare iteration catches a stuck cursor
+        response = get_conversations("test_user", Request({"type": "http", "headers": []}), limit=2, cursor=cursor, db=session)
+        page = orjson.loads(response.body)
+        pages.append([c["id"] for c in page["conversations"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    
+    assert cursor is None
+    assert [len(page) for page in pages] == [2, 2, 1]
+    seen = [conversation_id for page in pages for conversation_id in page]
+    assert len(set(seen)) == len(seen)  # Pages are disjoint
+    assert seen == ids[::-1]
+    
+    with pytest.raises(HTTPException) as excinfo:
+        get_conversations("test_user", Request({"type": "http", "headers": []}), cursor="not-a-cursor", db=session)
+    assert excinfo.value.status_code == 400
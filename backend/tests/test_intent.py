@@ -0,0 +1,122 @@
+"""
+Test Intent Classification - Verify deterministic keyword matching.
+"""
+import asyncio
+
+from app.agent import service
+from app.agent.config import RESPONSE_TEMPLATES
+from app.agent.intent import (
+    classify,
+    matched_intents,
+    is_small_talk,
+    extract_task_id,
+    extract_task_ids,
+    NEGATION_RE,
+    CREATE,
+    LIST,
+    COMPLETE,
+    DELETE,
+    HELP,
+    GREETING,
+    ACKNOWLEDGMENT,
+    UNCLEAR
+)
+
+
+def test_task_intents_take_priority_over_conversational():
+    """Test that task keywords win over greetings/acknowledgments."""
+    assert classify("Hi! Add a task to buy groceries") == CREATE
+    assert classify("ok, show my tasks") == LIST
+    assert classify("Mark task 5 as done") == COMPLETE
+
+
+def test_conversational_intents():
+    """Test greeting, acknowledgment and unclear classification."""
+    assert classify("hello") == GREETING
+    assert classify("Thanks!") == ACKNOWLEDGMENT
+    assert classify("banana") == UNCLEAR
+
+
+def test_keywords_match_whole_words_only():
+    """Test that keywords inside other words do not match."""
+    assert classify("this is everything") == UNCLEAR  # "hi" inside "this"/"everything"
+
+
+def test_extract_task_id():
+    """Test explicit task ID extraction."""
+    assert extract_task_id("complete task 5") == 5
+    assert extract_task_id("mark #12 as done") == 12
+    assert extract_task_id("done with task #3") == 3
+    assert extract_task_id("finish id 7") == 7
+    assert extract_task_id("finish the report") is None
+
+
+def test_priority_does_not_depend_on_keyword_position():
+    """Test that the highest-priority intent wins wherever its keyword appears."""
+    assert classify("show me the list, then add milk") == CREATE
+    assert classify("thanks, that's done") == COMPLETE
+
+
+def test_matched_intents_and_task_ids():
+    """Test that mixed requests and several task IDs are visible to shortcuts."""
+    assert matched_intents("complete task 5 and delete task 6") == {COMPLETE, DELETE}
+    assert matched_intents("Buy eggs tomorrow") == frozenset()
+    assert extract_task_ids("I finished task 3 and task 4") == [3, 4]
+
+
+def test_negation_includes_contractions():
+    """Test that negative words and contractions block completion shortcuts."""
+    for message in ("don't complete task 5", "do not complete task 5", "never mark #5 done", "didn\u2019t finish task 5"):
+        assert NEGATION_RE.search(message), message
+    assert not NEGATION_RE.search("complete task 5")
+
+
+def test_small_talk():
+    """Test that only short messages without task mentions count as small talk."""
+    assert is_small_talk("hello")
+    assert is_small_talk("thank you so much")
+    assert not is_small_talk("how many tasks do I have left")
+    assert not is_small_talk("call mom at 5")
+
+
+def _shortcut(message, monkeypatch):
+    """Run resolve_without_llm on a first message, recording complete_task calls."""
+    calls = []
+    
+    async def fake_execute_mcp_tool(tool_name, arguments):
+        calls.append((tool_name, arguments["task_id"]))
+        return {"task_id": arguments["task_id"], "status": "completed", "title": "Buy milk"}
+    
+    monkeypatch.setattr(service, "execute_mcp_tool", fake_execute_mcp_tool)
+    history = [{"role": "user", "content": message}]
+    result = asyncio.run(service.resolve_without_llm("test_user", message, history))
+    return result, calls
+
+
+def test_shortcut_completes_single_explicit_task(monkeypatch):
+    """Test that an unambiguous "complete task N" is handled without the model."""
+    result, calls = _shortcut("complete task 5", monkeypatch)
+    assert calls == [("complete_task", 5)]
+    assert result[0] == RESPONSE_TEMPLATES["complete_task"].format(title="Buy milk")
+
+
+def test_shortcut_skips_ambiguous_messages(monkeypatch):
+    """Test that misreadable messages go to the model and change no data."""
+    for message in (
+        "don't complete task 5",              # Negation
+        "I finished task 3 and task 4",       # Several task IDs
+        "complete task 5 and delete task 6",  # Several intents
+        "Buy eggs tomorrow",                  # No keyword - may be a task
+        "call mom at 5",
+        "how many tasks do I have left",      # Not small talk
+    ):
+        result, calls = _shortcut(message, monkeypatch)
+        assert result is None, message
+        assert calls == [], message
+
+
+def test_shortcut_templates_small_talk(monkeypatch):
+    """Test that short greetings, thanks and help get their template."""
+    assert _shortcut("hello", monkeypatch)[0] == (RESPONSE_TEMPLATES[GREETING], [])
+    assert _shortcut("Thanks!", monkeypatch)[0] == (RESPONSE_TEMPLATES[ACKNOWLEDGMENT], [])
+    assert _shortcut("help", monkeypatch)[0] == (RESPONSE_TEMPLATES[HELP], [])
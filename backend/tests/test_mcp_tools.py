@@ -1,12 +1,16 @@
 """Tests for MCP tools."""
+import asyncio
+import importlib
+from contextlib import contextmanager
 import pytest
-from app.mcp.tools import add_task, list_tasks, update_task, complete_task, delete_task
+from app.database import QueryCounter
+from app.mcp.tools import add_task, list_tasks, update_task, complete_task, delete_task, add_tasks_bulk, complete_tasks_bulk
 
 
-@pytest.mark.asyncio
-async def test_add_task():
+def test_add_task(session):
     """Test adding a task."""
-    result = await add_task(
+    result = add_task(
+        session=session,
         user_id="test_user",
         title="Test Task",
         description="Test Description"
@@ -17,37 +21,128 @@ async def test_add_task():
     assert "task_id" in result
 
 
-@pytest.mark.asyncio
-async def test_list_tasks():
+def test_list_tasks(session):
     """Test listing tasks."""
     # Add some tasks first
-    await add_task(user_id="test_user", title="Task 1")
-    await add_task(user_id="test_user", title="Task 2")
+    add_task(session=session, user_id="test_user", title="Task 1")
+    add_task(session=session, user_id="test_user", title="Task 2")
     
     # List all tasks
-    tasks = await list_tasks(user_id="test_user", status="all")
+    tasks = list_tasks(session=session, user_id="test_user", status="all")
     assert len(tasks) >= 2
 
 
-@pytest.mark.asyncio
-async def test_complete_task():
+def test_complete_task(session):
     """Test completing a task."""
     # Add a task
-    add_result = await add_task(user_id="test_user", title="Task to Complete")
+    add_result = add_task(session=session, user_id="test_user", title="Task to Complete")
     task_id = add_result["task_id"]
     
     # Complete the task
-    result = await complete_task(user_id="test_user", task_id=task_id, completed=True)
+    result = complete_task(session=session, user_id="test_user", task_id=task_id, completed=True)
     assert result["status"] == "completed"
 
 
-@pytest.mark.asyncio
-async def test_delete_task():
+def test_delete_task(session):
     """Test deleting a task."""
     # Add a task
-    add_result = await add_task(user_id="test_user", title="Task to Delete")
+    add_result = add_task(session=session, user_id="test_user", title="Task to Delete")
     task_id = add_result["task_id"]
     
     # Delete the task
-    result = await delete_task(user_id="test_user", task_id=task_id)
+    result = delete_task(session=session, user_id="test_user", task_id=task_id)
     assert result["status"] == "deleted"
+
+
+def test_list_tasks_single_query(session):
+    """Test that listing tasks issues one query regardless of task count (no N+1)."""
+    for i in range(10):
+        add_task(session=session, user_id="test_user", title=f"Task {i}")
+    
+    with QueryCounter(session) as queries:
+        result = list_tasks(session=session, user_id="test_user", status="all")
+    
+    assert result["count"] == 10
+    assert queries.count == 1
+
+
+def test_add_tasks_bulk(session):
+    """Test adding several tasks in one call."""
+    result = add_tasks_bulk(
+        session=session,
+        user_id="test_user",
+        tasks=[{"title": "Task 1"}, {"title": "Task 2", "description": "Second"}]
+    )
+    
+    assert result["count"] == 2
+    assert [r["title"] for r in result["results"]] == ["Task 1", "Task 2"]
+    assert all(r["status"] == "created" and r["task_id"] for r in result["results"])
+
+
+def test_complete_tasks_bulk(session):
+    """Test completing several tasks in one statement, reporting unknown IDs."""
+    added = add_tasks_bulk(session=session, user_id="test_user", tasks=[{"title": "A"}, {"title": "B"}])
+    task_ids = [r["task_id"] for r in added["results"]]
+    
+    with QueryCounter(session) as queries:
+        result = complete_tasks_bulk(session=session, user_id="test_user", task_ids=task_ids + [9999])
+    
+    assert queries.count == 1
+    assert result["count"] == 2
+    assert result["not_found"] == [9999]
+    
+    pending = list_tasks(session=session, user_id="test_user", status="pending")
+    assert pending["count"] == 0
+
+
+def test_dispatch_tool_calls_ordering(monkeypatch):
+    """Test per-task ordering and read-after-write within one turn's tool calls."""
+    mcp_server = importlib.import_module("app.mcp.mcp_server")
+    log = []
+    
+    async def fake_dispatch_tool(name, arguments):
+        log.append(("start", name))
+        await asyncio.sleep(0.01)
+        log.append(("end", name))
+        return {"tool": name}
+    
+    monkeypatch.setattr(mcp_server, "dispatch_tool", fake_dispatch_tool)
+    calls = [
+        ("add_task", {"user_id": "u1", "title": "Milk"}),
+        ("complete_task", {"user_id": "u1", "task_id": 1}),
+        ("delete_task", {"user_id": "u1", "task_id": 2}),
+        ("complete_tasks_bulk", {"user_id": "u1", "task_ids": [1, 3]}),
+        ("list_tasks", {"user_id": "u1"}),
+    ]
+    results = asyncio.run(mcp_server.dispatch_tool_calls(calls))
+    
+    assert [result["tool"] for result in results] == [name for name, _ in calls]
+    position = {event: index for index, event in enumerate(log)}
+    # Independent writes overlap
+    assert position[("start", "delete_task")] < position[("end", "add_task")]
+    # The bulk call shares task 1 with complete_task and waits for it
+    assert position[("start", "complete_tasks_bulk")] > position[("end", "complete_task")]
+    # The read waits for every earlier write
+    assert position[("start", "list_tasks")] == len(log) - 2
+
+
+def test_dispatch_ignores_undeclared_arguments(session, monkeypatch):
+    """Test that extra keys the model adds don't fail the tool call."""
+    mcp_server = importlib.import_module("app.mcp.mcp_server")
+    
+    @contextmanager
+    def test_session_scope():
+        yield session
+    
+    monkeypatch.setattr(mcp_server, "get_db_session", test_session_scope)
+    monkeypatch.setattr(mcp_server, "get_read_db_session", test_session_scope)
+    
+    result = asyncio.run(mcp_server.dispatch_tool("add_task", {
+        "user_id": "test_user",
+        "title": "Buy milk",
+        "priority": "high",
+        "confirm": True
+    }))
+    
+    assert "error" not in result
+    assert result["title"] == "Buy milk"
@@ -1,27 +1,13 @@
 """
 Test Message Windowing - Verify 50-message context window enforcement.
 """
-import pytest
 from datetime import datetime, timedelta
-from sqlmodel import Session, create_engine, SQLModel
-from sqlmodel.pool import StaticPool
 
 from app.models.conversation import Conversation
 from app.models.message import Message
 from app.agent.service import load_message_history, MAX_CONTEXT_MESSAGES
 
-
-@pytest.fixture(name="session")
-def session_fixture():
-    """Create in-memory database for testing."""
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
+# Uses the shared "session" fixture from conftest.py (rolled back per test)
 
 
 def test_message_windowing_with_less_than_50_messages(session):
@@ -55,8 +41,8 @@ def test_message_windowing_with_less_than_50_messages(session):
     assert len(messages) == 30
     
     # Should be in chronological order
-    assert messages[0].content == "Message 0"
-    assert messages[-1].content == "Message 29"
+    assert messages[0]["content"] == "Message 0"
+    assert messages[-1]["content"] == "Message 29"
 
 
 def test_message_windowing_with_exactly_50_messages(session):
@@ -88,8 +74,8 @@ def test_message_windowing_with_exactly_50_messages(session):
     
     # Should return all 50 messages
     assert len(messages) == 50
-    assert messages[0].content == "Message 0"
-    assert messages[-1].content == "Message 49"
+    assert messages[0]["content"] == "Message 0"
+    assert messages[-1]["content"] == "Message 49"
 
 
 def test_message_windowing_with_more_than_50_messages(session):
@@ -123,11 +109,11 @@ def test_message_windowing_with_more_than_50_messages(session):
     assert len(messages) == 50
     
     # Should start from message 50 (0-indexed, so messages 50-99)
-    assert messages[0].content == "Message 50"
-    assert messages[-1].content == "Message 99"
+    assert messages[0]["content"] == "Message 50"
+    assert messages[-1]["content"] == "Message 99"
     
     # Verify messages 0-49 are NOT included
-    message_contents = [msg.content for msg in messages]
+    message_contents = [msg["content"] for msg in messages]
     assert "Message 0" not in message_contents
     assert "Message 49" not in message_contents
 
@@ -161,8 +147,7 @@ def test_message_windowing_chronological_order(session):
     messages = load_message_history(session, conv.id, "test_user")
     
     # Verify chronological order
-    for i in range(len(messages) - 1):
-        assert messages[i].created_at <= messages[i + 1].created_at
+    assert [msg["content"] for msg in messages] == [f"Message {i}" for i in range(10)]
 
 
 def test_message_windowing_user_isolation(session):
@@ -206,8 +191,7 @@ def test_message_windowing_user_isolation(session):
     # Should only return user_1's messages
     assert len(messages) == 30
     for msg in messages:
-        assert msg.user_id == "user_1"
-        assert "User1" in msg.content
+        assert "User1" in msg["content"]
 
 
 def test_max_context_messages_constant():
@@ -244,5 +228,40 @@ def test_message_windowing_custom_limit(session):
     
     # Should return only last 20 messages
     assert len(messages) == 20
-    assert messages[0].content == "Message 80"
-    assert messages[-1].content == "Message 99"
+    assert messages[0]["content"] == "Message 80"
+    assert messages[-1]["content"] == "Message 99"
+
+
+def test_message_windowing_skips_summarized_messages(session):
+    """Test that messages covered by the conversation summary are not loaded."""
+    # Create conversation
+    conv = Conversation(
+        user_id="test_user",
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+    session.add(conv)
+    session.commit()
+    session.refresh(conv)
+    
+    # Add 40 messages
+    msgs = []
+    for i in range(40):
+        msg = Message(
+            conversation_id=conv.id,
+            user_id="test_user",
+            role="user",
+            content=f"Message {i}",
+            created_at=datetime.utcnow() + timedelta(seconds=i)
+        )
+        session.add(msg)
+        msgs.append(msg)
+    session.commit()
+    
+    # Messages 0-29 are covered by the summary
+    messages = load_message_history(session, conv.id, "test_user", after_id=msgs[29].id)
+    
+    # Should return only the 10 unsummarized messages
+    assert len(messages) == 10
+    assert messages[0]["content"] == "Message 30"
+    assert messages[-1]["content"] == "Message 39"
@@ -0,0 +1,63 @@
+"""
+Test Reply Cache - Verify keying, expiry and eviction of cached replies.
+"""
+from app.agent import reply_cache
+from app.agent.reply_cache import (
+    reply_cache_key,
+    get_cached_reply,
+    cache_reply,
+    clear_reply_cache
+)
+
+
+def _history(*contents):
+    """Alternating user/assistant history ending with a user message."""
+    roles = ["user", "assistant"] * len(contents)
+    return [
+        {"role": role, "content": content}
+        for role, content in zip(roles[len(contents) % 2 == 0:], contents)
+    ]
+
+
+def test_key_ignores_case_whitespace_and_trailing_punctuation():
+    """Test that trivially different spellings of a message share a key."""
+    assert reply_cache_key("u1", None, _history("What can you do?")) == reply_cache_key("u1", None, _history("what  can you DO?"))
+    assert reply_cache_key("u1", None, _history("tell me a joke!")) == reply_cache_key("u1", None, _history("Tell me a joke"))
+    assert reply_cache_key("u1", None, _history("what can you do?")) != reply_cache_key("u1", None, _history("what can you do"))
+
+
+def test_key_depends_on_user_and_context():
+    """Test that replies are not shared across users, summaries or history."""
+    key = reply_cache_key("u1", None, _history("Why?"))
+    assert key != reply_cache_key("u2", None, _history("Why?"))
+    assert key != reply_cache_key("u1", "Talked about groceries", _history("Why?"))
+    assert key != reply_cache_key("u1", None, _history("Hi", "Hello!", "Why?"))
+
+
+def test_cached_reply_expires(monkeypatch):
+    """Test that a reply is returned until its TTL has passed."""
+    clear_reply_cache()
+    now = [1000.0]
+    monkeypatch.setattr(reply_cache.time, "monotonic", lambda: now[0])
+    
+    key = reply_cache_key("u1", None, _history("What can you do?"))
+    cache_reply(key, "I manage your tasks.")
+    assert get_cached_reply(key) == "I manage your tasks."
+    
+    now[0] += reply_cache.REPLY_CACHE_TTL_SECONDS
+    assert get_cached_reply(key) is None
+
+
+def test_least_recently_used_reply_is_evicted(monkeypatch):
+    """Test that the cache stays bounded, dropping the oldest unused entry."""
+    clear_reply_cache()
+    monkeypatch.setattr(reply_cache, "REPLY_CACHE_MAX_ENTRIES", 2)
+    
+    cache_reply(b"a", "A")
+    cache_reply(b"b", "B")
+    get_cached_reply(b"a")
+    cache_reply(b"c", "C")
+    
+    assert get_cached_reply(b"a") == "A"
+    assert get_cached_reply(b"b") is None
+    assert get_cached_reply(b"c") == "C"